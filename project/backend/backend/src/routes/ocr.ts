@@ -3,11 +3,50 @@ import multer from 'multer';
 import { spawn } from 'child_process';
 import path from 'path';
 import fs from 'fs';
+import { OCRWorker } from '../services/ocrWorker';
 
 const router = express.Router();
 
 const upload = multer({ storage: multer.memoryStorage() });
 
+// Optional warm OCR worker (museum_ocr.py --serve). Enable with OCR_WORKER=1.
+const OCR_ENGINE_DIR = process.env.OCR_ENGINE_DIR || 'C:\\Users\\rajea\\Desktop\\Internship 2025\\uc work\\project\\ocr-engine';
+const ocrWorker = process.env.OCR_WORKER === '1'
+  ? new OCRWorker(path.join(OCR_ENGINE_DIR, 'museum_ocr.py'))
+  : null;
+ocrWorker?.start();
+
+// Shape a Python OCR result (museum_ocr/simple_ocr JSON schema) into the API response
+const formatOcrResponse = (result: any, file: any) => ({
+  success: true,
+  message: 'OCR processing completed successfully',
+  text: result.text || result.english_text || result.hindi_text || 'Text extracted successfully',
+  confidence: result.confidence || 0.8,
+  processing_time: result.processing_time || 'Unknown',
+  enhanced: {
+    englishFinal: result.english_text || result.text || 'English text extracted',
+    hindiFinal: result.hindi_text || 'Hindi text extracted'
+  },
+  raw_ocr: {
+    hindi_text: result.hindi_text || '',
+    english_text: result.english_text || result.text || '',
+    zones_count: result.zones_count || 1
+  },
+  metadata: {
+    filename: file.originalname,
+    fileSize: file.size,
+    processingTimestamp: new Date().toISOString()
+  }
+});
+
+// Warm worker health (readiness) endpoint
+router.get('/worker-health', (req: any, res: any) => {
+  if (!ocrWorker) {
+    return res.json({ enabled: false, ready: false });
+  }
+  res.json({ enabled: true, ready: ocrWorker.isReady(), ...ocrWorker.health() });
+});
+
 // Test endpoint
 router.get('/test', async (req: any, res: any) => {
   try {
@@ -123,17 +162,27 @@ router.post('/describe', upload.single('image'), async (req: any, res: any) => {
 
     console.log('🔍 File received:', req.file.originalname, 'Size:', req.file.size);
     
-    // Save image to temporary file
-    const tempImagePath = path.join(__dirname, '../../uploads', `temp_${Date.now()}.png`);
+    // The upload stays in memory: the worker gets it base64-encoded, the one-shot
+    // script reads the encoded bytes from stdin. No temp file is written.
     
-    // Ensure uploads directory exists
-    if (!fs.existsSync(path.dirname(tempImagePath))) {
-      fs.mkdirSync(path.dirname(tempImagePath), { recursive: true });
+    // Route to the warm worker when it is ready; fall back to a one-shot script otherwise
+    if (ocrWorker && ocrWorker.isReady()) {
+      try {
+        const result = await ocrWorker.ocrBuffer(req.file.buffer);
+        if (!result.success) {
+          return res.status(500).json({
+            success: false,
+            message: 'OCR processing failed - please try again',
+            error: result.error,
+            suggestion: 'Check image quality and try again'
+          });
+        }
+        return res.json(formatOcrResponse(result, req.file));
+      } catch (e: any) {
+        console.warn('⚠️ OCR worker request failed, falling back to one-shot script:', e.message);
+      }
     }
-    
-    fs.writeFileSync(tempImagePath, req.file.buffer);
-    console.log('🔍 Image saved to:', tempImagePath);
-    
+
     // Path to the Python OCR script - CORRECTED PATH
     const pythonScriptPath = 'C:\\Users\\rajea\\Desktop\\Internship 2025\\uc work\\project\\ocr-engine\\simple_ocr.py';
     
@@ -151,23 +200,18 @@ router.post('/describe', upload.single('image'), async (req: any, res: any) => {
     }
     
     // Call Python script
-    console.log('🔍 Calling Python script with:', pythonScriptPath, tempImagePath);
-    const pythonProcess = spawn('python', [pythonScriptPath, tempImagePath]);
+    console.log('🔍 Calling Python script with:', pythonScriptPath, '- (image on stdin)');
+    const pythonProcess = spawn('python', [pythonScriptPath, '-']);
+    pythonProcess.stdin.on('error', (err: any) => {
+      console.log('Could not write image to OCR process stdin:', err.message);
+    });
+    pythonProcess.stdin.end(req.file.buffer);
     
     // Set timeout for Python process - OPTIMIZED TO PREVENT 408 ERRORS
     const timeout = setTimeout(() => {
       pythonProcess.kill();
       console.error('❌ Python OCR process timed out');
       
-      // Clean up temp file on timeout
-      try {
-        if (fs.existsSync(tempImagePath)) {
-          fs.unlinkSync(tempImagePath);
-        }
-      } catch (e: any) {
-        console.log('Could not delete temp file on timeout:', e);
-      }
-      
       return res.status(500).json({
         success: false,
         message: 'OCR processing timed out - please try with a smaller image or better quality',
@@ -195,15 +239,6 @@ router.post('/describe', upload.single('image'), async (req: any, res: any) => {
       console.log('🔍 Full output:', output);
       console.log('🔍 Full error output:', errorOutput);
       
-      // Clean up temp file
-      try {
-        if (fs.existsSync(tempImagePath)) {
-          fs.unlinkSync(tempImagePath);
-        }
-      } catch (e: any) {
-        console.log('Could not delete temp file:', e);
-      }
-      
       if (code !== 0) {
         console.error('❌ Python OCR failed with code:', code);
         console.error('❌ Error output:', errorOutput);
@@ -232,27 +267,7 @@ router.post('/describe', upload.single('image'), async (req: any, res: any) => {
         console.log('✅ Successfully parsed Python output');
         
         // Enhanced response with better formatting
-        res.json({
-          success: true,
-          message: 'OCR processing completed successfully',
-          text: result.text || result.english_text || result.hindi_text || 'Text extracted successfully',
-          confidence: result.confidence || 0.8,
-          processing_time: result.processing_time || 'Unknown',
-          enhanced: {
-            englishFinal: result.english_text || result.text || 'English text extracted',
-            hindiFinal: result.hindi_text || 'Hindi text extracted'
-          },
-          raw_ocr: {
-            hindi_text: result.hindi_text || '',
-            english_text: result.english_text || result.text || '',
-            zones_count: result.zones_count || 1
-          },
-          metadata: {
-            filename: req.file.originalname,
-            fileSize: req.file.size,
-            processingTimestamp: new Date().toISOString()
-          }
-        });
+        res.json(formatOcrResponse(result, req.file));
         
       } catch (parseError: any) {
         console.error('❌ Failed to parse Python OCR output:', parseError);
@@ -284,15 +299,6 @@ router.post('/describe', upload.single('image'), async (req: any, res: any) => {
       clearTimeout(timeout);
       console.error('❌ Failed to start Python OCR process:', err);
       
-      // Clean up temp file on error
-      try {
-        if (fs.existsSync(tempImagePath)) {
-          fs.unlinkSync(tempImagePath);
-        }
-      } catch (e: any) {
-        console.log('Could not delete temp file on error:', e);
-      }
-      
       res.status(500).json({
         success: false,
         message: 'Failed to start OCR process - please try again',
@@ -0,0 +1,111 @@
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import readline from 'readline';
+
+// Long-lived `museum_ocr.py --serve` process. Keeps the EasyOCR readers warm so a
+// scan does not pay the Python/torch/model start-up cost. Requests are only routed
+// here once the worker has announced it is ready; otherwise callers fall back to
+// spawning a one-shot OCR script.
+
+type Pending = {
+  resolve: (value: any) => void;
+  reject: (reason: any) => void;
+  timer: NodeJS.Timeout;
+};
+
+export class OCRWorker {
+  private proc: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<string, Pending>();
+  private nextId = 1;
+  private status: 'stopped' | 'starting' | 'ready' | 'error' = 'stopped';
+  private lastHealth: any = null;
+  private restarts = 0;
+
+  constructor(
+    private scriptPath: string,
+    private pythonBin: string = process.platform.startsWith('win') ? 'python' : 'python3',
+    private maxRestarts: number = 3
+  ) {}
+
+  start() {
+    if (this.proc) return;
+    this.status = 'starting';
+    const proc = spawn(this.pythonBin, [this.scriptPath, '--serve']);
+    this.proc = proc;
+
+    const lines = readline.createInterface({ input: proc.stdout });
+    lines.on('line', (line: string) => this.onLine(line));
+    proc.stderr.on('data', () => { /* worker logs go to stderr */ });
+
+    proc.on('error', (err: any) => {
+      console.error('❌ OCR worker failed to start:', err.message);
+      this.status = 'error';
+    });
+
+    proc.on('close', (code: any) => {
+      console.warn('⚠️ OCR worker exited with code:', code);
+      this.proc = null;
+      this.status = 'stopped';
+      for (const [, p] of this.pending) {
+        clearTimeout(p.timer);
+        p.reject(new Error('OCR worker exited'));
+      }
+      this.pending.clear();
+      if (this.restarts < this.maxRestarts) {
+        this.restarts += 1;
+        setTimeout(() => this.start(), 1000);
+      }
+    });
+  }
+
+  isReady(): boolean {
+    return this.status === 'ready' && this.proc !== null;
+  }
+
+  health() {
+    return { status: this.status, restarts: this.restarts, pending: this.pending.size, worker: this.lastHealth };
+  }
+
+  request(payload: Record<string, any>, timeoutMs: number = 45000): Promise<any> {
+    if (!this.proc) return Promise.reject(new Error('OCR worker not running'));
+    const id = String(this.nextId++);
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error('OCR worker request timed out'));
+      }, timeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+      this.proc!.stdin.write(JSON.stringify({ ...payload, id }) + '\n');
+    });
+  }
+
+  ocr(imagePath: string, timeoutMs?: number): Promise<any> {
+    return this.request({ image: imagePath }, timeoutMs);
+  }
+
+  // Encoded upload bytes, decoded in memory by the worker (no temp file)
+  ocrBuffer(image: Buffer, timeoutMs?: number): Promise<any> {
+    return this.request({ image_b64: image.toString('base64') }, timeoutMs);
+  }
+
+  private onLine(line: string) {
+    let msg: any;
+    try {
+      msg = JSON.parse(line);
+    } catch {
+      return;
+    }
+    if (msg.event) {
+      this.status = msg.event === 'ready' ? 'ready' : 'error';
+      this.lastHealth = msg;
+      console.log(`🔍 OCR worker ${this.status} (warm-up ${msg.warmup_time ?? '?'}s)`);
+      return;
+    }
+    const id = msg.id !== undefined ? String(msg.id) : '';
+    const pending = this.pending.get(id);
+    if (!pending) return;
+    this.pending.delete(id);
+    clearTimeout(pending.timer);
+    if (msg.status && msg.ready !== undefined) this.lastHealth = msg;
+    pending.resolve(msg);
+  }
+}
@@ -16,12 +16,12 @@ Environment variables for models:
 - AI_EAST_INPUT_W / AI_EAST_INPUT_H: network input size (multiples of 32). Default: 640x640
 - AI_EAST_SCORE: score threshold (default 0.5)
 - AI_EAST_NMS: NMS threshold (default 0.3)
+- AI_EAST_ROTATED_NMS=1: suppress overlaps with rotated boxes (uses the EAST angle)
 """
 
 from __future__ import annotations
 
 import os
-import math
 from functools import lru_cache
 from typing import List, Tuple, Optional
 
@@ -105,33 +105,47 @@ def _load_east_model():
 
 
 def _decode_east(scores: np.ndarray, geometry: np.ndarray, score_thresh: float = 0.5):
-    num_rows, num_cols = scores.shape[2:4]
-    rects = []
-    confidences = []
-    for y in range(num_rows):
-        scores_data = scores[0, 0, y]
-        x0_data = geometry[0, 0, y]
-        x1_data = geometry[0, 1, y]
-        x2_data = geometry[0, 2, y]
-        x3_data = geometry[0, 3, y]
-        angles_data = geometry[0, 4, y]
-        for x in range(num_cols):
-            score = float(scores_data[x])
-            if score < score_thresh:
-                continue
-            offset_x, offset_y = x * 4.0, y * 4.0
-            angle = float(angles_data[x])
-            cos = math.cos(angle)
-            sin = math.sin(angle)
-            h = float(x0_data[x] + x2_data[x])
-            w = float(x1_data[x] + x3_data[x])
-            end_x = int(offset_x + (cos * x1_data[x]) + (sin * x2_data[x]))
-            end_y = int(offset_y - (sin * x1_data[x]) + (cos * x2_data[x]))
-            start_x = int(end_x - w)
-            start_y = int(end_y - h)
-            rects.append((start_x, start_y, int(w), int(h)))
-            confidences.append(score)
-    return rects, confidences
+    """Decode EAST score/geometry maps into boxes with NumPy array operations.
+
+    Returns (rects, confidences, rotated): axis-aligned (x, y, w, h) boxes in
+    network-input coordinates (same rounding as the original per-cell loop),
+    their scores, and the matching rotated boxes ((cx, cy), (w, h), degrees)
+    that keep the predicted angle for rotated-rect NMS.
+    """
+    score_map = scores[0, 0]
+    ys, xs = np.nonzero(score_map >= score_thresh)  # row-major, like the per-cell loop
+    if ys.size == 0:
+        return [], [], []
+
+    # Same precision as the per-cell loop under the pinned NumPy 1.24: Python-float
+    # cos/sin times a float32 map value is promoted to float64 there (value-based
+    # casting), while the h/w sums of two float32 values stay float32. Explicit
+    # dtypes keep truncation to int on the same pixel whatever the NumPy version.
+    x1 = geometry[0, 1, ys, xs].astype(np.float64)
+    x2 = geometry[0, 2, ys, xs].astype(np.float64)
+    angles = geometry[0, 4, ys, xs].astype(np.float64)
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+
+    h = (geometry[0, 0, ys, xs].astype(np.float32) + geometry[0, 2, ys, xs].astype(np.float32)).astype(np.float64)
+    w = (geometry[0, 1, ys, xs].astype(np.float32) + geometry[0, 3, ys, xs].astype(np.float32)).astype(np.float64)
+    offset_x = xs * 4.0 + cos * x1 + sin * x2
+    offset_y = ys * 4.0 - sin * x1 + cos * x2
+    end_x = np.trunc(offset_x)
+    end_y = np.trunc(offset_y)
+    start_x = np.trunc(end_x - w)
+    start_y = np.trunc(end_y - h)
+
+    boxes = np.stack([start_x, start_y, np.trunc(w), np.trunc(h)], axis=1).astype(np.int64)
+    rects = [tuple(b) for b in boxes.tolist()]
+    confidences = score_map[ys, xs].astype(np.float64).tolist()
+
+    # Rotated box centre from two opposite corners (as in OpenCV's EAST sample)
+    cx = 0.5 * ((-sin * h + offset_x) + (-cos * w + offset_x))
+    cy = 0.5 * ((-cos * h + offset_y) + (sin * w + offset_y))
+    degrees = -np.degrees(angles)
+    rotated = [((a, b), (c, d), e) for a, b, c, d, e in zip(cx.tolist(), cy.tolist(), w.tolist(), h.tolist(), degrees.tolist())]
+    return rects, confidences, rotated
 
 
 def detect_text_boxes(image_bgr: np.ndarray) -> List[Tuple[int, int, int, int]]:
@@ -140,6 +154,9 @@ def detect_text_boxes(image_bgr: np.ndarray) -> List[Tuple[int, int, int, int]]:
         net = _load_east_model()
         if net is None:
             return []
+        if image_bgr.ndim == 2:
+            # Callers may pass their gray view; EAST expects 3 channels
+            image_bgr = cv2.cvtColor(image_bgr, cv2.COLOR_GRAY2BGR)
         h, w = image_bgr.shape[:2]
         target_w = int(os.getenv("AI_EAST_INPUT_W", "640"))
         target_h = int(os.getenv("AI_EAST_INPUT_H", "640"))
@@ -150,14 +167,18 @@ def detect_text_boxes(image_bgr: np.ndarray) -> List[Tuple[int, int, int, int]]:
         net.setInput(blob)
         scores, geometry = net.forward(["feature_fusion/Conv_7/Sigmoid", "feature_fusion/concat_3"])
         score_thresh = float(os.getenv("AI_EAST_SCORE", "0.5"))
-        rects, confidences = _decode_east(scores, geometry, score_thresh=score_thresh)
+        rects, confidences, rotated = _decode_east(scores, geometry, score_thresh=score_thresh)
 
         # NMS and rescale boxes
         nms_thresh = float(os.getenv("AI_EAST_NMS", "0.3"))
         if len(rects) == 0:
             return []
-        # OpenCV NMS requires boxes as [x, y, w, h]
-        indices = cv2.dnn.NMSBoxes(rects, confidences, score_thresh, nms_thresh)
+        if _enabled("AI_EAST_ROTATED_NMS"):
+            # Suppress using the predicted rotation instead of axis-aligned overlap
+            indices = cv2.dnn.NMSBoxesRotated(rotated, confidences, score_thresh, nms_thresh)
+        else:
+            # OpenCV NMS requires boxes as [x, y, w, h]
+            indices = cv2.dnn.NMSBoxes(rects, confidences, score_thresh, nms_thresh)
 
         boxes: List[Tuple[int, int, int, int]] = []
         scale_w = w / float(target_w)
@@ -0,0 +1,731 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmarks for the OCR pipeline stages
+
+Usage:
+  python bench_ocr.py zones [--images test_images] [--batch-size 16] [--repeat 3]
+  python bench_ocr.py east [--size 640] [--density 0.05] [--repeat 20]
+  python bench_ocr.py merge [--lines 60] [--east 400] [--repeat 5]
+  python bench_ocr.py preprocess [--images test_images] [--repeat 3]
+  python bench_ocr.py skew [--width 4000] [--height 3000] [--angle 3] [--repeat 3]
+  python bench_ocr.py illumination [--images test_images] [--repeat 3]
+  python bench_ocr.py prepare [--images test_images] [--profile fast] [--repeat 3]
+  python bench_ocr.py decode [--images test_images] [--profile fast] [--repeat 3]
+  python bench_ocr.py pipeline [--images test_images] [--count 12] [--stage-threads decode=1,preprocess=2] [--queue-size 2]
+  python bench_ocr.py lite-variants [--images test_images] [--workers 1,2,3] [--accept-score 8]
+  python bench_ocr.py paddle-http [--images test_images] [--count 40] [--delay-ms 2] [--per-image-ms 5] [--url URL]
+  python bench_ocr.py detect-scale [--images test_images] [--scales 1,0.75,0.6,0.5] [--profile max] [--recognize]
+  python bench_ocr.py tesseract [--images test_images] [--truth DIR] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Callable, Dict, List
+
+
+def _list_images(directory: str) -> List[str]:
+    images = []
+    if os.path.isdir(directory):
+        for file in sorted(os.listdir(directory)):
+            if file.lower().endswith(('.png', '.jpg', '.jpeg')):
+                images.append(os.path.join(directory, file))
+    return images
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_zones(args) -> None:
+    """Zones per second: per-crop readtext vs direct recognition vs batched direct recognition."""
+    from museum_ocr import MuseumOCR
+
+    images = _list_images(args.images)
+    if not images:
+        print(f"❌ No test images found in {args.images}")
+        return
+
+    modes = [
+        ("readtext per zone", MuseumOCR(direct_recognition=False)),
+        ("direct per zone", MuseumOCR(direct_recognition=True, batch_size=1)),
+        (f"direct batched ({args.batch_size})", MuseumOCR(direct_recognition=True, batch_size=args.batch_size)),
+    ]
+    print(f"{'mode':<28} {'image':<40} {'zones':>6} {'time (s)':>9} {'zones/s':>8}")
+    for name, ocr in modes:
+        # Cache hits would skip the recognition being compared
+        ocr.result_cache = None
+        ocr.zone_cache = None
+        total_zones, total_time = 0, 0.0
+        for image_path in images:
+            ocr.process_image(image_path)  # warm-up
+            zones = len(ocr.process_image(image_path).zones)
+            elapsed = _best_of(lambda: ocr.process_image(image_path), args.repeat)
+            total_zones += zones
+            total_time += elapsed
+            print(f"{name:<28} {os.path.basename(image_path):<40} {zones:>6} {elapsed:>9.3f} {zones / elapsed:>8.1f}")
+        print(f"{name:<28} {'TOTAL':<40} {total_zones:>6} {total_time:>9.3f} {total_zones / total_time:>8.1f}")
+
+
+def _decode_east_loop(scores, geometry, score_thresh=0.5):
+    """Reference per-cell EAST decoder (the pre-vectorization implementation).
+
+    Dtypes are spelled out as the pinned NumPy 1.24 evaluated the original:
+    Python-float cos/sin times a float32 map value in float64, the h/w sums of two
+    float32 values in float32. NumPy 2 (NEP 50) would otherwise keep the products
+    in float32 and the reference would drift with the installed version.
+    """
+    import math
+    import numpy as np
+    num_rows, num_cols = scores.shape[2:4]
+    rects, confidences = [], []
+    for y in range(num_rows):
+        scores_data = scores[0, 0, y]
+        x0_data, x1_data, x2_data, x3_data = (geometry[0, i, y] for i in range(4))
+        angles_data = geometry[0, 4, y]
+        for x in range(num_cols):
+            score = float(scores_data[x])
+            if score < score_thresh:
+                continue
+            offset_x, offset_y = x * 4.0, y * 4.0
+            angle = float(angles_data[x])
+            cos = math.cos(angle)
+            sin = math.sin(angle)
+            h = float(np.float32(x0_data[x]) + np.float32(x2_data[x]))
+            w = float(np.float32(x1_data[x]) + np.float32(x3_data[x]))
+            x1, x2 = float(x1_data[x]), float(x2_data[x])
+            end_x = int(offset_x + (cos * x1) + (sin * x2))
+            end_y = int(offset_y - (sin * x1) + (cos * x2))
+            start_x = int(end_x - w)
+            start_y = int(end_y - h)
+            rects.append((start_x, start_y, int(w), int(h)))
+            confidences.append(score)
+    return rects, confidences
+
+
+def bench_east(args) -> None:
+    """EAST decoder: per-cell Python loop vs vectorized NumPy decoder on synthetic maps."""
+    import numpy as np
+    from ai_vision import _decode_east
+
+    rng = np.random.default_rng(0)
+    cells = args.size // 4
+    scores = (rng.random((1, 1, cells, cells)) < args.density) * rng.uniform(0.5, 1.0, (1, 1, cells, cells))
+    scores = scores.astype(np.float32)
+    geometry = np.concatenate([
+        rng.uniform(0, 40, (1, 4, cells, cells)),
+        rng.uniform(-np.pi / 4, np.pi / 4, (1, 1, cells, cells)),
+    ], axis=1).astype(np.float32)
+
+    ref_rects, ref_conf = _decode_east_loop(scores, geometry)
+    new_rects, new_conf, _ = _decode_east(scores, geometry)
+    print(f"cells: {cells}x{cells}, boxes: {len(ref_rects)}, identical: {ref_rects == new_rects and np.allclose(ref_conf, new_conf)}")
+
+    # Parity on fully random 160x160 maps, where float rounding differences
+    # surface as boxes truncated to a different pixel
+    mismatched, total = 0, 0
+    for seed in range(args.parity_maps):
+        rng = np.random.default_rng(seed + 1)
+        scores = rng.random((1, 1, 160, 160)).astype(np.float32)
+        geometry = np.concatenate([
+            rng.uniform(0, 100, (1, 4, 160, 160)),
+            rng.uniform(-np.pi / 2, np.pi / 2, (1, 1, 160, 160)),
+        ], axis=1).astype(np.float32)
+        ref_rects, _ = _decode_east_loop(scores, geometry)
+        new_rects, _, _ = _decode_east(scores, geometry)
+        total += len(ref_rects)
+        mismatched += abs(len(ref_rects) - len(new_rects)) + sum(a != b for a, b in zip(ref_rects, new_rects))
+    print(f"random 160x160 maps: {args.parity_maps}, boxes: {total}, mismatched: {mismatched}")
+
+    t_loop = _best_of(lambda: _decode_east_loop(scores, geometry), args.repeat)
+    t_vec = _best_of(lambda: _decode_east(scores, geometry), args.repeat)
+    print(f"{'loop':<12} {t_loop * 1000:>9.2f} ms")
+    print(f"{'vectorized':<12} {t_vec * 1000:>9.2f} ms  ({t_loop / t_vec:.1f}x)")
+
+
+def _merge_east_loop(zones, east_boxes, iou_thresh=0.5):
+    """Reference EAST merge (the nested iou() closure previously in process_image)."""
+    def iou(a, b):
+        ax, ay, aw, ah = a; bx, by, bw, bh = b
+        x1 = max(ax, bx); y1 = max(ay, by)
+        x2 = min(ax+aw, bx+bw); y2 = min(ay+ah, by+bh)
+        inter = max(0, x2-x1) * max(0, y2-y1)
+        union = aw*ah + bw*bh - inter
+        return inter/union if union > 0 else 0.0
+    merged = zones[:]
+    for eb in east_boxes:
+        if all(iou(eb, zb) < iou_thresh for zb in merged):
+            merged.append(eb)
+    return merged
+
+
+def bench_merge(args) -> None:
+    """Zone merging on synthetic boards: nested-loop EAST merge vs IoU matrices, plus consolidation."""
+    import numpy as np
+    from zone_merge import merge_east_boxes, consolidate_zones
+
+    rng = np.random.default_rng(0)
+    zones = []
+    for line in range(args.lines):
+        # A text line split into word/letter fragments with small gaps
+        y, h, x = 20 + line * 40, int(rng.integers(16, 28)), int(rng.integers(10, 60))
+        while x < 1500:
+            w = int(rng.integers(8, 90))
+            zones.append((x, y + int(rng.integers(-2, 3)), w, h))
+            x += w + int(rng.integers(2, 12))
+    east = [(int(x + rng.integers(-6, 7)), int(y + rng.integers(-4, 5)), int(w), int(h))
+            for x, y, w, h in (zones[i] for i in rng.integers(0, len(zones), args.east))]
+
+    ref = _merge_east_loop(zones, east)
+    new = merge_east_boxes(zones, east)
+    print(f"fragments: {len(zones)}, east boxes: {len(east)}, merged: {len(new)}, identical: {ref == new}")
+
+    t_loop = _best_of(lambda: _merge_east_loop(zones, east), args.repeat)
+    t_vec = _best_of(lambda: merge_east_boxes(zones, east), args.repeat)
+    t_cons = _best_of(lambda: consolidate_zones(new), args.repeat)
+    print(f"{'east loop':<14} {t_loop * 1000:>9.2f} ms")
+    print(f"{'east matrix':<14} {t_vec * 1000:>9.2f} ms  ({t_loop / t_vec:.1f}x)")
+    print(f"{'consolidate':<14} {t_cons * 1000:>9.2f} ms  ({len(new)} -> {len(consolidate_zones(new))} zones)")
+
+
+def bench_preprocess(args) -> None:
+    """Preprocessing time per profile, with the stages auto mode picked for each image."""
+    import cv2
+    from preprocessing import PROFILES, preprocess_gray
+
+    images = _list_images(args.images)
+    if not images:
+        print(f"❌ No test images found in {args.images}")
+        return
+
+    profiles = list(PROFILES) + ["auto"]
+    print(f"{'image':<40} " + " ".join(f"{p:>9}" for p in profiles) + "  auto stages")
+    for image_path in images:
+        gray = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2GRAY)
+        times = [_best_of(lambda: preprocess_gray(gray, p), args.repeat) for p in profiles]
+        stages = preprocess_gray(gray, "auto").stages
+        print(f"{os.path.basename(image_path):<40} " + " ".join(f"{t:>8.3f}s" for t in times) + f"  {', '.join(stages) or '-'}")
+
+
+def _deskew_minarea(gray):
+    """Reference deskew (minAreaRect over every foreground pixel, always warps)."""
+    import cv2
+    import numpy as np
+    thr = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    inv = 255 - thr
+    coords = np.column_stack(np.where(inv > 0))
+    if coords.size == 0:
+        return gray
+    angle = cv2.minAreaRect(coords)[-1]
+    angle = -(90 + angle) if angle < -45 else -angle
+    (h, w) = gray.shape[:2]
+    M = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+    return cv2.warpAffine(gray, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+
+def _synthetic_photo(width: int, height: int, angle: float):
+    """Large phone-photo-sized board: printed lines, sensor noise, rotated by `angle`."""
+    import cv2
+    import numpy as np
+    rng = np.random.default_rng(0)
+    img = np.full((height, width), 225, np.uint8)
+    scale = height / 1500.0
+    for i in range(int(height / (70 * scale)) - 2):
+        cv2.putText(img, f"GALLERY {i} bronze age artefacts from the river valley", (int(80 * scale), int((100 + i * 70) * scale)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2 * scale, 30, max(1, int(3 * scale)))
+    img = np.clip(img + rng.normal(0, 6, img.shape), 0, 255).astype(np.uint8)
+    M = cv2.getRotationMatrix2D((width // 2, height // 2), angle, 1.0)
+    return cv2.warpAffine(img, M, (width, height), borderMode=cv2.BORDER_REPLICATE)
+
+
+def _peak_alloc_mb(fn: Callable[[], object]) -> float:
+    """Peak Python/NumPy allocation during fn (OpenCV's own buffers are not traced)."""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_skew(args) -> None:
+    """Deskew stage on a large photo: full-resolution minAreaRect vs downsampled estimators."""
+    from preprocessing import deskew, estimate_skew
+
+    gray = _synthetic_photo(args.width, args.height, args.angle)
+    print(f"image: {args.width}x{args.height}, applied rotation {args.angle:+.1f} deg")
+    print(f"estimated correction: hull {estimate_skew(gray, 'hull'):+.2f} deg, projection {estimate_skew(gray):+.2f} deg")
+    cases = (
+        ("full-res minAreaRect + warp", lambda: _deskew_minarea(gray)),
+        ("downsampled hull", lambda: deskew(gray)),
+        ("projection estimate", lambda: estimate_skew(gray)),
+        ("projection + warp", lambda: deskew(gray, estimate_skew(gray))),
+    )
+    for name, fn in cases:
+        elapsed = _best_of(fn, args.repeat)
+        print(f"{name:<28} {elapsed * 1000:>9.1f} ms  peak {_peak_alloc_mb(fn):>8.1f} MB")
+
+
+def _normalize_illumination_fixed(gray):
+    """Reference illumination normalization (fixed 31x31 opening at full resolution)."""
+    import cv2
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (31, 31))
+    background = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
+    corrected = cv2.subtract(gray, background)
+    return cv2.normalize(corrected, None, 0, 255, cv2.NORM_MINMAX)
+
+
+def _similarity(a, b):
+    """Mean absolute difference and share of identical Otsu-binarized pixels."""
+    import cv2
+    import numpy as np
+    mad = float(np.abs(a.astype(np.int16) - b.astype(np.int16)).mean())
+    ba = cv2.threshold(a, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    bb = cv2.threshold(b, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    return mad, float((ba == bb).mean())
+
+
+def bench_illumination(args) -> None:
+    """Illumination normalization: fixed full-resolution opening vs pyramid background estimate."""
+    import cv2
+    from preprocessing import illumination_kernel_size, normalize_illumination
+
+    cases = [(os.path.basename(p), cv2.imread(p, cv2.IMREAD_GRAYSCALE)) for p in _list_images(args.images)]
+    cases.append(("synthetic 4000x3000", _synthetic_photo(4000, 3000, 3.0)))
+    print(f"{'image':<32} {'kernel':>6} {'fixed31':>9} {'scaled':>9} {'pyramid':>9}  {'vs scaled: MAD / binary agree':>30}  {'vs fixed31':>16}")
+    for name, gray in cases:
+        fixed = _normalize_illumination_fixed(gray)
+        scaled = normalize_illumination(gray, levels=0)
+        pyramid = normalize_illumination(gray)
+        t_fixed = _best_of(lambda: _normalize_illumination_fixed(gray), args.repeat)
+        t_scaled = _best_of(lambda: normalize_illumination(gray, levels=0), 1)
+        t_pyr = _best_of(lambda: normalize_illumination(gray), args.repeat)
+        mad_s, agree_s = _similarity(scaled, pyramid)
+        mad_f, agree_f = _similarity(fixed, pyramid)
+        print(f"{name:<32} {illumination_kernel_size(gray.shape):>6} {t_fixed * 1000:>7.1f}ms {t_scaled * 1000:>7.1f}ms {t_pyr * 1000:>7.1f}ms"
+              f"  {mad_s:>19.2f} / {agree_s:.4f}  {mad_f:>7.2f} / {agree_f:.4f}")
+
+
+def _prepare_legacy(image, profile):
+    """Reference view handling: copy, gray, stages, Otsu twice, gray->BGR, BGR->gray for detection."""
+    import cv2
+    from preprocessing import preprocess_gray, remove_grid_lines
+    original = image.copy()
+    prepared = preprocess_gray(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), profile,
+                               available=[s for s in ("illumination", "deskew", "clahe", "denoise", "denoise_light", "sharpen")])
+    otsu = cv2.threshold(prepared.gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    combined = cv2.bitwise_or(prepared.gray, remove_grid_lines(otsu))
+    bgr = cv2.cvtColor(combined, cv2.COLOR_GRAY2BGR)
+    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+    morph = cv2.morphologyEx(cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel), cv2.MORPH_OPEN, kernel)
+    return original, bgr, morph
+
+
+def _prepare_pooled(image, profile, pool):
+    """PreparedImage path as used by MuseumOCR: pooled stage frames, gray view only."""
+    import cv2
+    from preprocessing import prepare_image
+    prepared = prepare_image(image, profile, pool=pool, merge_binary=True)
+    shape = prepared.gray.shape[:2]
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+    binary = cv2.adaptiveThreshold(prepared.gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2,
+                                   dst=pool.get("zones_binary", shape))
+    morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, dst=pool.get("zones_morph", shape))
+    return cv2.morphologyEx(morph, cv2.MORPH_OPEN, kernel, dst=binary)
+
+
+def bench_prepare(args) -> None:
+    """Preprocessing + detection views: per-image allocations vs PreparedImage with reused buffers."""
+    import cv2
+    from preprocessing import BufferPool
+
+    cases = [(os.path.basename(p), cv2.imread(p)) for p in _list_images(args.images)]
+    cases.append(("synthetic 4000x3000", cv2.cvtColor(_synthetic_photo(4000, 3000, 0.0), cv2.COLOR_GRAY2BGR)))
+    pool = BufferPool()
+    print(f"profile: {args.profile}")
+    print(f"{'image':<32} {'legacy':>9} {'peak':>9} {'pooled':>9} {'peak':>9}  pool size")
+    for name, image in cases:
+        _prepare_pooled(image, args.profile, pool)  # allocate the pool for this size
+        t_legacy = _best_of(lambda: _prepare_legacy(image, args.profile), args.repeat)
+        t_pooled = _best_of(lambda: _prepare_pooled(image, args.profile, pool), args.repeat)
+        peak_legacy = _peak_alloc_mb(lambda: _prepare_legacy(image, args.profile))
+        peak_pooled = _peak_alloc_mb(lambda: _prepare_pooled(image, args.profile, pool))
+        print(f"{name:<32} {t_legacy * 1000:>7.1f}ms {peak_legacy:>7.1f}MB {t_pooled * 1000:>7.1f}ms {peak_pooled:>7.1f}MB"
+              f"  {pool.nbytes() / (1024 * 1024):.1f}MB")
+
+
+def bench_decode(args) -> None:
+    """Decode + preprocess: full resolution vs decode-time working resolution, on upscaled JPEGs."""
+    import cv2
+    from image_io import load_image, load_working_image
+    from preprocessing import prepare_image
+
+    cases = []
+    for path in _list_images(args.images):
+        image = cv2.imread(path)
+        for factor in (3, 6):
+            # 1200x800 boards upscaled to roughly 9 MP and 35 MP phone photos
+            big = cv2.resize(image, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
+            data = cv2.imencode('.jpg', big, [cv2.IMWRITE_JPEG_QUALITY, 92])[1].tobytes()
+            cases.append((f"{os.path.basename(path)} x{factor}", data))
+
+    print(f"profile: {args.profile}")
+    print(f"{'image':<36} {'full':>9} {'working':>9} {'scale':>6} {'pixels':>8}")
+    for name, data in cases:
+        t_full = _best_of(lambda: prepare_image(load_image(data), args.profile), args.repeat)
+        t_work = _best_of(lambda: prepare_image(load_working_image(data)[0], args.profile), args.repeat)
+        image, scale = load_working_image(data)
+        print(f"{name:<36} {t_full * 1000:>7.1f}ms {t_work * 1000:>7.1f}ms {scale:>6.3f} {image.shape[0] * image.shape[1] / 1e6:>6.1f}MP")
+
+
+def _zone_coverage(reference, zones, shape) -> float:
+    """Share of the reference zones' area covered by `zones`."""
+    import numpy as np
+    if not reference:
+        return 1.0
+    mask = np.zeros(shape[:2], dtype=bool)
+    for (x, y, w, h) in zones:
+        mask[y:y + h, x:x + w] = True
+    covered = sum(int(mask[y:y + h, x:x + w].sum()) for (x, y, w, h) in reference)
+    return covered / float(sum(w * h for (_, _, w, h) in reference))
+
+
+def bench_detect_scale(args) -> None:
+    """Two-resolution mode: preprocessing + detection time and zone coverage per detect scale."""
+    import difflib
+    import cv2
+    from museum_ocr import MIN_DETECT_SCALE, MuseumOCR
+    from zone_merge import consolidate_zones
+
+    # Same range MuseumOCR accepts
+    scales = list(dict.fromkeys(min(1.0, max(MIN_DETECT_SCALE, float(v))) for v in args.scales.split(',')))
+    cases = []
+    for path in _list_images(args.images):
+        image = cv2.imread(path)
+        cases.append((os.path.basename(path), image))
+        cases.append((os.path.basename(path) + " x2",
+                      cv2.resize(image, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)))
+
+    ocr = MuseumOCR(profile=args.profile)
+    ocr.result_cache = None
+    ocr.zone_cache = None
+
+    def detect(image, scale):
+        if scale < 1.0:
+            h, w = image.shape[:2]
+            image = cv2.resize(image, (int(round(w * scale)), int(round(h * scale))), interpolation=cv2.INTER_AREA)
+        gray = ocr.prepare_image(image).gray
+        zones = consolidate_zones(ocr.detect_text_zones(gray, scale))
+        return zones if scale == 1.0 else ocr._map_zones_up(zones, scale, (h, w))
+
+    print(f"profile: {ocr.profile}")
+    header = f"{'image':<36} {'scale':>6} {'detect':>9} {'zones':>6} {'coverage':>9}"
+    print(header + (f" {'total':>9} {'text sim':>9}" if args.recognize else ""))
+    for name, image in cases:
+        reference = detect(image, 1.0)
+        reference_text = None
+        for scale in scales:
+            elapsed = _best_of(lambda: detect(image, scale), args.repeat)
+            zones = detect(image, scale)
+            line = f"{name:<36} {scale:>6.2f} {elapsed * 1000:>7.1f}ms {len(zones):>6} {_zone_coverage(reference, zones, image.shape):>8.1%}"
+            if args.recognize:
+                ocr.detect_scale = scale
+                start = time.perf_counter()
+                text = ocr.process_image(image).text
+                total = time.perf_counter() - start
+                if reference_text is None:
+                    reference_text = text
+                similarity = difflib.SequenceMatcher(None, reference_text, text).ratio()
+                line += f" {total:>8.2f}s {similarity:>8.1%}"
+            print(line)
+
+
+def bench_pipeline(args) -> None:
+    """Images/s of serial process_image vs. the staged pipeline on the same stream."""
+    import cv2
+    import numpy as np
+    from museum_ocr import MuseumOCR
+    from ocr_pipeline import StagedPipeline, parse_threads
+
+    # Distinct frames (slightly shifted copies) so no cache short-circuits the work
+    base = [cv2.imread(path) for path in _list_images(args.images)]
+    stream = []
+    for i in range(args.count):
+        image = base[i % len(base)]
+        stream.append(np.ascontiguousarray(np.roll(image, i // len(base) + 1, axis=1)))
+
+    ocr = MuseumOCR(profile=args.profile)
+    ocr.result_cache = None
+    ocr.zone_cache = None
+    ocr.process_image(stream[0])  # warm the readers
+
+    start = time.perf_counter()
+    for image in stream:
+        ocr.process_image(image)
+    serial = time.perf_counter() - start
+
+    pipeline = StagedPipeline(ocr, threads=parse_threads(args.stage_threads), queue_size=args.queue_size)
+    start = time.perf_counter()
+    failed = sum(1 for item in pipeline.run(stream) if item.error)
+    pipelined = time.perf_counter() - start
+
+    print(f"profile: {ocr.profile}, {len(stream)} images")
+    print(f"{'serial':<12} {serial:>8.2f}s {len(stream) / serial:>7.2f} img/s")
+    print(f"{'pipelined':<12} {pipelined:>8.2f}s {len(stream) / pipelined:>7.2f} img/s  "
+          f"({serial / pipelined:.2f}x, {failed} failed)")
+    print(f"{'stage':<12} {'threads':>7} {'busy':>9} {'max queued':>11}")
+    for name, st in pipeline.stats().items():
+        print(f"{name:<12} {st['threads']:>7} {st['busy_s']:>8.2f}s {st['max_queued']:>11}")
+
+
+def bench_lite_variants(args) -> None:
+    """Wall clock of lite_ocr.run_easyocr per image for several variant worker counts."""
+    import cv2
+    import lite_ocr
+
+    os.environ["OCR_LITE_ACCEPT_SCORE"] = str(args.accept_score)
+    workers = [int(v) for v in args.workers.split(',')]
+    print(f"{'image':<36} {'workers':>7} {'time':>9} {'passes':>7}  text")
+    for path in _list_images(args.images):
+        gray, _ = lite_ocr.preprocess_image(cv2.imread(path), profile='fast')
+        for n in workers:
+            os.environ["OCR_LITE_WORKERS"] = str(n)
+            lite_ocr.run_easyocr(gray, args.lang)  # warm the reader and the pool
+            stats: Dict[str, float] = {}
+            elapsed = _best_of(lambda: lite_ocr.run_easyocr(gray, args.lang, stats), args.repeat)
+            text = lite_ocr.run_easyocr(gray, args.lang) or ''
+            print(f"{os.path.basename(path):<36} {n:>7} {elapsed * 1000:>7.1f}ms {int(stats.get('easyocr.passes', 0)):>7}  {text[:30]!r}")
+
+
+def bench_paddle_http(args) -> None:
+    """PaddleOCR HTTP transports against the local stub (or --url): per-request posts vs. pooled session."""
+    import base64
+    import json
+    import cv2
+    import requests
+    from lite_ocr import preprocess_image
+    from paddle_http import PaddleHTTPClient
+    from paddle_stub_server import start_stub_server
+
+    url = args.url
+    if not url:
+        _, url = start_stub_server(delay_ms=args.delay_ms, per_image_ms=args.per_image_ms)
+    binaries = [preprocess_image(cv2.imread(path), profile='fast')[1] for path in _list_images(args.images)]
+    stream = [binaries[i % len(binaries)] for i in range(args.count)]
+
+    def legacy() -> None:
+        # The old run_paddle_http: new connection, JPEG in base64 JSON, per image
+        for img in stream:
+            _, encoded = cv2.imencode('.jpg', img)
+            payload = {"images": ["data:image/jpeg;base64," + base64.b64encode(encoded.tobytes()).decode('utf-8')]}
+            requests.post(url, data=json.dumps(payload), headers={"Content-Type": "application/json"},
+                          timeout=20).json()
+
+    print(f"endpoint: {url}, {len(stream)} images")
+    print(f"{'transport':<22} {'total':>9} {'per image':>10} {'p50 call':>9} {'p95 call':>9} {'calls':>6} {'errors':>6}")
+    elapsed = _best_of(legacy, 1)
+    print(f"{'legacy post (jpg)':<22} {elapsed:>8.2f}s {elapsed / len(stream) * 1000:>8.1f}ms")
+    for label, transport, batched in (("session json (png)", "json", False),
+                                      ("session binary (png)", "binary", False),
+                                      (f"batched json x{args.batch}", "json", True)):
+        client = PaddleHTTPClient(url, transport=transport, image_format='png', max_batch=args.batch)
+        start = time.perf_counter()
+        if batched:
+            client.ocr_many(stream)
+        else:
+            for img in stream:
+                client.ocr(img)
+        elapsed = time.perf_counter() - start
+        st = client.stats()
+        print(f"{label:<22} {elapsed:>8.2f}s {elapsed / len(stream) * 1000:>8.1f}ms "
+              f"{st['latency_ms']['p50']:>7.1f}ms {st['latency_ms']['p95']:>7.1f}ms {st['calls']:>6} {st['errors']:>6}")
+        client.close()
+
+
+_SYNTHETIC_LINES = ["FOSSIL SCIENCE MUSEUM", "Open 10am to 6pm", "Closed on Mondays", "Please do not touch"]
+
+
+def _synthetic_board():
+    """Clean printed English board (the case the Tesseract fast path is for)."""
+    import cv2
+    import numpy as np
+    image = np.full((400, 900, 3), 245, np.uint8)
+    for i, line in enumerate(_SYNTHETIC_LINES):
+        cv2.putText(image, line, (30, 80 + 80 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (20, 20, 20), 3)
+    return image
+
+
+def _text_accuracy(reference: str, text: str) -> float:
+    """Character similarity of the sorted lower-case words (zone order is not compared)."""
+    import difflib
+    return difflib.SequenceMatcher(None, " ".join(sorted(reference.lower().split())),
+                                   " ".join(sorted(text.lower().split()))).ratio()
+
+
+def bench_tesseract(args) -> None:
+    """Tesseract fast path vs EasyOCR: latency and text accuracy, lite (whole image) and museum (per zone)."""
+    import cv2
+    import lite_ocr
+    from museum_ocr import MuseumOCR
+    from tesseract_ocr import accept_fast_path, get_tesseract_reader
+
+    reader = get_tesseract_reader()
+    if reader is None:
+        print("❌ Tesseract not available (pip install -r requirements-tesseract.txt, eng traineddata in TESSDATA_PREFIX, OCR_TESSERACT=1)")
+        return
+
+    cases = []
+    for path in _list_images(args.images):
+        truth = None
+        truth_path = os.path.join(args.truth, os.path.splitext(os.path.basename(path))[0] + '.txt') if args.truth else ''
+        if truth_path and os.path.exists(truth_path):
+            with open(truth_path, encoding='utf-8') as f:
+                truth = f.read()
+        cases.append((os.path.basename(path), cv2.imread(path), truth))
+    cases.append(("synthetic english board", _synthetic_board(), "\n".join(_SYNTHETIC_LINES)))
+
+    # Accuracy is against --truth/<image>.txt when given, else agreement with EasyOCR
+    print(f"{'lite (whole image)':<36} {'easyocr':>9} {'tesseract':>9} {'conf':>5} {'kept':>5} {'accuracy':>17}")
+    for name, image, truth in cases:
+        gray, _ = lite_ocr.preprocess_image(image, profile=args.profile)
+        plain = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        lite_ocr.run_easyocr(gray, 'eng')  # warm the reader
+        t_easy = _best_of(lambda: lite_ocr.run_easyocr(gray, 'eng'), args.repeat)
+        t_tess = _best_of(lambda: reader.read(plain), args.repeat)
+        easy_text = lite_ocr.run_easyocr(gray, 'eng') or ''
+        tess_text, conf = reader.read(plain)
+        reference = truth if truth is not None else easy_text
+        accuracy = f"{_text_accuracy(reference, tess_text):.0%}"
+        if truth is not None:
+            accuracy = f"{_text_accuracy(truth, easy_text):.0%} / {accuracy}"
+        print(f"{name:<36} {t_easy * 1000:>7.0f}ms {t_tess * 1000:>7.0f}ms {conf:>5.2f} "
+              f"{'yes' if accept_fast_path(tess_text, conf) else 'no':>5} {accuracy:>17}")
+
+    print(f"\n{'museum (per zone)':<36} {'easyocr':>9} {'+tess':>9} {'zones':>7} {'english acc':>17}")
+    engines = [MuseumOCR(profile=args.profile, tesseract_zones=False), MuseumOCR(profile=args.profile, tesseract_zones=True)]
+    for ocr in engines:
+        ocr.result_cache = None
+        ocr.zone_cache = None
+    for name, image, truth in cases:
+        engines[0].process_image(image)  # warm the readers
+        t_easy = _best_of(lambda: engines[0].process_image(image), args.repeat)
+        t_tess = _best_of(lambda: engines[1].process_image(image), args.repeat)
+        easy, tess = engines[0].process_image(image), engines[1].process_image(image)
+        zones = f"{tess.recognizers.get('tesseract', 0)}/{len(tess.zones)}"
+        accuracy = f"{_text_accuracy(truth if truth is not None else easy.english_text, tess.english_text):.0%}"
+        if truth is not None:
+            accuracy = f"{_text_accuracy(truth, easy.english_text):.0%} / {accuracy}"
+        print(f"{name:<36} {t_easy:>8.2f}s {t_tess:>8.2f}s {zones:>7} {accuracy:>17}")
+    print("accuracy: easyocr / tesseract vs truth, or tesseract vs easyocr without truth")
+
+
+def main():
+    ap = argparse.ArgumentParser(description='OCR pipeline benchmarks')
+    sub = ap.add_subparsers(dest='bench', required=True)
+
+    p = sub.add_parser('zones', help='Zone recognition throughput')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--batch-size', type=int, default=16)
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_zones)
+
+    p = sub.add_parser('east', help='EAST decoder micro-benchmark')
+    p.add_argument('--size', type=int, default=640, help='Network input size (multiple of 32)')
+    p.add_argument('--density', type=float, default=0.05, help='Fraction of cells above the score threshold')
+    p.add_argument('--repeat', type=int, default=20)
+    p.add_argument('--parity-maps', type=int, default=5, help='Random 160x160 maps checked against the per-cell loop')
+    p.set_defaults(func=bench_east)
+
+    p = sub.add_parser('merge', help='Zone merge/consolidation micro-benchmark')
+    p.add_argument('--lines', type=int, default=60, help='Synthetic text lines')
+    p.add_argument('--east', type=int, default=400, help='Synthetic EAST boxes')
+    p.add_argument('--repeat', type=int, default=5)
+    p.set_defaults(func=bench_merge)
+
+    p = sub.add_parser('preprocess', help='Preprocessing time per profile')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_preprocess)
+
+    p = sub.add_parser('skew', help='Deskew time and peak memory on a large photo')
+    p.add_argument('--width', type=int, default=4000)
+    p.add_argument('--height', type=int, default=3000)
+    p.add_argument('--angle', type=float, default=3.0, help='Rotation applied to the synthetic board')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_skew)
+
+    p = sub.add_parser('illumination', help='Illumination normalization speed and output similarity')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_illumination)
+
+    p = sub.add_parser('prepare', help='PreparedImage buffer reuse: time and peak allocations')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--profile', default='fast', help='Preprocessing profile (max runs NL-means on the 12 MP photo)')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_prepare)
+
+    p = sub.add_parser('decode', help='Decode-time working resolution vs full-size decode')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--profile', default='fast')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_decode)
+
+    p = sub.add_parser('pipeline', help='Serial vs. staged (overlapping) decode/preprocess/detect/recognize')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--count', type=int, default=12, help='Images in the stream')
+    p.add_argument('--profile', default=None, help='Preprocessing profile (default: OCR_PROFILE or max)')
+    p.add_argument('--stage-threads', default='', help='e.g. decode=1,preprocess=2,detect=1,recognize=1')
+    p.add_argument('--queue-size', type=int, default=2)
+    p.set_defaults(func=bench_pipeline)
+
+    p = sub.add_parser('lite-variants', help='lite_ocr variant/rotation search: sequential vs. thread pool')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--lang', default='eng')
+    p.add_argument('--workers', default='1,2,3', help='Comma-separated OCR_LITE_WORKERS values')
+    p.add_argument('--accept-score', type=float, default=8.0, help='OCR_LITE_ACCEPT_SCORE (0 = all 9 passes)')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_lite_variants)
+
+    p = sub.add_parser('paddle-http', help='PaddleOCR HTTP: per-request posts vs. pooled session / binary / batched')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--count', type=int, default=40)
+    p.add_argument('--batch', type=int, default=8, help='Images per batched json request')
+    p.add_argument('--url', default=None, help='Service URL (default: start the local stub)')
+    p.add_argument('--delay-ms', type=float, default=2.0, help='Stub latency per request')
+    p.add_argument('--per-image-ms', type=float, default=5.0, help='Stub latency per image')
+    p.set_defaults(func=bench_paddle_http)
+
+    p = sub.add_parser('detect-scale', help='Detect on a downscaled copy, recognize full-resolution crops')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--scales', default='1,0.75,0.6,0.5', help='Comma-separated detect scales (first = reference)')
+    p.add_argument('--profile', default=None, help='Preprocessing profile (default: OCR_PROFILE or max)')
+    p.add_argument('--recognize', action='store_true', help='Also run full OCR and compare text to the first scale')
+    p.add_argument('--repeat', type=int, default=1)
+    p.set_defaults(func=bench_detect_scale)
+
+    p = sub.add_parser('tesseract', help='Tesseract fast path vs EasyOCR: latency and accuracy')
+    p.add_argument('--images', default='test_images')
+    p.add_argument('--truth', default=None, help='Directory of <image name>.txt reference transcripts')
+    p.add_argument('--profile', default=None, help='Preprocessing profile (default: OCR_PROFILE or max)')
+    p.add_argument('--repeat', type=int, default=3)
+    p.set_defaults(func=bench_tesseract)
+
+    args = ap.parse_args()
+    # Keep benchmark output readable
+    logging.disable(logging.INFO)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
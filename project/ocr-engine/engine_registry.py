@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Process-wide registry of OCR engines shared by museum_ocr, simple_ocr and lite_ocr.
+
+Loading an EasyOCR reader or a PaddleOCR model costs more than recognizing a whole
+board, so each engine is built lazily once per (backend, languages, settings) key
+and then shared across calls. When a memory cap is configured, the least recently
+used engines are evicted to stay under it when a new one is built. Engines held
+through lease() are never evicted, so a caller that needs several engines at once
+(MuseumOCR's Hindi and English readers) does not evict one by fetching the other;
+if the leased engines alone exceed the cap, the cap is exceeded rather than
+rebuilding them.
+
+Environment (optional):
+- OCR_ENGINE_MEMORY_MB: soft cap for all cached engines (default 0 = unlimited)
+
+Usage:
+  from engine_registry import get_engine, lease_engine
+  reader = get_engine('easyocr', ['en'], gpu=False)
+  with lease_engine('easyocr', ['hi'], gpu=False) as reader:   # pinned while in use
+      reader.readtext(image)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Sequence, Tuple
+
+try:
+    import psutil  # type: ignore
+    _HAS_PSUTIL = True
+except Exception:
+    _HAS_PSUTIL = False
+
+logger = logging.getLogger(__name__)
+
+EngineKey = Tuple[str, Tuple[str, ...], Tuple[Tuple[str, Hashable], ...]]
+
+# Rough per-engine footprint used when RSS cannot be measured
+_DEFAULT_ENGINE_MB = {
+    "easyocr": 250.0,
+    "paddle": 150.0,
+    "tesseract": 40.0,
+}
+
+
+def _build_easyocr(languages: Sequence[str], **settings):
+    import easyocr  # type: ignore
+    return easyocr.Reader(list(languages), gpu=settings.get("gpu", False))
+
+
+def _build_paddle(languages: Sequence[str], **settings):
+    from paddleocr import PaddleOCR  # type: ignore
+    return PaddleOCR(
+        use_angle_cls=settings.get("use_angle_cls", True),
+        lang=languages[0] if languages else "en",
+        show_log=False,
+    )
+
+
+def _build_tesseract(languages: Sequence[str], **settings):
+    from tesseract_ocr import TesseractReader
+    return TesseractReader(languages or ["eng"], max_handles=settings.get("max_handles"))
+
+
+def _rss_mb() -> Optional[float]:
+    if not _HAS_PSUTIL:
+        return None
+    try:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class _Entry:
+    __slots__ = ("engine", "size_mb", "built_at", "last_used", "hits", "leases")
+
+    def __init__(self, engine: Any, size_mb: float):
+        self.engine = engine
+        self.size_mb = size_mb
+        self.built_at = time.time()
+        self.last_used = self.built_at
+        self.hits = 0
+        # Active lease() blocks; a leased engine is never evicted
+        self.leases = 0
+
+
+class EngineRegistry:
+    """Lazily builds and caches OCR engines, evicting LRU entries under a memory cap."""
+
+    def __init__(self, max_memory_mb: Optional[float] = None):
+        if max_memory_mb is None:
+            try:
+                max_memory_mb = float(os.getenv("OCR_ENGINE_MEMORY_MB", "0"))
+            except Exception:
+                max_memory_mb = 0.0
+        self.max_memory_mb = max_memory_mb
+        self._builders: Dict[str, Callable[..., Any]] = {
+            "easyocr": _build_easyocr,
+            "paddle": _build_paddle,
+            "tesseract": _build_tesseract,
+        }
+        self._entries: "OrderedDict[EngineKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[EngineKey, threading.Lock] = {}
+        self.builds = 0
+        self.evictions = 0
+
+    def register_builder(self, backend: str, builder: Callable[..., Any]) -> None:
+        """Add or replace the factory used for a backend name."""
+        self._builders[backend] = builder
+
+    @staticmethod
+    def make_key(backend: str, languages: Sequence[str], settings: Dict[str, Hashable]) -> EngineKey:
+        return (backend, tuple(languages), tuple(sorted(settings.items())))
+
+    def get(self, backend: str, languages: Sequence[str], **settings) -> Any:
+        """Return the shared engine for this key, building it on first use."""
+        return self._acquire(backend, languages, settings, lease=False)
+
+    @contextmanager
+    def lease(self, backend: str, languages: Sequence[str], **settings) -> Iterator[Any]:
+        """Shared engine for this key, kept out of eviction until the block exits."""
+        key = self.make_key(backend, languages, settings)
+        engine = self._acquire(backend, languages, settings, lease=True)
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.engine is engine and entry.leases > 0:
+                    entry.leases -= 1
+
+    def _acquire(self, backend: str, languages: Sequence[str], settings: Dict[str, Hashable], lease: bool) -> Any:
+        key = self.make_key(backend, languages, settings)
+        with self._lock:
+            entry = self._touch(key, lease)
+            if entry is not None:
+                return entry.engine
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Build outside the registry lock so other engines stay available
+        with build_lock:
+            with self._lock:
+                entry = self._touch(key, lease)
+                if entry is not None:
+                    return entry.engine
+            builder = self._builders.get(backend)
+            if builder is None:
+                raise KeyError(f"Unknown OCR backend: {backend}")
+
+            logger.info(f"🚀 Loading OCR engine {backend}{list(languages)}...")
+            rss_before = _rss_mb()
+            start = time.time()
+            engine = builder(languages, **settings)
+            rss_after = _rss_mb()
+            if rss_before is not None and rss_after is not None and rss_after > rss_before:
+                size_mb = rss_after - rss_before
+            else:
+                size_mb = _DEFAULT_ENGINE_MB.get(backend, 100.0)
+            logger.info(f"✅ OCR engine {backend}{list(languages)} loaded in {time.time() - start:.2f}s (~{size_mb:.0f} MB)")
+
+            with self._lock:
+                entry = _Entry(engine, size_mb)
+                entry.leases = int(lease)
+                self._entries[key] = entry
+                self.builds += 1
+                self._evict_over_cap(keep=key)
+            return engine
+
+    def _touch(self, key: EngineKey, lease: bool = False) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.last_used = time.time()
+        entry.hits += 1
+        entry.leases += int(lease)
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict_over_cap(self, keep: EngineKey) -> None:
+        if not self.max_memory_mb or self.max_memory_mb <= 0:
+            return
+        total = sum(e.size_mb for e in self._entries.values())
+        for key, entry in list(self._entries.items()):
+            if total <= self.max_memory_mb:
+                break
+            if key == keep or entry.leases > 0:
+                continue
+            self._remove(key)
+            total -= entry.size_mb
+            self.evictions += 1
+            logger.info(f"♻️ Evicted OCR engine {key[0]}{list(key[1])} (~{entry.size_mb:.0f} MB)")
+        if total > self.max_memory_mb:
+            logger.info(f"ℹ️ OCR engines in use need ~{total:.0f} MB, over OCR_ENGINE_MEMORY_MB={self.max_memory_mb:.0f}")
+
+    def _remove(self, key: EngineKey) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        build_lock = self._build_locks.get(key)
+        if build_lock is not None and not build_lock.locked():
+            # A build in progress still needs its lock; otherwise the key is gone
+            del self._build_locks[key]
+        return entry
+
+    def evict(self, backend: str, languages: Sequence[str], **settings) -> bool:
+        key = self.make_key(backend, languages, settings)
+        with self._lock:
+            return self._remove(key) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries.keys()):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "engines": [
+                    {
+                        "backend": key[0],
+                        "languages": list(key[1]),
+                        "size_mb": round(entry.size_mb, 1),
+                        "hits": entry.hits,
+                        "leases": entry.leases,
+                        "idle_seconds": round(time.time() - entry.last_used, 1),
+                    }
+                    for key, entry in self._entries.items()
+                ],
+                "memory_mb": round(sum(e.size_mb for e in self._entries.values()), 1),
+                "max_memory_mb": self.max_memory_mb,
+                "builds": self.builds,
+                "evictions": self.evictions,
+            }
+
+
+_REGISTRY = EngineRegistry()
+
+
+def get_registry() -> EngineRegistry:
+    return _REGISTRY
+
+
+def get_engine(backend: str, languages: Sequence[str], **settings) -> Any:
+    """Shared engine for (backend, languages, settings) from the process-wide registry."""
+    return _REGISTRY.get(backend, languages, **settings)
+
+
+def lease_engine(backend: str, languages: Sequence[str], **settings):
+    """Context manager holding the shared engine out of eviction while in use."""
+    return _REGISTRY.lease(backend, languages, **settings)
+
+
+__all__ = [
+    "EngineRegistry",
+    "get_engine",
+    "get_registry",
+    "lease_engine",
+]
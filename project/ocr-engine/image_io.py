@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Image input for the OCR entry points without a temp-file round trip.
+
+The backend used to write every upload to uploads/temp_<ts>.png so the engines
+could cv2.imread it back. Engines now take any of these sources:
+- a numpy array (already decoded, used as-is)
+- encoded bytes / bytearray / memoryview (decoded with cv2.imdecode, no copy)
+- "-": encoded bytes read from stdin
+- "shm://<name>[?size=N]": encoded bytes in a named shared-memory segment
+  (multiprocessing.shared_memory; on Linux the segment is /dev/shm/<name>);
+  N is the payload length when the segment is larger than the image
+- any other string: a file path, read with cv2.imread (CLI usage)
+
+load_working_image additionally brings the image to the canonical working
+resolution while decoding: text height is measured (on a cheap 1/4-scale JPEG
+decode when possible), JPEGs are decoded with cv2.IMREAD_REDUCED_* when the
+target allows it, and the rest is an area resize. It returns the scale so
+coordinates can be mapped back to the original image.
+
+Usage:
+  from image_io import load_image, load_working_image
+  image = load_image(request_bytes)          # BGR uint8
+  image = load_image("shm://ocr_upload_42?size=183422")
+  image, scale = load_working_image("photo.jpg")   # x_original = x / scale
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import base64
+import logging
+from typing import Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+import cv2
+import numpy as np
+
+from preprocessing import estimate_text_height, working_scale
+
+logger = logging.getLogger(__name__)
+
+STDIN = "-"
+SHM_PREFIX = "shm://"
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_JPEG_PROBE_REDUCTION = 4
+_REDUCED_COLOR = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+ImageSource = Union[str, bytes, bytearray, memoryview, np.ndarray]
+
+
+def decode_image(data: Union[bytes, bytearray, memoryview], flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """Decode an encoded image (PNG/JPEG/...) straight from a buffer."""
+    buf = np.frombuffer(memoryview(data), dtype=np.uint8)
+    size = buf.size
+    image = cv2.imdecode(buf, flags) if size else None
+    # Drop the buffer export now so a shared-memory view can be released/closed
+    del buf
+    if image is None:
+        raise ValueError(f"Could not decode image data ({size} bytes)" if size else "Empty image data")
+    return image
+
+
+def decode_base64(text: str, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """Decode a base64 payload (optionally a data: URL) into an image."""
+    if text.startswith("data:") and "," in text:
+        text = text.split(",", 1)[1]
+    return decode_image(base64.b64decode(text), flags)
+
+
+def read_stdin_bytes() -> bytes:
+    return sys.stdin.buffer.read()
+
+
+def _attach_shared_memory(name: str):
+    from multiprocessing import shared_memory
+    try:
+        # Python 3.13+: do not let this process's resource tracker unlink the producer's segment
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        return shm
+
+
+def read_shared_memory(name: str, size: Optional[int] = None, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """Decode an encoded image from a named shared-memory segment.
+
+    The segment is only attached while decoding; it stays owned (and is
+    unlinked) by the producer.
+    """
+    shm = _attach_shared_memory(name)
+    try:
+        view = shm.buf if size is None else shm.buf[:size]
+        try:
+            return decode_image(view, flags)
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+def _decode(src: Union[str, memoryview, bytes, bytearray], flags: int) -> np.ndarray:
+    """Decode a path or an encoded buffer."""
+    if isinstance(src, str):
+        image = cv2.imread(src, flags)
+        if image is None:
+            raise ValueError(f"Could not load image: {src}")
+        return image
+    return decode_image(src, flags)
+
+
+def _is_jpeg(src: Union[str, memoryview, bytes, bytearray]) -> bool:
+    if isinstance(src, str):
+        try:
+            with open(src, "rb") as f:
+                return f.read(3) == _JPEG_MAGIC
+        except OSError:
+            return False
+    return bytes(memoryview(src)[:3]) == _JPEG_MAGIC
+
+
+def _encoded_size(src: Union[str, memoryview, bytes, bytearray]) -> Optional[Tuple[int, int]]:
+    """(width, height) from the image header, without decoding pixels."""
+    try:
+        from PIL import Image
+        with Image.open(src if isinstance(src, str) else io.BytesIO(memoryview(src))) as im:
+            return im.size
+    except Exception:
+        return None
+
+
+def _resize(image: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """Resize to `size`: exact halvings with INTER_AREA (its fast integer path),
+    then bilinear for the remaining factor (>= 0.5); enlargement is bicubic."""
+    if (image.shape[1], image.shape[0]) == size:
+        return image
+    if size[0] > image.shape[1]:
+        return cv2.resize(image, size, interpolation=cv2.INTER_CUBIC)
+    while image.shape[1] // 2 >= size[0] and image.shape[0] // 2 >= size[1]:
+        image = cv2.resize(image, (image.shape[1] // 2, image.shape[0] // 2), interpolation=cv2.INTER_AREA)
+    if (image.shape[1], image.shape[0]) == size:
+        return image
+    return cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)
+
+
+def _working_from_array(image: np.ndarray, allow_upscale: bool, max_side: Optional[int]) -> Tuple[np.ndarray, float]:
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    scale = working_scale(image.shape, estimate_text_height(gray), allow_upscale, max_side)
+    if abs(scale - 1.0) < 1e-3:
+        return image, 1.0
+    h, w = image.shape[:2]
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return _resize(image, size), size[0] / float(w)
+
+
+def _working_from_encoded(src, allow_upscale: bool, max_side: Optional[int]) -> Tuple[np.ndarray, float]:
+    dims = _encoded_size(src)
+    if dims is None or not _is_jpeg(src):
+        return _working_from_array(_decode(src, cv2.IMREAD_COLOR), allow_upscale, max_side)
+
+    # JPEG: measure text on a 1/4-scale DCT decode, then decode at the coarsest
+    # power-of-two reduction that still covers the working resolution
+    w, h = dims
+    probe = _decode(src, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if (probe.shape[1] > probe.shape[0]) != (w > h):
+        # The decoder applied an EXIF rotation the header size does not show
+        w, h = h, w
+    text_height = estimate_text_height(probe)
+    if text_height is not None:
+        text_height *= w / float(probe.shape[1])
+    scale = working_scale((h, w), text_height, allow_upscale, max_side)
+    reduction = 1
+    for r in (8, 4, 2):
+        if 1.0 / r >= scale:
+            reduction = r
+            break
+    image = _decode(src, _REDUCED_COLOR.get(reduction, cv2.IMREAD_COLOR))
+    if abs(scale - 1.0) < 1e-3:
+        return image, image.shape[1] / float(w)
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return _resize(image, size), size[0] / float(w)
+
+
+def load_working_image(source: ImageSource, allow_upscale: bool = False,
+                       max_side: Optional[int] = None) -> Tuple[np.ndarray, float]:
+    """Decode `source` at the canonical working resolution.
+
+    Returns (image, scale) with scale = working width / original width (1.0 when
+    untouched). See preprocessing.working_scale for the resolution policy.
+    """
+    if isinstance(source, np.ndarray):
+        return _working_from_array(source, allow_upscale, max_side)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _working_from_encoded(source, allow_upscale, max_side)
+    if source == STDIN:
+        return _working_from_encoded(read_stdin_bytes(), allow_upscale, max_side)
+    if source.startswith(SHM_PREFIX):
+        name, size = _parse_shm(source)
+        shm = _attach_shared_memory(name)
+        try:
+            view = shm.buf if size is None else shm.buf[:size]
+            try:
+                return _working_from_encoded(view, allow_upscale, max_side)
+            finally:
+                view.release()
+        finally:
+            shm.close()
+    return _working_from_encoded(source, allow_upscale, max_side)
+
+
+def _parse_shm(source: str):
+    spec = source[len(SHM_PREFIX):]
+    name, _, query = spec.partition("?")
+    size = parse_qs(query).get("size", [None])[0]
+    return name, int(size) if size else None
+
+
+def is_path(source: ImageSource) -> bool:
+    """True for plain file paths (not stdin or shared memory)."""
+    return isinstance(source, str) and source != STDIN and not source.startswith(SHM_PREFIX)
+
+
+def load_image(source: ImageSource, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """Decode an image from any supported source (see module docstring)."""
+    if isinstance(source, np.ndarray):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return decode_image(source, flags)
+    if source == STDIN:
+        return decode_image(read_stdin_bytes(), flags)
+    if source.startswith(SHM_PREFIX):
+        name, size = _parse_shm(source)
+        return read_shared_memory(name, size, flags)
+    image = cv2.imread(source, flags)
+    if image is None:
+        raise ValueError(f"Could not load image: {source}")
+    return image
+
+
+def describe_source(source: ImageSource) -> str:
+    """Short label for logs."""
+    if isinstance(source, np.ndarray):
+        return f"<array {source.shape[1]}x{source.shape[0]}>" if source.ndim >= 2 else "<array>"
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<{memoryview(source).nbytes} bytes>"
+    if source == STDIN:
+        return "<stdin>"
+    return source
+
+
+def source_error(source: ImageSource) -> Optional[str]:
+    """Error message when a path source does not exist, else None."""
+    if is_path(source) and not os.path.exists(source):
+        return f"Image not found: {source}"
+    return None
+
+
+__all__ = [
+    "STDIN",
+    "SHM_PREFIX",
+    "ImageSource",
+    "decode_image",
+    "decode_base64",
+    "read_stdin_bytes",
+    "read_shared_memory",
+    "is_path",
+    "load_image",
+    "load_working_image",
+    "describe_source",
+    "source_error",
+]
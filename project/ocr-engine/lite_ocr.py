@@ -3,23 +3,47 @@
 Lightweight OCR pipeline with strong preprocessing and pluggable backends.
 
 Priority backend: PaddleOCR (Lite) if available locally or via HTTP service.
+English fast path: Tesseract LSTM (tesserocr), tried first and kept only when confident.
 Fallback backend: EasyOCR (already in requirements).
 
 Usage:
   python lite_ocr.py --image test_images/clean_museum_board.png --lang eng
+  python lite_ocr.py --image - < board.jpg          # encoded bytes on stdin
 
 Environment (optional):
-  PADDLE_OCR_URL  -> If set, sends base64 image to an HTTP PaddleOCR service.
+  PADDLE_OCR_URL  -> If set, sends the binarized image to an HTTP PaddleOCR service
+                     (keep-alive session, retries, json or binary transport:
+                     PADDLE_OCR_* settings in paddle_http.py)
+  OCR_PROFILE     -> Preprocessing profile: fast | balanced | max (default) | auto
+  OCR_LITE_ACCEPT_SCORE / OCR_LITE_ACCEPT_CONF
+                  -> EasyOCR stops trying variants/rotations once a candidate reaches
+                     this text score (default 8) and mean confidence (default 0.5);
+                     OCR_LITE_ACCEPT_SCORE=0 always runs all 9 passes
+  OCR_HEDGE_MS / OCR_CASCADE_ROUTING
+                  -> Backends run fastest-healthy first; the next one is started
+                     alongside after this delay (default 1500 ms), see ocr_cascade.py
+  OCR_TESSERACT / OCR_TESSERACT_MIN_CONF
+                  -> English boards are read by a persistent Tesseract handle first;
+                     boards whose ink looks Devanagari, reads below the confidence
+                     (default 0.8) or with Devanagari escalate to the next backend.
+                     Opt-in with OCR_TESSERACT=1, see tesseract_ocr.py
+  OCR_LITE_WORKERS -> Variant passes run at once (default auto: one per 4 CPUs, at
+                     most 3; 1 = sequential). EasyOCR readers are not thread-safe, so
+                     each worker loads its own reader per language (~250 MB each);
+                     torch threads are split between the passes while they run
 """
 
 from __future__ import annotations
 
 import os
-import base64
-import json
+import time
 import argparse
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import itertools
+import threading
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Tuple, Optional
 
 import cv2
 import numpy as np
@@ -54,10 +78,35 @@ except Exception:
     _HAS_EASYOCR = False
 
 try:
-    import requests  # lightweight HTTP client
-    _HAS_REQUESTS = True
+    # Optional: split intra-op threads between concurrent variant passes
+    import torch  # type: ignore
 except Exception:
-    _HAS_REQUESTS = False
+    torch = None
+
+from engine_registry import get_engine
+from paddle_http import get_paddle_client
+from ocr_cascade import Backend, BackendCascade
+from tesseract_ocr import PSM_AUTO, accept_fast_path, get_tesseract_reader, looks_devanagari, min_confidence, tesseract_enabled
+from image_io import ImageSource, load_working_image
+from ocr_cache import ai_flags, get_result_cache, image_fingerprint, image_key
+from preprocessing import STAGES, resolve_profile, preprocess_gray, normalize_illumination, deskew, remove_grid_lines  # noqa: F401
+from preprocessing import estimate_text_orientation
+
+_LITE_STAGES = tuple(s for s in STAGES if s != "sharpen")
+# Long-side cap of the working image (the old fixed output height)
+_MAX_WORKING_SIDE = 1600
+# Text-line orientation ratio above which vertical text reorders the rotations
+_ORIENT_MIN_RATIO = 1.15
+
+
+def _accept_thresholds() -> Tuple[float, float]:
+    """(score, mean confidence) that end run_easyocr's search early; score 0 = try all."""
+    try:
+        score = float(os.getenv("OCR_LITE_ACCEPT_SCORE", "8"))
+        conf = float(os.getenv("OCR_LITE_ACCEPT_CONF", "0.5"))
+    except ValueError:
+        score, conf = 8.0, 0.5
+    return score, conf
 
 
 @dataclass
@@ -65,69 +114,38 @@ class OCRText:
     text: str
     boxes: List[Tuple[int, int, int, int]]
     backend: str
-
-
-def normalize_illumination(gray: np.ndarray) -> np.ndarray:
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (31, 31))
-    background = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
-    corrected = cv2.subtract(gray, background)
-    corrected = cv2.normalize(corrected, None, 0, 255, cv2.NORM_MINMAX)
-    return corrected
-
-
-def deskew(gray: np.ndarray) -> np.ndarray:
-    thr = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
-    inv = 255 - thr
-    coords = np.column_stack(np.where(inv > 0))
-    if coords.size == 0:
-        return gray
-    angle = cv2.minAreaRect(coords)[-1]
-    if angle < -45:
-        angle = -(90 + angle)
-    else:
-        angle = -angle
-    (h, w) = gray.shape[:2]
-    M = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
-    return cv2.warpAffine(gray, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
-
-
-def remove_grid_lines(bin_img: np.ndarray) -> np.ndarray:
-    if bin_img.ndim == 3:
-        gray = cv2.cvtColor(bin_img, cv2.COLOR_BGR2GRAY)
+    timings: Dict[str, float] = field(default_factory=dict)
+    cache: str = ""
+    # Working-resolution width / original width; boxes are in original pixels
+    working_scale: float = 1.0
+    # Backends started by the cascade: {"backend", "started_ms", "seconds", "status"}
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def preprocess_image(path: ImageSource, target_height: int = 1600, profile: Optional[str] = None,
+                     timings: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Gray and binary views at the working resolution.
+
+    Paths/bytes are decoded at the working resolution (text height based, long
+    side at most `target_height`); arrays are taken as already at it.
+    """
+    if isinstance(path, np.ndarray):
+        img_bgr = path
     else:
-        gray = bin_img
-    th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
-    horiz_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-    vert_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
-    detect_h = cv2.morphologyEx(th, cv2.MORPH_OPEN, horiz_kernel, iterations=1)
-    detect_v = cv2.morphologyEx(th, cv2.MORPH_OPEN, vert_kernel, iterations=1)
-    lines = cv2.bitwise_or(detect_h, detect_v)
-    return cv2.bitwise_and(th, cv2.bitwise_not(lines))
-
-
-def preprocess_image(path: str, target_height: int = 1600) -> Tuple[np.ndarray, np.ndarray]:
-    img_bgr = cv2.imread(path)
-    if img_bgr is None:
-        raise ValueError(f"Could not load image: {path}")
+        img_bgr, _ = load_working_image(path, allow_upscale=True, max_side=target_height)
     # Optional SR enhancement (no-op if disabled)
     img_bgr = enhance_image_bgr(img_bgr)
     gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    gray = normalize_illumination(gray)
-    gray = deskew(gray)
-    # Contrast boosting
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-    gray = clahe.apply(gray)
-    # Denoise
-    gray = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-    # Binarize + remove lines
-    bin_img = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
-    bin_img = remove_grid_lines(bin_img)
-    # Resize keeping aspect to a readable height
-    h, w = gray.shape
-    scale = target_height / float(h)
-    if scale > 0 and abs(scale - 1.0) > 1e-3:
-        gray = cv2.resize(gray, (int(w * scale), target_height), interpolation=cv2.INTER_CUBIC)
-        bin_img = cv2.resize(bin_img, (int(w * scale), target_height), interpolation=cv2.INTER_NEAREST)
+    # Illumination, deskew, contrast, denoise and line removal per profile (no sharpening here)
+    prepared = preprocess_gray(gray, profile, available=_LITE_STAGES)
+    if timings is not None:
+        timings.update({f"preprocess.{k}": v for k, v in prepared.timings.items()})
+    gray = prepared.gray
+    # Binarize (+ lines removed when that stage ran)
+    if prepared.binary is not None:
+        bin_img = prepared.binary
+    else:
+        bin_img = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
     return gray, bin_img
 
 
@@ -154,37 +172,23 @@ def postprocess_text(text: str, lang: str) -> str:
     return cleaned
 
 
-def run_paddle_http(bin_img: np.ndarray) -> Optional[str]:
-    if not _HAS_REQUESTS:
-        return None
-    url = os.getenv("PADDLE_OCR_URL")
-    if not url:
-        return None
-    _, encoded = cv2.imencode('.jpg', bin_img)
-    b64 = base64.b64encode(encoded.tobytes()).decode('utf-8')
-    payload = {"images": [f"data:image/jpeg;base64,{b64}"]}
-    try:
-        r = requests.post(url, data=json.dumps(payload), headers={"Content-Type": "application/json"}, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        if isinstance(data, dict) and isinstance(data.get("text"), str):
-            return data["text"].strip()
-        if isinstance(data, dict) and isinstance(data.get("results"), list):
-            first = data["results"][0]
-            if isinstance(first, dict) and isinstance(first.get("text"), str):
-                return first["text"].strip()
-            if isinstance(first, list):
-                return " ".join([str(x.get("text", "")).strip() for x in first if isinstance(x, dict)]).strip()
-    except Exception:
+def run_paddle_http(bin_img: np.ndarray, stats: Optional[Dict[str, float]] = None) -> Optional[str]:
+    """Text from the PaddleOCR HTTP service (pooled session, see paddle_http.py)."""
+    client = get_paddle_client()
+    if client is None:
         return None
-    return None
+    start = time.perf_counter()
+    text = client.ocr(bin_img)
+    if stats is not None:
+        stats["paddle_http"] = time.perf_counter() - start
+    return text
 
 
 def run_paddle_local(bin_img: np.ndarray, lang: str) -> Optional[str]:
     if not _HAS_LOCAL_PADDLE:
         return None
     try:
-        ocr = PaddleOCR(use_angle_cls=True, lang='en' if lang.startswith('eng') else 'hi', show_log=False)
+        ocr = get_engine('paddle', ['en' if lang.startswith('eng') else 'hi'], use_angle_cls=True)
         # PaddleOCR expects RGB image arrays
         rgb = cv2.cvtColor(bin_img, cv2.COLOR_GRAY2RGB)
         result = ocr.ocr(rgb, cls=True)
@@ -201,6 +205,30 @@ def run_paddle_local(bin_img: np.ndarray, lang: str) -> Optional[str]:
         return None
 
 
+def run_tesseract(plain_gray: np.ndarray, stats: Optional[Dict[str, float]] = None) -> Optional[str]:
+    """Text from the shared Tesseract handle pool when it is confident, else "" so
+    the cascade escalates (see tesseract_ocr.accept_fast_path). Boards whose ink
+    looks Devanagari escalate without a read: the eng model turns Hindi into
+    Latin text.
+
+    Reads the decoded frame before preprocessing: Tesseract binarizes on its own,
+    and the enhanced/binarized views cost it accuracy on clean boards.
+    """
+    reader = get_tesseract_reader()
+    if reader is None:
+        return None
+    if looks_devanagari(plain_gray):
+        if stats is not None:
+            stats["tesseract.devanagari"] = 1.0
+        return ""
+    start = time.perf_counter()
+    text, conf = reader.read(plain_gray, psm=PSM_AUTO)
+    if stats is not None:
+        stats["tesseract"] = time.perf_counter() - start
+        stats["tesseract.conf"] = round(conf, 3)
+    return text if accept_fast_path(text, conf) else ""
+
+
 def _score_text(s: str) -> float:
     if not s:
         return 0.0
@@ -213,13 +241,130 @@ def _score_text(s: str) -> float:
     return max(0.0, length_score + word_score - special_penalty)
 
 
-def run_easyocr(gray_img: np.ndarray, lang: str) -> Optional[str]:
+def _read_paragraphs(reader, img: np.ndarray) -> Tuple[List[str], List[float]]:
+    """Texts of one readtext(paragraph=True) pass and the confidences reported with them."""
+    texts: List[str] = []
+    confs: List[float] = []
+    for item in reader.readtext(img, paragraph=True):
+        # easyocr returns (bbox, text, conf), (bbox, (text, conf)) or, for paragraphs, (bbox, text)
+        conf: Optional[float] = None
+        if len(item) == 3:
+            _bbox, text, conf = item
+        elif len(item) == 2 and isinstance(item[1], (list, tuple)) and len(item[1]) >= 2:
+            _bbox, meta = item
+            text, conf = meta[0], meta[1]
+        elif len(item) == 2 and isinstance(item[1], str):
+            _bbox, text = item
+        else:
+            continue
+        if not (isinstance(text, str) and text.strip()):
+            continue
+        if conf is not None:
+            if float(conf) <= 0.3:
+                continue
+            confs.append(float(conf))
+        texts.append(text.strip())
+    return texts, confs
+
+
+def _rotation_order(gray_img: np.ndarray) -> Tuple[List[int], str, float]:
+    """Rotations to try, most likely first, from the text-line orientation."""
+    orientation, ratio = estimate_text_orientation(gray_img)
+    if orientation == "vertical" and ratio >= _ORIENT_MIN_RATIO:
+        return [90, 270, 0], orientation, ratio
+    return [0, 90, 270], orientation, ratio  # 180 rarely adds value after deskew
+
+
+def _variant_workers() -> int:
+    """Threads evaluating variants concurrently (OCR_LITE_WORKERS; auto = 1 per 4 CPUs, max 3)."""
+    value = os.getenv("OCR_LITE_WORKERS", "auto").strip().lower()
+    if value in {"", "auto"}:
+        return max(1, min(3, (os.cpu_count() or 1) // 4))
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return 1
+
+
+_variant_pool: Optional[ThreadPoolExecutor] = None
+_variant_pool_workers = 0
+_variant_pool_lock = threading.Lock()
+# Replica index of the pool thread's own EasyOCR readers (unset outside the pool)
+_variant_local = threading.local()
+
+
+def _init_variant_thread(replicas) -> None:
+    _variant_local.replica = next(replicas)
+
+
+def _get_variant_pool(workers: int) -> ThreadPoolExecutor:
+    """Shared pool for variant passes; each worker thread reads with its own EasyOCR readers."""
+    global _variant_pool, _variant_pool_workers, _torch_threads_baseline
+    with _variant_pool_lock:
+        if _variant_pool is None or _variant_pool_workers != workers:
+            if _variant_pool is not None:
+                _variant_pool.shutdown(wait=False)
+            _variant_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lite-variant",
+                                               initializer=_init_variant_thread,
+                                               initargs=(itertools.count(),))
+            _variant_pool_workers = workers
+            if torch is not None:
+                _torch_threads_baseline = torch.get_num_threads()
+        return _variant_pool
+
+
+def _variant_reader(langs: List[str]):
+    """EasyOCR reader for the current thread: a per-worker replica on the variant
+    pool (readers are not thread-safe), the shared one otherwise."""
+    replica = getattr(_variant_local, "replica", None)
+    if replica is None:
+        return get_engine('easyocr', langs, gpu=False)
+    return get_engine('easyocr', langs, gpu=False, replica=replica)
+
+
+_torch_threads_lock = threading.Lock()
+_torch_threads_users = 0
+# Caller's intra-op thread count, read when the variant pool is built
+_torch_threads_baseline = 0
+
+
+@contextmanager
+def _split_torch_threads(workers: int):
+    """Run a variant pass on baseline // workers torch threads; the last pass
+    to finish puts the baseline back (torch.set_num_threads is process-wide)."""
+    global _torch_threads_users
+    if torch is None or _torch_threads_baseline <= 0:
+        yield
+        return
+    with _torch_threads_lock:
+        _torch_threads_users += 1
+        # Set on every pass: torch keeps a per-thread count once a thread has run ops
+        torch.set_num_threads(max(1, _torch_threads_baseline // workers))
+    try:
+        yield
+    finally:
+        with _torch_threads_lock:
+            _torch_threads_users -= 1
+            if _torch_threads_users == 0:
+                torch.set_num_threads(_torch_threads_baseline)
+
+
+def run_easyocr(gray_img: np.ndarray, lang: str, stats: Optional[Dict[str, float]] = None) -> Optional[str]:
+    """Best paragraph text over variants x rotations.
+
+    The rotation matching the estimated text-line orientation is tried first,
+    then variants in order of expected quality (gray, binarized, dilated); the
+    first candidate reaching OCR_LITE_ACCEPT_SCORE (and OCR_LITE_ACCEPT_CONF
+    when the reader reports confidences) is returned. Otherwise the best scoring
+    candidate of all passes wins (earliest in that order on ties). With
+    OCR_LITE_WORKERS > 1 the passes run concurrently, each pool thread on its
+    own reader, and an accepted candidate cancels the passes not yet started.
+    Passes run are added to `stats`.
+    """
     if not _HAS_EASYOCR:
         return None
     langs = ['en'] if lang.startswith('eng') else (['hi'] if lang.startswith('hin') else ['en'])
-    reader = easyocr.Reader(langs, gpu=False)
-
-    candidates: List[str] = []
+    accept_score, accept_conf = _accept_thresholds()
 
     # Prepare variants: grayscale, binarized, and small dilated binary
     bin_img = cv2.threshold(gray_img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
@@ -227,64 +372,166 @@ def run_easyocr(gray_img: np.ndarray, lang: str) -> Optional[str]:
     bin_dilate = cv2.dilate(bin_img, kernel, iterations=1)
 
     variants = [gray_img, bin_img, bin_dilate]
-    rotations = [0, 90, 270]  # 180 rarely adds value after deskew
-
-    for v in variants:
-        for rot in rotations:
-            if rot:
-                v2 = cv2.rotate(v, cv2.ROTATE_90_CLOCKWISE if rot == 90 else cv2.ROTATE_90_COUNTERCLOCKWISE)
-            else:
-                v2 = v
-            result = reader.readtext(v2, paragraph=True)
-            texts: List[str] = []
-            for item in result:
-                # easyocr can return either (bbox, text, conf) or (bbox, (text, conf)) in some versions
-                if len(item) == 3:
-                    _bbox, text, conf = item
-                elif len(item) == 2 and isinstance(item[1], (list, tuple)) and len(item[1]) >= 2:
-                    _bbox, meta = item
-                    text, conf = meta[0], float(meta[1])
-                else:
+    rotations, orientation, ratio = _rotation_order(gray_img)
+    passes = [(rot, v) for rot in rotations for v in variants]
+    done = threading.Event()
+    count_lock = threading.Lock()
+    count = [0]
+
+    def evaluate(rot: int, v: np.ndarray) -> Optional[Tuple[str, float, bool]]:
+        if done.is_set():
+            return None
+        if rot:
+            v = cv2.rotate(v, cv2.ROTATE_90_CLOCKWISE if rot == 90 else cv2.ROTATE_90_COUNTERCLOCKWISE)
+        with _split_torch_threads(workers) if workers > 1 else nullcontext():
+            texts, confs = _read_paragraphs(_variant_reader(langs), v)
+        with count_lock:
+            count[0] += 1
+        if not texts:
+            return None
+        candidate = " ".join(texts)
+        score = _score_text(candidate)
+        accepted = (accept_score > 0 and score >= accept_score
+                    and (not confs or float(np.mean(confs)) >= accept_conf))
+        return candidate, score, accepted
+
+    # (score, -order, text) of the best candidate so far
+    best: Tuple[float, int, str] = (-1.0, 0, "")
+    workers = min(_variant_workers(), len(passes))
+    try:
+        if workers <= 1:
+            for order, (rot, v) in enumerate(passes):
+                outcome = evaluate(rot, v)
+                if outcome is None:
                     continue
-                if isinstance(text, str) and text.strip() and float(conf) > 0.3:
-                    texts.append(text.strip())
-            if texts:
-                candidates.append(" ".join(texts))
-
-    if not candidates:
-        return ""
-    best = max(candidates, key=_score_text)
-    return best
-
-
-def ocr_image(path: str, lang: str = 'eng') -> OCRText:
-    gray, bin_img = preprocess_image(path)
-
-    # Try Paddle via HTTP, then local Paddle, then EasyOCR
-    text: Optional[str] = run_paddle_http(bin_img)
-    backend = 'paddle-http'
-    if not text:
-        text = run_paddle_local(bin_img, lang)
-        backend = 'paddle-local'
-    if not text:
-        text = run_easyocr(gray, lang)
-        backend = 'easyocr'
-    if text is None:
-        text = ''
-        backend = 'none'
-
-    text = postprocess_text(text, lang)
+                if outcome[2]:
+                    return outcome[0]
+                best = max(best, (outcome[1], -order, outcome[0]))
+            return best[2]
+
+        pool = _get_variant_pool(workers)
+        futures = {pool.submit(evaluate, rot, v): order for order, (rot, v) in enumerate(passes)}
+        try:
+            for future in as_completed(futures):
+                outcome = future.result()
+                if outcome is None:
+                    continue
+                if outcome[2]:
+                    return outcome[0]
+                best = max(best, (outcome[1], -futures[future], outcome[0]))
+            return best[2]
+        finally:
+            # Passes already running finish on the pool; queued ones never start
+            done.set()
+            for future in futures:
+                future.cancel()
+    finally:
+        if stats is not None:
+            stats["easyocr.passes"] = float(count[0])
+            stats["easyocr.orientation_ratio"] = round(ratio if orientation == "horizontal" else -ratio, 3)
+
+
+_cascade: Optional[BackendCascade] = None
+_cascade_lock = threading.Lock()
+
+
+def get_cascade() -> BackendCascade:
+    """Process-wide backend cascade (its health stats persist across images)."""
+    global _cascade
+    with _cascade_lock:
+        if _cascade is None:
+            _cascade = BackendCascade([
+                Backend('tesseract', lambda gray, bin_img, lang, plain, stats: run_tesseract(plain, stats),
+                        available=tesseract_enabled, supports=lambda gray, bin_img, lang, plain: lang.startswith('eng'),
+                        thread_safe=True),
+                Backend('paddle-http', lambda gray, bin_img, lang, plain, stats: run_paddle_http(bin_img, stats),
+                        available=lambda: get_paddle_client() is not None, thread_safe=True),
+                Backend('paddle-local', lambda gray, bin_img, lang, plain, stats: run_paddle_local(bin_img, lang),
+                        available=lambda: _HAS_LOCAL_PADDLE),
+                Backend('easyocr', lambda gray, bin_img, lang, plain, stats: run_easyocr(gray, lang, stats),
+                        available=lambda: _HAS_EASYOCR),
+            ])
+        return _cascade
+
+
+def _cache_config(lang: str, profile: Optional[str]) -> Dict:
+    return {
+        "pipeline": "lite",
+        "lang": lang,
+        "profile": resolve_profile(profile),
+        "tesseract": (min_confidence() if tesseract_enabled() else None),
+        "paddle_http": get_paddle_client() is not None,
+        "paddle_local": _HAS_LOCAL_PADDLE,
+        "easyocr": _HAS_EASYOCR,
+        "max_side": _MAX_WORKING_SIDE,
+        "accept": _accept_thresholds(),
+        "ai": ai_flags(),
+    }
+
+
+def ocr_image(path: ImageSource, lang: str = 'eng', profile: Optional[str] = None) -> OCRText:
+    # Decode straight to the working resolution (small text is enlarged, large photos reduced)
+    img_bgr, scale = load_working_image(path, allow_upscale=True, max_side=_MAX_WORKING_SIDE)
+    cache = get_result_cache()
+    cache_key, fingerprint = None, None
+    if cache.enabled:
+        config = _cache_config(lang, profile)
+        cache_key = image_key(img_bgr, config)
+        cached = cache.get(cache_key)
+        status = "hit"
+        if cached is None and cache.near_distance > 0:
+            fingerprint = image_fingerprint(img_bgr, config)
+            match = cache.get_similar(fingerprint)
+            if match is not None:
+                cached, status = match[0], "near-duplicate"
+                # Text only: the box and scale belong to the other image
+                h, w = img_bgr.shape[:2]
+                cached["boxes"] = [(0, 0, int(round(w / scale)), int(round(h / scale)))]
+                cached["working_scale"] = scale
+        if cached is not None:
+            cached["boxes"] = [tuple(b) for b in cached["boxes"]]
+            cached["cache"] = status
+            return OCRText(**cached)
+
+    result = _ocr_bgr(img_bgr, lang, profile, scale)
+    if cache_key is not None:
+        cache.put(cache_key, asdict(result), fingerprint=fingerprint)
+        result.cache = "miss"
+    return result
+
+
+def _ocr_bgr(img_bgr: np.ndarray, lang: str, profile: Optional[str], scale: float = 1.0) -> OCRText:
+    timings: Dict[str, float] = {}
+    gray, bin_img = preprocess_image(img_bgr, profile=profile, timings=timings)
+
+    # The decoded frame as is, for Tesseract (it binarizes on its own)
+    plain = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+
+    # Tesseract (English), Paddle via HTTP, local Paddle, EasyOCR: fastest healthy first,
+    # the next one hedged in after OCR_HEDGE_MS (see ocr_cascade.py)
+    outcome = get_cascade().run(gray, bin_img, lang, plain)
+    timings.update(outcome.stats)
+    for attempt in outcome.attempts:
+        if attempt["seconds"] is not None:
+            timings[f"backend.{attempt['backend']}"] = attempt["seconds"]
+
+    text = postprocess_text(outcome.text or '', lang)
+    # Box in original-image pixels (SR enhancement also changes the size)
     h, w = gray.shape
-    return OCRText(text=text, boxes=[(0, 0, w, h)], backend=backend)
+    scale *= w / float(img_bgr.shape[1])
+    return OCRText(text=text, boxes=[(0, 0, int(round(w / scale)), int(round(h / scale)))], backend=outcome.backend,
+                   timings=timings, working_scale=scale, attempts=outcome.attempts)
 
 
 def main():
     ap = argparse.ArgumentParser(description='Lightweight OCR pipeline')
-    ap.add_argument('--image', required=True, help='Path to input image')
+    ap.add_argument('--image', required=True, help='Path to input image, - for stdin, or shm://name')
     ap.add_argument('--lang', default='eng', help='Language hint: eng or hin')
+    ap.add_argument('--profile', choices=['fast', 'balanced', 'max', 'auto'], default=None,
+                    help='Preprocessing profile (default: OCR_PROFILE or max)')
     args = ap.parse_args()
 
-    result = ocr_image(args.image, args.lang)
+    result = ocr_image(args.image, args.lang, args.profile)
     print(f"Backend: {result.backend}")
     print("--- OCR TEXT ---")
     print(result.text or '(no text)')
@@ -8,14 +8,15 @@ Multi-language (Hindi + English) with zone-aware extraction
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-import easyocr
 import logging
 import os
 import time
 import sys
 import json
-from typing import List, Tuple, Dict
-from dataclasses import dataclass
+import threading
+from contextlib import ExitStack, nullcontext
+from typing import Callable, List, Tuple, Dict, Optional
+from dataclasses import dataclass, field, asdict
 
 try:
     # Optional AI post-correction
@@ -33,10 +34,20 @@ except Exception:
     def detect_text_boxes(img):
         return []
 
+from engine_registry import get_engine, lease_engine
+from zone_merge import merge_east_boxes, consolidate_zones
+import preprocessing
+from image_io import ImageSource, describe_source, load_image, load_working_image, source_error
+from ocr_cache import Fingerprint, ai_flags, get_result_cache, get_zone_cache, image_fingerprint, image_key, zone_key
+from tesseract_ocr import PSM_SINGLE_BLOCK, accept_fast_path, get_tesseract_reader, looks_devanagari, min_confidence, tesseract_enabled
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Smallest detect scale accepted; zone recall drops off below it
+MIN_DETECT_SCALE = 0.5
+
 @dataclass
 class TextZone:
     x: int
@@ -56,24 +67,91 @@ class OCRResult:
     processing_time: float
     zones: List[TextZone]
     preprocessing_steps: List[str]
+    preprocessing_timings: Dict[str, float] = field(default_factory=dict)
+    # "hit" / "near-duplicate" when served from the result cache, "miss" when computed and stored
+    cache: str = ""
+    # Zone cache lookups made by this request: {"hits": n, "misses": n}
+    zone_cache: Dict[str, int] = field(default_factory=dict)
+    # Working-resolution width / original width; zones are reported in original pixels
+    working_scale: float = 1.0
+    # Zones read per recognizer: {"tesseract": n, "easyocr": n}
+    recognizers: Dict[str, int] = field(default_factory=dict)
+
+@dataclass
+class PageJob:
+    """One image moving through MuseumOCR.stages(); each stage fills in the next
+    fields and drops the ones no later stage needs."""
+    source: ImageSource
+    start_time: float = field(default_factory=time.time)
+    image: Optional[np.ndarray] = None
+    scale: float = 1.0
+    cache_key: Optional[str] = None
+    fingerprint: Optional[Fingerprint] = None
+    gray: Optional[np.ndarray] = None
+    full_gray: Optional[np.ndarray] = None
+    recog_image: Optional[np.ndarray] = None
+    # Decoded frame in gray before preprocessing, for the Tesseract fast path
+    plain_gray: Optional[np.ndarray] = None
+    zones: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    preprocessing_steps: List[str] = field(default_factory=list)
+    preprocessing_timings: Dict[str, float] = field(default_factory=dict)
+    result: Optional[OCRResult] = None
+    # Set when stages run on different threads (pooled buffers are per thread)
+    detach: bool = False
+
+def chunk_by_width(sizes: List[Tuple[int, int]], batch_size: int, slack: float = 1.25) -> List[List[int]]:
+    """Group crop indices into recognizer batches of similar resized width.
+
+    Recognizer inputs are scaled to a fixed height and padded to the widest crop
+    in the batch, so crops are ordered by aspect ratio and a batch is closed when
+    full or once a crop is more than `slack` times wider than its first member.
+    """
+    def width_units(i: int) -> int:
+        w, h = sizes[i]
+        return max(1, int(np.ceil(w / max(h, 1))))
+
+    chunks: List[List[int]] = []
+    for i in sorted(range(len(sizes)), key=width_units):
+        if chunks and len(chunks[-1]) < batch_size and width_units(i) <= slack * width_units(chunks[-1][0]):
+            chunks[-1].append(i)
+        else:
+            chunks.append([i])
+    return chunks
 
 class MuseumOCR:
     """
     Museum-Grade OCR Engine with advanced preprocessing and multi-language support
     """
     
-    def __init__(self, force_language: str = None):
+    def __init__(self, force_language: str = None, direct_recognition: Optional[bool] = None,
+                 batch_size: Optional[int] = None, profile: Optional[str] = None,
+                 detect_scale: Optional[float] = None, tesseract_zones: Optional[bool] = None):
         """Initialize the OCR engine
 
         force_language: Optional override for language detection.
         Accepts 'english', 'hindi', or None for auto-detect per zone.
+        direct_recognition: Send the detected zone boxes straight to the recognizer
+        instead of running EasyOCR's CRAFT detector again inside every crop.
+        Defaults to the OCR_DIRECT_RECOGNITION env flag (off).
+        batch_size: Number of zone crops per recognizer call in direct mode.
+        Defaults to OCR_BATCH_SIZE (16); 1 recognizes zones one at a time.
+        profile: Preprocessing profile (fast, balanced, max or auto), see preprocessing.py.
+        Defaults to OCR_PROFILE (max).
+        detect_scale: Preprocess and detect zones on a copy scaled by this factor,
+        then recognize the mapped boxes on full-resolution crops of the decoded
+        image. Defaults to OCR_DETECT_SCALE (1.0 = single resolution); clamped
+        to MIN_DETECT_SCALE-1.0.
+        tesseract_zones: Read each zone with Tesseract first and keep confident
+        English reads; other zones go to the EasyOCR readers. Defaults to
+        OCR_TESSERACT (off unless set to 1), see tesseract_ocr.py.
         """
         logger.info("🚀 Initializing Museum-Grade OCR Engine...")
         
         try:
-            # Initialize EasyOCR readers
-            self.hindi_reader = easyocr.Reader(['hi'], gpu=False)
-            self.english_reader = easyocr.Reader(['en'], gpu=False)
+            # Load (or reuse) the shared EasyOCR readers, leased together so a low
+            # OCR_ENGINE_MEMORY_MB does not evict the first while building the second
+            with lease_engine('easyocr', ['hi'], gpu=False), lease_engine('easyocr', ['en'], gpu=False):
+                pass
             logger.info("✅ EasyOCR readers initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to initialize EasyOCR: {e}")
@@ -86,265 +164,435 @@ class MuseumOCR:
         self.min_zone_width = 30
         self.min_zone_height = 15
         self.force_language = (force_language or '').strip().lower() or None
+        if direct_recognition is None:
+            direct_recognition = os.getenv("OCR_DIRECT_RECOGNITION", "0").strip() not in {"", "0", "false", "False"}
+        self.direct_recognition = direct_recognition
+        if batch_size is None:
+            try:
+                batch_size = int(os.getenv("OCR_BATCH_SIZE", "16"))
+            except Exception:
+                batch_size = 16
+        self.batch_size = max(1, batch_size)
+        # Merge overlapping/collinear fragments before recognition (opt-in: OCR_MERGE_ZONES=1)
+        self.merge_zones = os.getenv("OCR_MERGE_ZONES", "0").strip() not in {"", "0", "false", "False"}
+        if detect_scale is None:
+            try:
+                detect_scale = float(os.getenv("OCR_DETECT_SCALE", "1.0"))
+            except Exception:
+                detect_scale = 1.0
+        # Below MIN_DETECT_SCALE strokes are 1-2 px and the scaled kernels degenerate
+        self.detect_scale = min(1.0, max(MIN_DETECT_SCALE, detect_scale))
+        if self.detect_scale != detect_scale:
+            logger.warning(f"⚠️ Detect scale {detect_scale} clamped to {self.detect_scale} "
+                           f"(supported: {MIN_DETECT_SCALE}-1.0)")
+        if tesseract_zones is None:
+            tesseract_zones = tesseract_enabled()
+        self.tesseract_zones = bool(tesseract_zones)
+        self.tesseract_min_conf = min_confidence()
+        # Bring oversized photos to a working resolution at decode time (OCR_WORKING_RESOLUTION=0 disables)
+        self.working_resolution = os.getenv("OCR_WORKING_RESOLUTION", "1").strip() not in {"", "0", "false", "False"}
+        self.profile = preprocessing.resolve_profile(profile)
+        # Frame buffers reused across images (per thread) by prepare_image/detect_text_zones
+        self._buffers = preprocessing.BufferPool()
+        # Optional cross-request scheduler (see ocr_scheduler.RecognitionBatcher)
+        self.batcher = None
+        # Shared result cache (see ocr_cache.py); None skips lookups
+        self.result_cache = get_result_cache()
+        # Shared per-crop recognizer cache; None always runs the readers
+        self.zone_cache = get_zone_cache()
+        # Per-request zone cache counters (requests may run on several threads)
+        self._zone_stats = threading.local()
+
+    @property
+    def hindi_reader(self):
+        """Shared Hindi EasyOCR reader from the process-wide engine registry."""
+        return get_engine('easyocr', ['hi'], gpu=False)
+
+    @property
+    def english_reader(self):
+        """Shared English EasyOCR reader from the process-wide engine registry."""
+        return get_engine('easyocr', ['en'], gpu=False)
+
+    def _lease_readers(self) -> ExitStack:
+        """Registry leases on the readers this engine recognizes with (close to release)."""
+        if self.force_language is None:
+            languages = ['hi', 'en']
+        else:
+            languages = ['en' if self.force_language == 'english' else 'hi']
+        stack = ExitStack()
+        try:
+            for lang in languages:
+                stack.enter_context(lease_engine('easyocr', [lang], gpu=False))
+        except BaseException:
+            stack.close()
+            raise
+        return stack
 
     def _deskew(self, gray: np.ndarray) -> np.ndarray:
         """Estimate skew angle and rotate to correct it."""
         try:
-            # Binarize for angle estimation
-            thr = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
-            # Invert so text is 1s for coordinate extraction
-            inv = 255 - thr
-            coords = np.column_stack(np.where(inv > 0))
-            if coords.size == 0:
-                return gray
-            angle = cv2.minAreaRect(coords)[-1]
-            if angle < -45:
-                angle = -(90 + angle)
-            else:
-                angle = -angle
-            (h, w) = gray.shape[:2]
-            M = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
-            rotated = cv2.warpAffine(gray, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
-            return rotated
+            return preprocessing.deskew(gray)
         except Exception:
             return gray
 
     def _normalize_illumination(self, gray: np.ndarray) -> np.ndarray:
         """Apply background estimation and normalize uneven lighting."""
         try:
-            # Large-kernel morphological opening approximates background
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (31, 31))
-            background = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
-            # Subtract background then normalize contrast
-            corrected = cv2.subtract(gray, background)
-            corrected = cv2.normalize(corrected, None, 0, 255, cv2.NORM_MINMAX)
-            return corrected
+            return preprocessing.normalize_illumination(gray)
         except Exception:
             return gray
 
     def _remove_grid_lines(self, bin_img: np.ndarray) -> np.ndarray:
         """Remove horizontal and vertical lines typical of tables/boxes."""
         try:
-            # Expect binary image (text white on black). If not, threshold.
-            if bin_img.ndim == 3:
-                gray = cv2.cvtColor(bin_img, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = bin_img
-            if gray.dtype != np.uint8:
-                gray = gray.astype(np.uint8)
+            return preprocessing.remove_grid_lines(bin_img)
+        except Exception:
+            return bin_img
+        
+    def process_image(self, image_path: ImageSource) -> OCRResult:
+        """Main pipeline: process image through all stages
 
-            # Ensure text is white (255) on black (0)
-            th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        image_path: file path, encoded bytes, "-" (stdin), "shm://name" or a BGR
+        array (see image_io.load_image).
+        """
+        job = PageJob(source=image_path)
+        try:
+            for _, stage in self.stages():
+                stage(job)
+                if job.result is not None:
+                    return job.result
+            raise RuntimeError("pipeline finished without a result")
 
-            # Detect horizontal lines
-            horiz_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-            detect_h = cv2.morphologyEx(th, cv2.MORPH_OPEN, horiz_kernel, iterations=1)
+        except Exception as e:
+            logger.error(f"❌ OCR processing failed: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+
+    def stages(self) -> List[Tuple[str, Callable[[PageJob], None]]]:
+        """(name, step) pairs run in order on a PageJob; a step that sets job.result
+        (cache hit, or the final recognition step) ends the page. ocr_pipeline runs
+        them on separate threads to overlap consecutive images."""
+        return [
+            ("decode", self.decode_stage),
+            ("preprocess", self.preprocess_stage),
+            ("detect", self.detect_stage),
+            ("recognize", self.recognize_stage),
+        ]
+
+    def decode_stage(self, job: PageJob) -> None:
+        """Decode at working resolution; answer repeats from the result cache."""
+        # Load image (decoded in memory for bytes/stdin/shared memory); large
+        # photos are reduced while decoding, based on their estimated text height
+        if self.working_resolution:
+            image, scale = load_working_image(job.source)
+        else:
+            image, scale = load_image(job.source), 1.0
+        if scale != 1.0:
+            logger.info(f"📐 Working resolution {image.shape[1]}x{image.shape[0]} (scale {scale:.3f})")
 
-            # Detect vertical lines
-            vert_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
-            detect_v = cv2.morphologyEx(th, cv2.MORPH_OPEN, vert_kernel, iterations=1)
+        logger.info(f"📸 Processing image: {describe_source(job.source)}")
+        job.image, job.scale = image, scale
+
+        # Repeat uploads of the same board are answered from the cache
+        # (exact pixels first, then a perceptual near-duplicate of a stored photo)
+        if self.result_cache is not None and self.result_cache.enabled:
+            config = self.cache_config()
+            job.cache_key = image_key(image, config)
+            cached = self.result_cache.get(job.cache_key)
+            status = "hit"
+            if cached is None and self.result_cache.near_distance > 0:
+                job.fingerprint = image_fingerprint(image, config)
+                match = self.result_cache.get_similar(job.fingerprint)
+                if match is not None:
+                    cached, status = match[0], "near-duplicate"
+                    # Text only: the zone boxes and scale belong to the other image
+                    cached["zones"] = []
+                    cached["working_scale"] = scale
+                    cached.pop("recognizers", None)
+            if cached is not None:
+                result = self._result_from_cache(cached)
+                result.processing_time = time.time() - job.start_time
+                result.cache = status
+                result.zone_cache = {}
+                logger.info(f"⚡ Served from result cache ({status}) in {result.processing_time:.3f}s")
+                job.image = None
+                job.result = result
+
+    def preprocess_stage(self, job: PageJob) -> None:
+        """Optional SR, then profile preprocessing (gray/binary views computed once)."""
+        image = job.image
+        # Optional SR enhancement
+        width = image.shape[1]
+        image = enhance_image_bgr(image)
+        job.scale *= image.shape[1] / float(width)
+
+        # In two-resolution mode only a downscaled copy is preprocessed and searched
+        # for zones; recognition reads full-resolution crops of the decoded frame.
+        detect_scale = self.detect_scale
+        if detect_scale < 1.0:
+            job.full_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            h, w = image.shape[:2]
+            image = cv2.resize(image, (max(1, int(round(w * detect_scale))), max(1, int(round(h * detect_scale)))),
+                               interpolation=cv2.INTER_AREA)
+        prepared = self.prepare_image(image, job.preprocessing_timings)
+        job.preprocessing_steps.append(prepared.describe())
+        if job.full_gray is not None and prepared.skew_angle:
+            # Zones come from the deskewed small frame: rotate the full-resolution
+            # frame the same way so the scaled-up boxes land on the same text
+            job.full_gray = preprocessing.deskew(job.full_gray, prepared.skew_angle)
+        if self.tesseract_zones:
+            # Tesseract binarizes on its own and reads the plain frame better than
+            # the enhanced view; it gets the same deskew so the zone boxes line up
+            if job.full_gray is not None:
+                job.plain_gray = job.full_gray
+            else:
+                job.plain_gray = preprocessing.deskew(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), prepared.skew_angle)
+        # Pooled views are reused by this thread's next image; a job handed to
+        # another thread takes its own copy
+        job.gray = prepared.gray.copy() if job.detach else prepared.gray
+        # The decoded frame is not needed past this point
+        job.image = None
 
-            # Combine and subtract from threshold image
-            lines = cv2.bitwise_or(detect_h, detect_v)
-            cleaned = cv2.bitwise_and(th, cv2.bitwise_not(lines))
-            return cleaned
+    def detect_stage(self, job: PageJob) -> None:
+        """Text zone detection (contours, optional EAST) and consolidation."""
+        gray = job.gray
+        zones = self.detect_text_zones(gray, self.detect_scale)
+        # Optional: refine/add boxes via EAST if enabled
+        try:
+            east_boxes = detect_text_boxes(gray)
+            if east_boxes:
+                # Merge: union of both sets; de-dup by IoU > 0.5
+                zones = merge_east_boxes(zones, east_boxes, 0.5)
         except Exception:
-            return bin_img
-        
-    def process_image(self, image_path: str) -> OCRResult:
-        """Main pipeline: process image through all stages"""
-        start_time = time.time()
-        preprocessing_steps = []
+            pass
+        if self.merge_zones:
+            # Join overlapping/same-line fragments so each is recognized once
+            detected = len(zones)
+            zones = consolidate_zones(zones)
+            logger.info(f"🧩 Consolidated {detected} fragments into {len(zones)} zones")
+        logger.info(f"🔍 Detected {len(zones)} text zones")
+
+        # Both recognition paths read the gray view; EasyOCR converts crops to gray anyway
+        job.recog_image = gray
+        if job.full_gray is not None:
+            zones = self._map_zones_up(zones, self.detect_scale, job.full_gray.shape)
+            job.recog_image = job.full_gray
+        job.zones = zones
+        job.gray = job.full_gray = None
+
+    def recognize_stage(self, job: PageJob) -> None:
+        """Recognize each zone, assemble the per-language text and store the result."""
+        recog_image, zones, scale = job.recog_image, job.zones, job.scale
+        zone_stats = {"hits": 0, "misses": 0}
+        self._zone_stats.counts = zone_stats
+        # Confident English Tesseract reads; the other zones escalate to EasyOCR
+        fast = self.read_zones_tesseract(job.plain_gray if job.plain_gray is not None else recog_image, zones)
+        job.plain_gray = None
+        escalated = [i for i in range(len(zones)) if i not in fast]
+        if fast:
+            logger.info(f"⚡ Tesseract read {len(fast)}/{len(zones)} zones, {len(escalated)} escalated to EasyOCR")
+        batched = None
+        # Keep the readers cached for the whole page so a low OCR_ENGINE_MEMORY_MB
+        # cannot evict one reader each time the other is fetched
+        with self._lease_readers() if escalated else nullcontext():
+            if self.direct_recognition and (self.batch_size > 1 or self.batcher is not None):
+                try:
+                    batched = dict(zip(escalated, self.read_zones_batched(recog_image, [zones[i] for i in escalated])))
+                except Exception as e:
+                    logger.error(f"❌ Batched recognition failed, falling back to per-zone: {e}")
+            # Per-zone reads run beside other requests' batches; share the batcher's reader lock
+            guard = self.batcher.reader_lock if self.batcher is not None and batched is None else nullcontext()
+            with guard:
+                processed_zones = self._recognize_zones(recog_image, zones, scale, fast, batched)
+        job.recog_image = None
         
-        try:
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ValueError(f"Could not load image: {image_path}")
-            
-            logger.info(f"📸 Processing image: {image_path}")
-            # Optional SR enhancement
-            image = enhance_image_bgr(image)
-            original_image = image.copy()
-            
-            # Stage 1: Basic preprocessing
-            image, step_info = self.preprocess_image(image)
-            preprocessing_steps.append(step_info)
-            
-            # Stage 2: Text zone detection
-            zones = self.detect_text_zones(image)
-            # Optional: refine/add boxes via EAST if enabled
-            try:
-                east_boxes = detect_text_boxes(image)
-                if east_boxes:
-                    # Merge: union of both sets; de-dup by IoU > 0.5
-                    def iou(a, b):
-                        ax, ay, aw, ah = a; bx, by, bw, bh = b
-                        x1 = max(ax, bx); y1 = max(ay, by)
-                        x2 = min(ax+aw, bx+bw); y2 = min(ay+ah, by+bh)
-                        inter = max(0, x2-x1) * max(0, y2-y1)
-                        union = aw*ah + bw*bh - inter
-                        return inter/union if union > 0 else 0.0
-                    merged = zones[:]
-                    for eb in east_boxes:
-                        if all(iou(eb, zb) < 0.5 for zb in merged):
-                            merged.append(eb)
-                    zones = merged
-            except Exception:
-                pass
-            logger.info(f"🔍 Detected {len(zones)} text zones")
-            
-            # Stage 3: Process each zone
-            processed_zones = []
-            for i, zone in enumerate(zones):
-                logger.info(f"Processing zone {i+1}: {zone}")
-                
-                # Detect language
-                language = self.detect_language(zone, image)
-                
-                # Extract text
-                text = self.recognize_text_in_zone(image, zone, language)
-                
-                # Calculate confidence
-                confidence = self.calculate_text_confidence(text, image[zone[1]:zone[1]+zone[3], zone[0]:zone[0]+zone[2]])
-                
-                # Create TextZone object
-                text_zone = TextZone(
-                    x=zone[0], y=zone[1], w=zone[2], h=zone[3],
-                    language=language, confidence=confidence, text=text
-                )
-                processed_zones.append(text_zone)
-                
-                logger.info(f"Zone {i+1}: Language={language}, Text='{text[:50]}...', Confidence={confidence:.2f}")
-            
-            # Stage 4: Extract language-specific text
-            hindi_text = self.extract_language_text(processed_zones, 'hindi')
-            english_text = self.extract_language_text(processed_zones, 'english')
+        # Extract language-specific text
+        hindi_text = self.extract_language_text(processed_zones, 'hindi')
+        english_text = self.extract_language_text(processed_zones, 'english')
 
-            # Optional AI post-correction per language block
-            try:
-                if hindi_text.strip():
-                    hindi_text = ai_correct_text(hindi_text, 'hin')
-            except Exception:
-                pass
-            try:
-                if english_text.strip():
-                    english_text = ai_correct_text(english_text, 'eng')
-            except Exception:
-                pass
-            
-            # Combine all text
-            all_text = []
+        # Optional AI post-correction per language block
+        try:
             if hindi_text.strip():
-                all_text.append(f"[HINDI] {hindi_text}")
+                hindi_text = ai_correct_text(hindi_text, 'hin')
+        except Exception:
+            pass
+        try:
             if english_text.strip():
-                all_text.append(f"[ENGLISH] {english_text}")
+                english_text = ai_correct_text(english_text, 'eng')
+        except Exception:
+            pass
+        
+        # Combine all text
+        all_text = []
+        if hindi_text.strip():
+            all_text.append(f"[HINDI] {hindi_text}")
+        if english_text.strip():
+            all_text.append(f"[ENGLISH] {english_text}")
+        
+        combined_text = '\n\n'.join(all_text)
+        # Global pass on combined for coherence
+        try:
+            if combined_text.strip():
+                combined_text = ai_correct_text(combined_text, 'eng')
+        except Exception:
+            pass
+        
+        # Calculate overall confidence
+        overall_confidence = np.mean([zone.confidence for zone in processed_zones]) if processed_zones else 0.0
+        
+        processing_time = time.time() - job.start_time
+        
+        result = OCRResult(
+            text=combined_text,
+            hindi_text=hindi_text,
+            english_text=english_text,
+            confidence=overall_confidence,
+            processing_time=processing_time,
+            zones=processed_zones,
+            preprocessing_steps=job.preprocessing_steps,
+            preprocessing_timings=job.preprocessing_timings,
+            zone_cache=zone_stats,
+            working_scale=scale,
+            recognizers={"tesseract": len(fast), "easyocr": len(escalated)}
+        )
+        if job.cache_key is not None:
+            self.result_cache.put(job.cache_key, asdict(result), fingerprint=job.fingerprint)
+            result.cache = "miss"
+        
+        logger.info(f"✅ OCR completed in {processing_time:.2f}s with {len(processed_zones)} zones")
+        if zone_stats["hits"]:
+            logger.info(f"♻️ Zone cache: {zone_stats['hits']} hits, {zone_stats['misses']} misses")
+        logger.info(f"Overall Confidence: {overall_confidence:.2%}")
+        job.result = result
+    
+    def _recognize_zones(self, recog_image: np.ndarray, zones: List[Tuple[int, int, int, int]], scale: float,
+                         fast: Dict[int, list], batched: Optional[Dict[int, Dict[str, list]]]) -> List[TextZone]:
+        """TextZones in original-image pixels from the Tesseract reads (`fast`), the
+        batched reader results, or per-zone reads for the rest."""
+        processed_zones = []
+        for i, zone in enumerate(zones):
+            logger.info(f"Processing zone {i+1}: {zone}")
             
-            combined_text = '\n\n'.join(all_text)
-            # Global pass on combined for coherence
-            try:
-                if combined_text.strip():
-                    combined_text = ai_correct_text(combined_text, 'eng')
-            except Exception:
-                pass
+            # Detect language (keeps the readers' output for reuse)
+            if i in fast:
+                language, reader_results = 'english', {'english': fast[i]}
+            elif batched is not None:
+                reader_results = batched[i]
+                language = self.force_language or self._language_from_results(reader_results['hindi'], reader_results['english'])
+            else:
+                language, reader_results = self.detect_language_with_results(zone, recog_image)
             
-            # Calculate overall confidence
-            overall_confidence = np.mean([zone.confidence for zone in processed_zones]) if processed_zones else 0.0
+            # Extract text
+            text = self.recognize_text_in_zone(recog_image, zone, language, reader_results)
             
-            processing_time = time.time() - start_time
+            # Calculate confidence
+            confidence = self.calculate_text_confidence(text, recog_image[zone[1]:zone[1]+zone[3], zone[0]:zone[0]+zone[2]])
             
-            result = OCRResult(
-                text=combined_text,
-                hindi_text=hindi_text,
-                english_text=english_text,
-                confidence=overall_confidence,
-                processing_time=processing_time,
-                zones=processed_zones,
-                preprocessing_steps=preprocessing_steps
+            # Create TextZone object
+            # Report the zone in original-image pixels
+            x, y, w, h = zone if scale == 1.0 else (int(round(v / scale)) for v in zone)
+            text_zone = TextZone(
+                x=x, y=y, w=w, h=h,
+                language=language, confidence=confidence, text=text
             )
+            processed_zones.append(text_zone)
             
-            logger.info(f"✅ OCR completed in {processing_time:.2f}s with {len(processed_zones)} zones")
-            logger.info(f"Overall Confidence: {overall_confidence:.2%}")
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"❌ OCR processing failed: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
-    
-    def preprocess_image(self, image: np.ndarray) -> Tuple[np.ndarray, str]:
-        """Enhanced image preprocessing: illumination norm -> deskew -> CLAHE/denoise -> line removal."""
-        try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            logger.info(f"Zone {i+1}: Language={language}, Text='{text[:50]}...', Confidence={confidence:.2f}")
+        return processed_zones
 
-            # Normalize uneven illumination first
-            gray = self._normalize_illumination(gray)
+    def cache_config(self) -> Dict:
+        """Everything besides the pixels that changes this engine's output."""
+        return {
+            "pipeline": "museum",
+            "languages": ["hi", "en"],
+            "force_language": self.force_language,
+            "profile": self.profile,
+            "direct_recognition": self.direct_recognition,
+            "merge_zones": self.merge_zones,
+            "working_resolution": self.working_resolution,
+            "detect_scale": self.detect_scale,
+            "tesseract": self.tesseract_min_conf if self.tesseract_zones else None,
+            "ai": ai_flags(),
+        }
 
-            # Deskew to align text lines
-            gray = self._deskew(gray)
-            
-            # Apply CLAHE for better contrast
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(gray)
-            
-            # Denoise
-            denoised = cv2.fastNlMeansDenoising(enhanced, None, 10, 7, 21)
-            
-            # Sharpen
-            kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-            sharpened = cv2.filter2D(denoised, -1, kernel)
+    @staticmethod
+    def _result_from_cache(payload: Dict) -> OCRResult:
+        payload = dict(payload)
+        payload["zones"] = [TextZone(**z) for z in payload.get("zones", [])]
+        return OCRResult(**payload)
 
-            # Remove grid/table lines from binarized view, then blend
-            bin_for_lines = cv2.threshold(sharpened, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
-            no_lines = self._remove_grid_lines(bin_for_lines)
+    def prepare_image(self, image: np.ndarray, timings: Optional[Dict[str, float]] = None) -> preprocessing.PreparedImage:
+        """Profile-driven preprocessing: illumination norm -> deskew -> CLAHE/denoise -> line removal.
 
+        Stages come from `self.profile`; per-stage seconds are added to `timings` if
+        given. The returned views live in this engine's reusable buffers and stay
+        valid until the next image is prepared on the same thread.
+        """
+        try:
             # Combine: favor cleaned binary where it is text-like
-            result_gray = cv2.bitwise_or(sharpened, no_lines)
-
-            # Convert back to BGR for downstream processing
-            result = cv2.cvtColor(result_gray, cv2.COLOR_GRAY2BGR)
-            
-            logger.info("✅ Image preprocessing completed")
-            return result, "Illumination normalization, deskew, contrast, denoise, line removal"
-            
+            prepared = preprocessing.prepare_image(image, self.profile, pool=self._buffers, merge_binary=True)
+            if timings is not None:
+                timings.update(prepared.timings)
+            logger.info(f"✅ Image preprocessing completed ({prepared.describe()})")
+            return prepared
         except Exception as e:
             logger.error(f"❌ Preprocessing failed: {e}")
-            return image, "Basic preprocessing only"
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            return preprocessing.PreparedImage(gray=gray, binary=None, profile="basic", stages=[])
+
+    def preprocess_image(self, image: np.ndarray, timings: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, str]:
+        """BGR result of prepare_image() plus its step description (standalone use)."""
+        prepared = self.prepare_image(image, timings)
+        return prepared.bgr.copy(), prepared.describe()
     
-    def detect_text_zones(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        """Detect text zones using multiple strategies"""
+    def detect_text_zones(self, image: np.ndarray, scale: float = 1.0) -> List[Tuple[int, int, int, int]]:
+        """Detect text zones using multiple strategies (accepts a gray or BGR image)
+
+        scale: resolution of `image` relative to the frame the zone size limits
+        were tuned for; thresholds, kernels and size filters are scaled to match.
+        """
         try:
             # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            shape = gray.shape[:2]
+            if scale == 1.0:
+                block, kernel = 11, self.morph_kernel
+            else:
+                block = max(3, int(round(11 * scale)) | 1)
+                k = max(2, int(round(5 * scale)))
+                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (k, k))
             
             # Strategy 1: Adaptive thresholding
-            binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+            binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, block, 2,
+                                           dst=self._buffers.get("zones_binary", shape))
             
             # Strategy 2: Morphological operations
-            morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self.morph_kernel)
-            morph = cv2.morphologyEx(morph, cv2.MORPH_OPEN, self.morph_kernel)
+            morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, dst=self._buffers.get("zones_morph", shape))
+            morph = cv2.morphologyEx(morph, cv2.MORPH_OPEN, kernel, dst=binary)
             
             # Strategy 3: Find contours
-            contours, _ = cv2.findContours(morph, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            min_area, max_area, min_w, min_h = self._zone_limits(scale)
+            if scale == 1.0:
+                contours, _ = cv2.findContours(morph, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                rects = [cv2.boundingRect(contour) for contour in contours]
+            else:
+                rects = self._inner_rects(morph, max_area)
             
             # Filter contours by size and shape
             zones = []
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
+            for (x, y, w, h) in rects:
                 area = w * h
                 
                 # Filter by area and dimensions
-                if (self.min_zone_area <= area <= self.max_zone_area and
-                    w >= self.min_zone_width and h >= self.min_zone_height):
+                if (min_area <= area <= max_area and
+                    w >= min_w and h >= min_h):
                     zones.append((x, y, w, h))
             
             # If no zones found, try fallback strategy
             if not zones:
                 logger.warning("No zones detected with primary method, trying fallback...")
-                zones = self.fallback_zone_detection(gray)
+                zones = self.fallback_zone_detection(gray, scale)
             
             logger.info(f"🔍 Detected {len(zones)} text zones")
             return zones
@@ -353,7 +601,48 @@ class MuseumOCR:
             logger.error(f"❌ Zone detection failed: {e}")
             return []
     
-    def fallback_zone_detection(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    @staticmethod
+    def _inner_rects(mask: np.ndarray, max_area: float) -> List[Tuple[int, int, int, int]]:
+        """Bounding boxes of the outermost contours, looking inside any larger than
+        `max_area`. On a downscaled frame the closing joins the board's border into
+        one frame-sized blob, which would otherwise hide every text blob inside it."""
+        contours, hierarchy = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        if hierarchy is None:
+            return []
+        hierarchy = hierarchy[0]
+        rects = []
+        stack = [i for i in range(len(contours)) if hierarchy[i][3] < 0]
+        while stack:
+            i = stack.pop()
+            rect = cv2.boundingRect(contours[i])
+            if rect[2] * rect[3] > max_area:
+                child = hierarchy[i][2]
+                while child >= 0:
+                    stack.append(child)
+                    child = hierarchy[child][0]
+            else:
+                rects.append(rect)
+        return rects
+
+    def _zone_limits(self, scale: float = 1.0) -> Tuple[float, float, float, float]:
+        """(min area, max area, min width, min height) for a frame at `scale`."""
+        return (self.min_zone_area * scale * scale, self.max_zone_area * scale * scale,
+                self.min_zone_width * scale, self.min_zone_height * scale)
+
+    @staticmethod
+    def _map_zones_up(zones: List[Tuple[int, int, int, int]], scale: float,
+                      shape: Tuple[int, ...]) -> List[Tuple[int, int, int, int]]:
+        """Map boxes found at `scale` onto the full-resolution frame (outward-rounded, clipped)."""
+        max_y, max_x = shape[:2]
+        mapped = []
+        for (x, y, w, h) in zones:
+            x0, y0 = max(0, int(np.floor(x / scale))), max(0, int(np.floor(y / scale)))
+            x1, y1 = min(max_x, int(np.ceil((x + w) / scale))), min(max_y, int(np.ceil((y + h) / scale)))
+            if x1 > x0 and y1 > y0:
+                mapped.append((x0, y0, x1 - x0, y1 - y0))
+        return mapped
+
+    def fallback_zone_detection(self, gray: np.ndarray, scale: float = 1.0) -> List[Tuple[int, int, int, int]]:
         """Fallback zone detection using edge detection"""
         try:
             # Canny edge detection
@@ -362,13 +651,14 @@ class MuseumOCR:
             # Find contours on edges
             contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
+            min_area, max_area, min_w, min_h = self._zone_limits(scale)
             zones = []
             for contour in contours:
                 x, y, w, h = cv2.boundingRect(contour)
                 area = w * h
                 
-                if (self.min_zone_area <= area <= self.max_zone_area and
-                    w >= self.min_zone_width and h >= self.min_zone_height):
+                if (min_area <= area <= max_area and
+                    w >= min_w and h >= min_h):
                     zones.append((x, y, w, h))
             
             # If still no zones, create a default zone
@@ -383,49 +673,227 @@ class MuseumOCR:
             logger.error(f"❌ Fallback zone detection failed: {e}")
             return []
     
+    def _read_zone(self, reader, image: np.ndarray, zone: Tuple[int, int, int, int]) -> list:
+        """Run one reader on a zone: readtext on the crop, or recognition-only on the box."""
+        x, y, w, h = zone
+        if self.direct_recognition:
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # reformat=False: use the grayscale frame as-is instead of rebuilding a BGR copy
+            return reader.recognize(gray, horizontal_list=[[x, x + w, y, y + h]], free_list=[], reformat=False)
+        return reader.readtext(image[y:y+h, x:x+w])
+
+    def _zone_lookup(self, lang_name: str, image: np.ndarray,
+                     zone: Tuple[int, int, int, int]) -> Tuple[Optional[str], Optional[list]]:
+        """(cache key, cached reader results) for a zone; (None, None) when caching is off."""
+        if self.zone_cache is None or not self.zone_cache.enabled:
+            return None, None
+        x, y, w, h = self._clip_zone(image, zone)
+        key = zone_key(image[y:y+h, x:x+w], lang_name, 'direct' if self.direct_recognition else 'readtext')
+        cached = self.zone_cache.get(key)
+        counts = getattr(self._zone_stats, 'counts', None)
+        if counts is not None:
+            counts['hits' if cached is not None else 'misses'] += 1
+        if cached is None:
+            return key, None
+        ox, oy = self._zone_origin(image, zone)
+        return key, [([[px + ox, py + oy] for px, py in box], text, conf) for box, text, conf in cached]
+
+    def _zone_store(self, key: Optional[str], image: np.ndarray, zone: Tuple[int, int, int, int], results: list) -> None:
+        """Cache reader results with boxes made relative to the crop."""
+        if key is None:
+            return
+        ox, oy = self._zone_origin(image, zone)
+        self.zone_cache.put(key, [([[px - ox, py - oy] for px, py in box], text, conf) for box, text, conf in results])
+
+    @staticmethod
+    def _clip_zone(image: np.ndarray, zone: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        max_y, max_x = image.shape[:2]
+        x, y, w, h = zone
+        x0, y0 = max(0, x), max(0, y)
+        return x0, y0, max(0, min(x + w, max_x) - x0), max(0, min(y + h, max_y) - y0)
+
+    def _zone_origin(self, image: np.ndarray, zone: Tuple[int, int, int, int]) -> Tuple[int, int]:
+        # recognize() reports frame coordinates, readtext() crop coordinates
+        if not self.direct_recognition:
+            return 0, 0
+        return self._clip_zone(image, zone)[:2]
+
+    def _read_zone_cached(self, lang_name: str, reader, image: np.ndarray, zone: Tuple[int, int, int, int]) -> list:
+        """_read_zone behind the zone cache; only unseen crops reach the reader."""
+        key, cached = self._zone_lookup(lang_name, image, zone)
+        if cached is not None:
+            return cached
+        results = self._read_zone(reader, image, zone)
+        self._zone_store(key, image, zone, results)
+        return results
+
+    def _recognize_boxes(self, reader, gray: np.ndarray, boxes: List[Tuple[int, int, int, int]]) -> List[list]:
+        """Recognize several boxes of one grayscale frame in a single batched pass.
+
+        EasyOCR's Reader.recognize handles boxes one at a time on CPU, so this feeds
+        the recognizer directly with the same crop/resize/decode steps and a real
+        batch. Returns one result list per box, in input order.
+        """
+        try:
+            from easyocr.utils import get_image_list  # type: ignore
+            from easyocr.recognition import get_text  # type: ignore
+            model_height = getattr(sys.modules.get(type(reader).__module__), 'imgH', 64)
+            ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+        except Exception:
+            return [self._read_zone(reader, gray, box) for box in boxes]
+
+        horizontal_list = [[x, x + w, y, y + h] for (x, y, w, h) in boxes]
+        image_list, max_width = get_image_list(horizontal_list, [], gray, model_height=model_height, sort_output=False)
+        if not image_list:
+            return [[] for _ in boxes]
+        recognized = get_text(reader.character, model_height, int(max_width), reader.recognizer, reader.converter,
+                              image_list, ignore_char, 'greedy', 5, len(image_list), 0.1, 0.5, 0.003, 0, reader.device)
+        # get_image_list drops degenerate boxes, so map results back by clipped coordinates
+        by_box = {}
+        for box, text, conf in recognized:
+            by_box[(box[0][0], box[0][1], box[2][0], box[2][1])] = [(box, text, conf)]
+        max_y, max_x = gray.shape[:2]
+        return [by_box.get((max(0, x), max(0, y), min(x + w, max_x), min(y + h, max_y)), [])
+                for (x, y, w, h) in boxes]
+
+    def read_zones_batched(self, gray: np.ndarray, zones: List[Tuple[int, int, int, int]]) -> List[Dict[str, list]]:
+        """Run the needed readers over all zones in batches of `batch_size`.
+
+        Zones are grouped with chunk_by_width to keep padding small. When a
+        cross-request batcher is attached, crops are submitted to it instead.
+        Crops found in the zone cache are not recognized again.
+        Returns {'hindi': [...], 'english': [...]} per zone, in zone order.
+        """
+        if self.force_language in {"english", "hindi"}:
+            readers = {self.force_language: self.english_reader if self.force_language == 'english' else self.hindi_reader}
+        else:
+            readers = {'hindi': self.hindi_reader, 'english': self.english_reader}
+
+        per_zone: List[Dict[str, list]] = [{'hindi': [], 'english': []} for _ in zones]
+        for lang_name, reader in readers.items():
+            # Crops seen before (this or earlier images) are answered by the zone cache
+            keys: Dict[int, Optional[str]] = {}
+            todo: List[int] = []
+            for i, zone in enumerate(zones):
+                key, cached = self._zone_lookup(lang_name, gray, zone)
+                if cached is not None:
+                    per_zone[i][lang_name] = cached
+                else:
+                    keys[i] = key
+                    todo.append(i)
+            if not todo:
+                continue
+
+            if self.batcher is not None:
+                # Cross-request batching: hand the crops to the shared scheduler
+                clipped = [self._clip_zone(gray, zones[i]) for i in todo]
+                crops = [gray[y:y+h, x:x+w] for (x, y, w, h) in clipped]
+                results = self.batcher.submit(reader, crops)
+                for i, (x, y, _, _), res in zip(todo, clipped, results):
+                    per_zone[i][lang_name] = [([[px + x, py + y] for px, py in box], text, conf) for box, text, conf in res]
+            else:
+                chunks = chunk_by_width([(zones[i][2], zones[i][3]) for i in todo], self.batch_size)
+                for chunk in chunks:
+                    results = self._recognize_boxes(reader, gray, [zones[todo[c]] for c in chunk])
+                    for c, res in zip(chunk, results):
+                        per_zone[todo[c]][lang_name] = res
+            for i in todo:
+                self._zone_store(keys[i], gray, zones[i], per_zone[i][lang_name])
+        return per_zone
+
+    def read_zones_tesseract(self, image: np.ndarray, zones: List[Tuple[int, int, int, int]]) -> Dict[int, list]:
+        """Tesseract fast path: {zone index: results} for the zones it reads confidently.
+
+        Each crop is read as one block by a pooled Tesseract handle. Crops whose
+        ink looks Devanagari are not read, and reads below tesseract_min_conf,
+        with Devanagari or without any word characters are left out, so those
+        zones go through EasyOCR language detection as usual.
+        Results use the readers' (box, text, confidence) shape.
+        """
+        if not self.tesseract_zones or self.force_language == 'hindi' or not zones:
+            return {}
+        reader = get_tesseract_reader()
+        if reader is None:
+            return {}
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        accepted: Dict[int, list] = {}
+        for i, zone in enumerate(zones):
+            x, y, w, h = self._clip_zone(gray, zone)
+            if not w or not h:
+                continue
+            crop = gray[y:y+h, x:x+w]
+            if looks_devanagari(crop):
+                continue
+            try:
+                lines, conf = reader.read_lines(crop, psm=PSM_SINGLE_BLOCK)
+            except Exception as e:
+                logger.error(f"❌ Tesseract fast path failed, using EasyOCR: {e}")
+                return accepted
+            if accept_fast_path(' '.join(text for _, text, _ in lines), conf, self.tesseract_min_conf):
+                ox, oy = self._zone_origin(gray, zone)
+                accepted[i] = [([[px + ox, py + oy] for px, py in box], text, c) for box, text, c in lines]
+        return accepted
+
+    @staticmethod
+    def _language_from_results(hindi_results: list, english_results: list) -> str:
+        """Pick the zone language from both readers' confidences."""
+        hindi_conf = np.mean([result[2] for result in hindi_results]) if hindi_results else 0.0
+        english_conf = np.mean([result[2] for result in english_results]) if english_results else 0.0
+        if hindi_conf > english_conf and hindi_conf > 0.3:
+            return 'hindi'
+        elif english_conf > 0.3:
+            return 'english'
+        else:
+            return 'mixed'
+
     def detect_language(self, zone: Tuple[int, int, int, int], image: np.ndarray) -> str:
         """Detect language of text in a zone"""
+        return self.detect_language_with_results(zone, image)[0]
+
+    def detect_language_with_results(self, zone: Tuple[int, int, int, int], image: np.ndarray) -> Tuple[str, Optional[Dict[str, list]]]:
+        """Detect language of text in a zone.
+
+        Also returns the per-reader results ({'hindi': [...], 'english': [...]}) so
+        recognition can reuse them instead of reading the same ROI again. Results are
+        None when no reader ran (forced language) or detection failed.
+        """
         try:
             # If user enforces language, skip detection
             if self.force_language in {"english", "hindi"}:
-                return self.force_language
-            x, y, w, h = zone
-            roi = image[y:y+h, x:x+w]
-            
+                return self.force_language, None
             # Try both readers and compare confidence
-            hindi_results = self.hindi_reader.readtext(roi)
-            english_results = self.english_reader.readtext(roi)
-            
-            # Calculate average confidence for each language
-            hindi_conf = np.mean([result[2] for result in hindi_results]) if hindi_results else 0.0
-            english_conf = np.mean([result[2] for result in english_results]) if english_results else 0.0
-            
-            # Determine language based on confidence
-            if hindi_conf > english_conf and hindi_conf > 0.3:
-                return 'hindi'
-            elif english_conf > 0.3:
-                return 'english'
-            else:
-                return 'mixed'
+            hindi_results = self._read_zone_cached('hindi', self.hindi_reader, image, zone)
+            english_results = self._read_zone_cached('english', self.english_reader, image, zone)
+            reader_results = {'hindi': hindi_results, 'english': english_results}
+            
+            # Determine language based on average confidence
+            return self._language_from_results(hindi_results, english_results), reader_results
                 
         except Exception as e:
             logger.error(f"❌ Language detection failed: {e}")
-            return 'unknown'
+            return 'unknown', None
     
-    def recognize_text_in_zone(self, image: np.ndarray, zone: Tuple[int, int, int, int], language: str) -> str:
-        """Extract text from a specific zone"""
+    def recognize_text_in_zone(self, image: np.ndarray, zone: Tuple[int, int, int, int], language: str,
+                               reader_results: Optional[Dict[str, list]] = None) -> str:
+        """Extract text from a specific zone
+
+        reader_results: output of detect_language_with_results for this zone; when
+        given, the readers are not run again on the ROI.
+        """
         try:
-            x, y, w, h = zone
-            roi = image[y:y+h, x:x+w]
-            
+            def read(lang_name: str, reader) -> list:
+                if reader_results is not None and lang_name in reader_results:
+                    return reader_results[lang_name]
+                return self._read_zone_cached(lang_name, reader, image, zone)
+
             if language == 'hindi':
-                results = self.hindi_reader.readtext(roi)
+                results = read('hindi', self.hindi_reader)
             elif language == 'english':
-                results = self.english_reader.readtext(roi)
+                results = read('english', self.english_reader)
             else:
                 # Try both languages and combine
-                hindi_results = self.hindi_reader.readtext(roi)
-                english_results = self.english_reader.readtext(roi)
+                hindi_results = read('hindi', self.hindi_reader)
+                english_results = read('english', self.english_reader)
                 results = hindi_results + english_results
             
             # Extract text from results
@@ -566,26 +1034,61 @@ class MuseumOCR:
             logger.error(f"❌ Report generation failed: {e}")
             return f"Error generating report: {e}"
 
+def build_json_result(result: OCRResult, processing_time: float) -> Dict:
+    """Backend JSON schema for a successful OCR run (shared by CLI and worker)."""
+    return {
+        "success": True,
+        "text": result.text,
+        "hindi_text": result.hindi_text,
+        "english_text": result.english_text,
+        "confidence": result.confidence,
+        "processing_time": processing_time,
+        "zones_count": len(result.zones),
+        "preprocessing_steps": result.preprocessing_steps,
+        "preprocessing_timings": {k: round(v, 4) for k, v in result.preprocessing_timings.items()},
+        "cache": result.cache,
+        "zone_cache": result.zone_cache,
+        "working_scale": round(result.working_scale, 4),
+        "recognizers": result.recognizers
+    }
+
+def build_error_result(message: str) -> Dict:
+    """Backend JSON schema for a failed OCR run."""
+    return {
+        "success": False,
+        "error": message,
+        "text": "",
+        "hindi_text": "",
+        "english_text": "",
+        "confidence": 0.0,
+        "processing_time": 0.0,
+        "zones_count": 0
+    }
+
 def main():
     """Main function for testing and backend integration"""
     try:
+        # Long-lived worker mode: keep the engine warm and serve JSON-lines requests
+        if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+            from ocr_worker import main as serve_main
+            serve_main(sys.argv[2:])
+            return
+
+        # Batch mode: a directory or manifest on a pool of warm worker processes
+        if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+            from ocr_batch import main as batch_main
+            batch_main(sys.argv[2:])
+            return
+
         # Check if called from backend (with image path argument)
         if len(sys.argv) > 1:
             image_path = sys.argv[1]
             logger.info(f"🔍 Backend mode - processing image: {image_path}")
             
-            # Check if image exists
-            if not os.path.exists(image_path):
-                error_result = {
-                    "success": False,
-                    "error": f"Image not found: {image_path}",
-                    "text": "",
-                    "hindi_text": "",
-                    "english_text": "",
-                    "confidence": 0.0,
-                    "processing_time": 0.0,
-                    "zones_count": 0
-                }
+            # Check if image exists ("-" reads encoded bytes from stdin, "shm://name" shared memory)
+            error = source_error(image_path)
+            if error:
+                error_result = build_error_result(error)
                 print(json.dumps(error_result))
                 return
             
@@ -598,15 +1101,7 @@ def main():
             processing_time = time.time() - start_time
             
             # Prepare JSON output for backend
-            json_result = {
-                "success": True,
-                "text": result.text,
-                "hindi_text": result.hindi_text,
-                "english_text": result.english_text,
-                "confidence": result.confidence,
-                "processing_time": processing_time,
-                "zones_count": len(result.zones)
-            }
+            json_result = build_json_result(result, processing_time)
             
             # Output JSON for backend
             print(json.dumps(json_result))
@@ -632,23 +1127,16 @@ def main():
             else:
                 logger.warning(f"Demo image not found: {demo_image}")
                 logger.info("Please provide an image path to test the OCR system")
-                logger.info("Usage: python museum_ocr.py <image_path>")
+                logger.info("Usage: python museum_ocr.py <image_path | - | shm://name>")
+                logger.info("       python museum_ocr.py --serve [--socket PATH]")
+                logger.info("       python museum_ocr.py --batch <dir | manifest> [--workers N]")
             
     except Exception as e:
         logger.error(f"❌ Main execution failed: {e}")
         
         # If called from backend, return error as JSON
         if len(sys.argv) > 1:
-            error_result = {
-                "success": False,
-                "error": f"OCR processing failed: {str(e)}",
-                "text": "",
-                "hindi_text": "",
-                "english_text": "",
-                "confidence": 0.0,
-                "processing_time": 0.0,
-                "zones_count": 0
-            }
+            error_result = build_error_result(f"OCR processing failed: {str(e)}")
             print(json.dumps(error_result))
         else:
             import traceback
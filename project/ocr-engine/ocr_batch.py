@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Batch OCR over a directory or manifest with a pool of warm worker processes.
+
+`museum_ocr.py <image>` pays the torch/EasyOCR start-up for every file, which
+dominates when a gallery's whole photo set is ingested. Batch mode starts N
+worker processes that each build the MuseumOCR readers once and then take
+images from a shared queue.
+
+Each worker is pinned to its own share of the CPUs (os.sched_setaffinity where
+available) and its torch / OpenCV / OpenMP thread pools are sized to that share,
+so N workers do not oversubscribe the machine.
+
+Inputs:
+- a directory: every image file in it (sorted; --recursive for subdirectories)
+- a manifest: one path per line (.txt), or JSON lines with "image" and an
+  optional "id" (.jsonl); relative paths are resolved against the manifest
+
+With --pipeline, the batch runs in this process instead: the decode,
+preprocess, detect and recognize stages of consecutive images overlap on
+their own threads (ocr_pipeline.StagedPipeline, --stage-threads), which keeps
+one set of readers busy without paying for a model copy per process.
+
+Output: one JSON line per image, in the same schema as `museum_ocr.py <image>`,
+plus "image" (and "id" from the manifest). Lines are written as images finish;
+--ordered keeps input order instead.
+
+Usage:
+  python museum_ocr.py --batch gallery_photos/ --workers 4 > results.jsonl
+  python museum_ocr.py --batch manifest.jsonl --output results.jsonl --ordered
+  python museum_ocr.py --batch gallery_photos/ --pipeline --stage-threads decode=2,preprocess=2
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
+
+# Thread-pool knobs read by OpenMP / BLAS builds at start-up
+_THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Per-process state of a batch worker (set by _init_worker)
+_engine = None
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def cpu_shares(workers: int, cpus: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """Split the CPUs into `workers` contiguous shares (shared round-robin if fewer CPUs)."""
+    cpus = list(cpus) if cpus is not None else available_cpus()
+    workers = max(1, workers)
+    if workers >= len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(workers)]
+    base, extra = divmod(len(cpus), workers)
+    shares, start = [], 0
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        shares.append(cpus[start:start + size])
+        start += size
+    return shares
+
+
+def limit_threads(threads: int) -> None:
+    """Size torch, OpenCV and OpenMP thread pools to `threads`."""
+    for name in _THREAD_ENV:
+        os.environ[name] = str(threads)
+    try:
+        import cv2
+        cv2.setNumThreads(threads)
+    except Exception:
+        pass
+    try:
+        import torch  # type: ignore
+        torch.set_num_threads(threads)
+    except Exception:
+        pass
+
+
+def _image_item(image: str, base: str, item_id=None) -> Dict:
+    path = image if os.path.isabs(image) else os.path.join(base, image)
+    item = {"image": path}
+    if item_id is not None:
+        item["id"] = item_id
+    return item
+
+
+def iter_items(target: str, recursive: bool = False) -> Iterator[Dict]:
+    """Yield {"image": path[, "id": ...]} for a directory or manifest."""
+    if os.path.isdir(target):
+        if recursive:
+            paths = [os.path.join(root, name) for root, _, names in os.walk(target) for name in names]
+        else:
+            paths = [os.path.join(target, name) for name in os.listdir(target)]
+        for path in sorted(paths):
+            if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS and os.path.isfile(path):
+                yield {"image": path}
+        return
+
+    base = os.path.dirname(os.path.abspath(target))
+    with open(target, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                yield _image_item(entry["image"], base, entry.get("id"))
+            else:
+                yield _image_item(line, base)
+
+
+def _init_worker(shares, force_language: Optional[str], profile: Optional[str]) -> None:
+    """Pin this process to a CPU share, size its thread pools and warm the engine."""
+    global _engine
+    cpus = shares.get()
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not pin batch worker to CPUs {cpus}: {e}")
+    limit_threads(len(cpus))
+
+    from museum_ocr import MuseumOCR
+    _engine = MuseumOCR(force_language=force_language, profile=profile)
+    logger.info(f"✅ Batch worker {os.getpid()} ready on CPUs {cpus}")
+
+
+def _ocr_item(item: Dict) -> Dict:
+    from museum_ocr import build_json_result, build_error_result
+    from image_io import source_error
+
+    image_path = item["image"]
+    error = source_error(image_path)
+    if error:
+        result = build_error_result(error)
+    else:
+        start_time = time.time()
+        try:
+            result = build_json_result(_engine.process_image(image_path), time.time() - start_time)
+        except Exception as e:
+            logger.error(f"❌ Batch OCR failed for {image_path}: {e}")
+            result = build_error_result(f"OCR processing failed: {str(e)}")
+    result.update(item)
+    return result
+
+
+def run_batch(items: Sequence[Dict], out: TextIO, workers: Optional[int] = None,
+              ordered: bool = False, force_language: Optional[str] = None,
+              profile: Optional[str] = None) -> Dict:
+    """OCR `items` on a process pool, writing one JSON line per image to `out`."""
+    items = list(items)
+    cpus = available_cpus()
+    if workers is None:
+        workers = max(1, len(cpus) // 2)
+    workers = max(1, min(workers, len(items) or 1))
+    shares = cpu_shares(workers, cpus)
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.SimpleQueue()
+    for share in shares:
+        queue.put(share)
+
+    logger.info(f"📦 Batch: {len(items)} images on {workers} workers "
+                f"({', '.join(str(len(s)) for s in shares)} CPUs each)")
+    start_time = time.time()
+    stats = {"images": len(items), "failed": 0, "workers": workers}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(queue, force_language, profile)) as pool:
+        futures = [pool.submit(_ocr_item, item) for item in items]
+        if not ordered:
+            futures = as_completed(futures)
+        for future in futures:
+            result = future.result()
+            if not result.get("success"):
+                stats["failed"] += 1
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    stats["elapsed"] = time.time() - start_time
+    logger.info(f"✅ Batch done: {stats['images']} images, {stats['failed']} failed in {stats['elapsed']:.1f}s")
+    return stats
+
+
+def run_pipelined(items: Sequence[Dict], out: TextIO, threads: Optional[Dict[str, int]] = None,
+                  queue_size: Optional[int] = None, ordered: bool = False,
+                  force_language: Optional[str] = None, profile: Optional[str] = None) -> Dict:
+    """OCR `items` in this process with overlapping stages, one JSON line per image."""
+    from museum_ocr import MuseumOCR, build_json_result, build_error_result
+    from ocr_pipeline import StagedPipeline
+    from image_io import source_error
+
+    stats = {"images": len(items), "failed": 0, "workers": 1}
+    runnable = []
+    for item in items:
+        error = source_error(item["image"])
+        if error:
+            stats["failed"] += 1
+            out.write(json.dumps(dict(build_error_result(error), **item)) + "\n")
+        else:
+            runnable.append(item)
+    pipeline = StagedPipeline(MuseumOCR(force_language=force_language, profile=profile),
+                              threads=threads, queue_size=queue_size, ordered=ordered)
+    start_time = time.time()
+    for output in pipeline.run([item["image"] for item in runnable]):
+        if output.result is not None:
+            result = build_json_result(output.result, output.result.processing_time)
+        else:
+            stats["failed"] += 1
+            result = build_error_result(output.error or "OCR processing failed")
+        result.update(runnable[output.index])
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+    stats["elapsed"] = time.time() - start_time
+    stats["stages"] = pipeline.stats()
+    logger.info(f"✅ Pipelined batch done: {stats['images']} images, {stats['failed']} failed in {stats['elapsed']:.1f}s")
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Batch OCR over a directory or manifest (JSON lines out)')
+    ap.add_argument('target', help='Image directory, or manifest (.txt paths / .jsonl {"image", "id"})')
+    ap.add_argument('--workers', type=int, default=None, help='Worker processes (default: half the CPUs)')
+    ap.add_argument('--output', help='Write JSON lines here instead of stdout')
+    ap.add_argument('--ordered', action='store_true', help='Emit results in input order')
+    ap.add_argument('--recursive', action='store_true', help='Include subdirectories of a directory target')
+    ap.add_argument('--force-language', choices=['english', 'hindi'], help='Skip per-zone language detection')
+    ap.add_argument('--profile', default=None, help='Preprocessing profile (default: OCR_PROFILE or max)')
+    ap.add_argument('--pipeline', action='store_true', help='One process, overlapping decode/preprocess/detect/recognize')
+    ap.add_argument('--stage-threads', default=None, help='With --pipeline: e.g. decode=2,preprocess=2 (default: OCR_PIPELINE_THREADS)')
+    ap.add_argument('--queue-size', type=int, default=None, help='With --pipeline: images queued per stage (default: OCR_PIPELINE_QUEUE or 2)')
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.target):
+        ap.error(f"not found: {args.target}")
+    items = list(iter_items(args.target, args.recursive))
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.pipeline:
+            from ocr_pipeline import parse_threads
+            threads = parse_threads(args.stage_threads) if args.stage_threads else None
+            run_pipelined(items, out, threads=threads, queue_size=args.queue_size, ordered=args.ordered,
+                          force_language=args.force_language, profile=args.profile)
+        else:
+            run_batch(items, out, workers=args.workers, ordered=args.ordered,
+                      force_language=args.force_language, profile=args.profile)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+__all__ = [
+    "IMAGE_EXTENSIONS",
+    "available_cpus",
+    "cpu_shares",
+    "limit_threads",
+    "iter_items",
+    "run_batch",
+    "run_pipelined",
+]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of finished OCR results.
+
+Visitors photograph the same boards all day. Results are keyed by a hash of the
+decoded image plus everything that changes the output (pipeline, languages,
+force_language, preprocessing profile, AI_* flags), so a repeat upload is answered
+without preprocessing or recognition. The key does not cover the code or model
+versions, so the cache is off unless configured (OCR_CACHE_MB / OCR_CACHE_DB).
+
+Re-uploads of the same photo rarely match byte for byte (re-encoded, resized),
+so each stored result can also carry a perceptual fingerprint (pHash + dHash of a
+deskewed, contrast-normalized thumbnail). A BK-tree over the pHash finds stored
+results within a Hamming distance. The hashes alone are too coarse (a new line
+of text on a board moves them by a few bits), so a candidate is only served as
+"near-duplicate" when a 32x32 grid of thumbnail tile means also agrees within
+a few grey levels, i.e. when it is the same picture. Near-duplicate results
+carry the stored text only: zone boxes of the other image are never returned.
+
+Two tiers:
+- in-memory LRU, bounded by payload size and age
+- optional SQLite file shared across processes/restarts, bounded by entry count and age
+
+ZoneCache works one level down: recognizer output per zone crop, keyed by a hash of
+the preprocessed crop plus the reader language, so boards that share headers or
+differ in one line only send unseen crops to the recognizer.
+
+Environment (optional):
+- OCR_CACHE_MB: memory tier size in MB (default 0 = off; e.g. 32)
+- OCR_CACHE_TTL_S: entry lifetime in seconds (default 604800 = 7 days, 0 = no expiry)
+- OCR_CACHE_DB: path of the SQLite tier (default unset = memory only)
+- OCR_CACHE_DB_MAX_ENTRIES: SQLite tier size (default 5000)
+- OCR_ZONE_CACHE_MB: zone cache size in MB (default 16, 0 disables it)
+- OCR_NEAR_DUP_DISTANCE: max Hamming distance (of 64 bits) for a near-duplicate
+  candidate, checked on both pHash and dHash (default 0 = near-duplicate lookup off;
+  4 is a reasonable setting)
+
+Usage:
+  from ocr_cache import get_result_cache, image_key
+  cache = get_result_cache()
+  key = image_key(image, {"pipeline": "museum", ...})
+  payload = cache.get(key)
+  if payload is None:
+      payload = run_ocr(image)
+      cache.put(key, payload)
+
+  fp = image_fingerprint(image, config)
+  match = cache.get_similar(fp)   # -> (payload, distance) or None
+  cache.put(key, payload, fingerprint=fp)
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from preprocessing import deskew, estimate_skew
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached payload schema changes
+CACHE_VERSION = 2
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def ai_flags() -> Dict[str, str]:
+    """AI_* environment settings; they switch SR, EAST and post-correction on or off."""
+    return {k: v for k, v in sorted(os.environ.items()) if k.startswith("AI_")}
+
+
+def _config_bytes(config: Dict[str, Any]) -> bytes:
+    return json.dumps({"v": CACHE_VERSION, "config": config}, sort_keys=True, default=str).encode("utf-8")
+
+
+def image_key(image: np.ndarray, config: Dict[str, Any]) -> str:
+    """Hash of the decoded pixels plus the engine configuration that produced the result."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(_config_bytes(config))
+    h.update(f"{image.shape}|{image.dtype}".encode("utf-8"))
+    h.update(np.ascontiguousarray(image).data)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Perceptual fingerprints
+# ---------------------------------------------------------------------------
+
+_THUMB_SIDE = 256           # fingerprints are computed on a thumbnail no larger than this
+_THUMB_TRIM = 0.05          # border share dropped on each side (framing differs most between photos)
+_CONFIRM_GRID = 32          # tile grid compared before a near-duplicate is served
+_CONFIRM_TOLERANCE = 12     # max tile mean difference (grey levels); re-encodes stay below ~8,
+                            # one added line of text on a board reaches 50+
+
+
+class Fingerprint(NamedTuple):
+    scope: str              # digest of the engine configuration; only equal scopes are compared
+    phash: int              # 64-bit DCT hash
+    dhash: int              # 64-bit gradient hash
+    tiles: bytes = b""      # _CONFIRM_GRID^2 tile means of the contrast-stretched thumbnail
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.astype(np.uint8).ravel()).tobytes(), "big")
+
+
+def phash(gray: np.ndarray) -> int:
+    """64-bit DCT hash: low 8x8 frequencies of a 32x32 thumbnail against their median."""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].ravel()
+    return _bits_to_int(low > np.median(low[1:]))
+
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit gradient hash: sign of horizontal differences on a 9x8 thumbnail."""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _tile_means(gray: np.ndarray) -> bytes:
+    """Tile means of `gray` stretched to its 1st-99th percentile range."""
+    lo, hi = np.percentile(gray, (1, 99))
+    stretched = np.clip((gray.astype(np.float32) - lo) * (255.0 / max(float(hi - lo), 1.0)), 0, 255)
+    tiles = cv2.resize(stretched, (_CONFIRM_GRID, _CONFIRM_GRID), interpolation=cv2.INTER_AREA)
+    return np.round(tiles).astype(np.uint8).tobytes()
+
+
+def tiles_match(a: bytes, b: bytes) -> bool:
+    """True when two fingerprints' tile means agree everywhere within _CONFIRM_TOLERANCE."""
+    if not a or len(a) != len(b):
+        return False
+    diff = np.abs(np.frombuffer(a, np.uint8).astype(np.int16) - np.frombuffer(b, np.uint8).astype(np.int16))
+    return int(diff.max()) <= _CONFIRM_TOLERANCE
+
+
+def image_fingerprint(image: np.ndarray, config: Dict[str, Any]) -> Fingerprint:
+    """pHash/dHash and tile means of a deskewed, contrast-normalized thumbnail of `image`."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    h, w = gray.shape[:2]
+    scale = _THUMB_SIDE / float(max(h, w))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    gray = deskew(gray, estimate_skew(gray, method="projection"))
+    h, w = gray.shape[:2]
+    dy, dx = int(h * _THUMB_TRIM), int(w * _THUMB_TRIM)
+    gray = np.ascontiguousarray(gray[dy:h - dy, dx:w - dx])
+    # Tiles are taken before equalization, which amplifies background noise
+    tiles = _tile_means(gray)
+    gray = cv2.equalizeHist(gray)
+    scope = hashlib.blake2b(_config_bytes(config), digest_size=10).hexdigest()
+    return Fingerprint(scope, phash(gray), dhash(gray), tiles)
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes under Hamming distance."""
+
+    def __init__(self):
+        # node: [hash, values, {distance: child}]
+        self._root: Optional[list] = None
+        self.size = 0
+
+    def add(self, value: int, item: Any) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+        node = self._root
+        while True:
+            d = hamming(value, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """All (distance, item) within `max_distance`, nearest first."""
+        found: List[Tuple[int, Any]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            d = hamming(value, node[0])
+            if d <= max_distance:
+                found.extend((d, item) for item in node[1])
+            for dist, child in node[2].items():
+                if d - max_distance <= dist <= d + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda t: t[0])
+        return found
+
+
+class ResultCache:
+    """In-memory LRU plus optional SQLite tier for JSON-serializable OCR results."""
+
+    def __init__(self, max_mb: Optional[float] = None, ttl_s: Optional[float] = None,
+                 db_path: Optional[str] = None, max_db_entries: Optional[int] = None,
+                 near_distance: Optional[int] = None):
+        self.max_bytes = int((max_mb if max_mb is not None else _env_float("OCR_CACHE_MB", 0.0)) * 1024 * 1024)
+        self.ttl_s = ttl_s if ttl_s is not None else _env_float("OCR_CACHE_TTL_S", 7 * 24 * 3600.0)
+        if db_path is None:
+            db_path = os.getenv("OCR_CACHE_DB", "").strip() or None
+        self.db_path = db_path
+        self.max_db_entries = int(max_db_entries if max_db_entries is not None
+                                  else _env_float("OCR_CACHE_DB_MAX_ENTRIES", 5000))
+        self.near_distance = int(near_distance if near_distance is not None
+                                 else _env_float("OCR_NEAR_DUP_DISTANCE", 0))
+
+        # key -> (payload json, stored_at)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # scope -> BK-tree of (key, dhash) by pHash; _fingerprints tracks live keys
+        self._trees: Dict[str, BKTree] = {}
+        self._fingerprints: Dict[str, Fingerprint] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if self.db_path:
+            self._open_db()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.near_hits = 0
+        self.near_rejected = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self._db is not None
+
+    def _open_db(self) -> None:
+        try:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(fingerprints)")]
+            if columns and "tiles" not in columns:
+                # Fingerprints from before the tile check cannot confirm a match
+                self._db.execute("DROP TABLE fingerprints")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "key TEXT PRIMARY KEY, scope TEXT NOT NULL, phash TEXT NOT NULL, dhash TEXT NOT NULL, tiles BLOB)"
+            )
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT f.key, f.scope, f.phash, f.dhash, f.tiles FROM fingerprints f JOIN results r ON r.key = f.key"
+            ).fetchall()
+            for key, scope, ph, dh, tiles in rows:
+                self._index(key, Fingerprint(scope, int(ph, 16), int(dh, 16), bytes(tiles or b"")))
+            logger.info(f"💾 OCR result cache on disk: {self.db_path}")
+        except Exception as e:
+            logger.error(f"❌ Could not open OCR cache database {self.db_path}: {e}")
+            self._db = None
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_s > 0 and now - stored_at > self.ttl_s
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached payload for `key` (a fresh copy), or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                payload, stored_at = entry
+                if self._is_expired(stored_at, now):
+                    self._drop(key)
+                    self.expired += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return json.loads(payload)
+
+            payload = self._db_get(key, now)
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, payload, now)
+            return json.loads(payload)
+
+    def put(self, key: str, value: Dict[str, Any], fingerprint: Optional[Fingerprint] = None) -> None:
+        payload = json.dumps(value, ensure_ascii=False, default=float)
+        now = time.time()
+        with self._lock:
+            self._remember(key, payload, now)
+            self._db_put(key, payload, now)
+            if fingerprint is not None and self.near_distance > 0 and key not in self._fingerprints:
+                self._index(key, fingerprint)
+                self._db_put_fingerprint(key, fingerprint)
+
+    def get_similar(self, fingerprint: Fingerprint) -> Optional[Tuple[Dict[str, Any], int]]:
+        """(payload, distance) of the closest stored result within OCR_NEAR_DUP_DISTANCE, or None.
+
+        Candidates come from the pHash BK-tree, must also agree on dHash and are
+        confirmed by tiles_match. The payload is the other image's result: callers
+        keep its text but not its geometry.
+        """
+        if self.near_distance <= 0:
+            return None
+        now = time.time()
+        with self._lock:
+            tree = self._trees.get(fingerprint.scope)
+            if tree is None:
+                return None
+            for distance, (key, other_dhash) in tree.search(fingerprint.phash, self.near_distance):
+                if key not in self._fingerprints or hamming(fingerprint.dhash, other_dhash) > self.near_distance:
+                    continue
+                if not tiles_match(fingerprint.tiles, self._fingerprints[key].tiles):
+                    # Similar layout, different content (e.g. an edited board)
+                    self.near_rejected += 1
+                    continue
+                payload = self._lookup(key, now)
+                if payload is None:
+                    # Evicted or expired since it was indexed
+                    self._unindex(key)
+                    continue
+                self.near_hits += 1
+                return json.loads(payload), distance
+            return None
+
+    def _index(self, key: str, fingerprint: Fingerprint) -> None:
+        tree = self._trees.get(fingerprint.scope)
+        if tree is None:
+            tree = self._trees[fingerprint.scope] = BKTree()
+        tree.add(fingerprint.phash, (key, fingerprint.dhash))
+        self._fingerprints[key] = fingerprint
+
+    def _unindex(self, key: str) -> None:
+        # BK-trees do not support removal; stale nodes are skipped and the
+        # scope's tree is rebuilt once they outnumber the live ones
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        tree = self._trees[fingerprint.scope]
+        live = [(k, fp) for k, fp in self._fingerprints.items() if fp.scope == fingerprint.scope]
+        if tree.size > 2 * len(live) + 16:
+            rebuilt = BKTree()
+            for k, fp in live:
+                rebuilt.add(fp.phash, (k, fp.dhash))
+            self._trees[fingerprint.scope] = rebuilt
+
+    def _lookup(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is not None and not self._is_expired(entry[1], now):
+            self._memory.move_to_end(key)
+            return entry[0]
+        payload = self._db_get(key, now)
+        if payload is not None:
+            self._remember(key, payload, now)
+        return payload
+
+    def _db_put_fingerprint(self, key: str, fingerprint: Fingerprint) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fingerprints (key, scope, phash, dhash, tiles) VALUES (?, ?, ?, ?, ?)",
+                (key, fingerprint.scope, f"{fingerprint.phash:016x}", f"{fingerprint.dhash:016x}",
+                 sqlite3.Binary(fingerprint.tiles)),
+            )
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ OCR cache fingerprint write failed: {e}")
+
+    def _remember(self, key: str, payload: str, stored_at: float) -> None:
+        if self.max_bytes <= 0 or len(payload) > self.max_bytes:
+            return
+        if key in self._memory:
+            self._drop(key)
+        self._memory[key] = (payload, stored_at)
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_bytes and self._memory:
+            oldest = next(iter(self._memory))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        payload, _ = self._memory.pop(key)
+        self._memory_bytes -= len(payload)
+
+    def _db_get(self, key: str, now: float) -> Optional[str]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT payload, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, created = row
+            if self._is_expired(created, now):
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._db.commit()
+                self.expired += 1
+                return None
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return payload
+        except Exception as e:
+            logger.warning(f"⚠️ OCR cache read failed: {e}")
+            return None
+
+    def _db_put(self, key: str, payload: str, now: float) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, payload, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            removed = 0
+            if self.ttl_s > 0:
+                removed += self._db.execute("DELETE FROM results WHERE created < ?", (now - self.ttl_s,)).rowcount
+            count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_db_entries:
+                removed += self._db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed ASC LIMIT ?)",
+                    (count - self.max_db_entries,),
+                ).rowcount
+                self.evictions += count - self.max_db_entries
+            if removed:
+                self._db.execute("DELETE FROM fingerprints WHERE key NOT IN (SELECT key FROM results)")
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ OCR cache write failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._trees.clear()
+            self._fingerprints.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.execute("DELETE FROM fingerprints")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            disk_entries = None
+            if self._db is not None:
+                try:
+                    disk_entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                except Exception:
+                    pass
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "near_hits": self.near_hits,
+                "near_rejected": self.near_rejected,
+                "near_distance": self.near_distance,
+                "fingerprints": len(self._fingerprints),
+                "memory_entries": len(self._memory),
+                "memory_mb": round(self._memory_bytes / (1024 * 1024), 2),
+                "max_memory_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "disk_entries": disk_entries,
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Zone cache
+# ---------------------------------------------------------------------------
+
+# (box points, text, confidence) as returned by EasyOCR, boxes relative to the crop
+ZoneResults = List[Tuple[Any, str, float]]
+
+
+def zone_key(crop: np.ndarray, language: str, mode: str) -> str:
+    """Hash of a preprocessed zone crop plus the reader language and recognition mode."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{CACHE_VERSION}|{language}|{mode}|{crop.shape}|{crop.dtype}".encode("utf-8"))
+    h.update(np.ascontiguousarray(crop).data)
+    return h.hexdigest()
+
+
+def _zone_entry_size(results: ZoneResults) -> int:
+    # Rough footprint: tuple/list overhead plus the text
+    return 128 + sum(256 + len(text) * 4 for _, text, _ in results)
+
+
+class ZoneCache:
+    """In-memory LRU of recognizer output per zone crop, shared across images and requests."""
+
+    def __init__(self, max_mb: Optional[float] = None):
+        self.max_bytes = int((max_mb if max_mb is not None else _env_float("OCR_ZONE_CACHE_MB", 16.0)) * 1024 * 1024)
+        # key -> (results, size)
+        self._entries: "OrderedDict[str, Tuple[Tuple, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[ZoneResults]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+
+    def put(self, key: str, results: ZoneResults) -> None:
+        # Boxes are frozen so cached entries cannot be changed through a returned list
+        frozen = tuple((tuple(tuple(p) for p in box), text, conf) for box, text, conf in results)
+        size = _zone_entry_size(results)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (frozen, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._bytes -= dropped
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "mb": round(self._bytes / (1024 * 1024), 2),
+                "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "evictions": self.evictions,
+            }
+
+
+_CACHE: Optional[ResultCache] = None
+_ZONE_CACHE: Optional[ZoneCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache, configured from the environment on first use."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ResultCache()
+        return _CACHE
+
+
+def get_zone_cache() -> ZoneCache:
+    """Process-wide zone cache, configured from the environment on first use."""
+    global _ZONE_CACHE
+    with _CACHE_LOCK:
+        if _ZONE_CACHE is None:
+            _ZONE_CACHE = ZoneCache()
+        return _ZONE_CACHE
+
+
+__all__ = [
+    "CACHE_VERSION",
+    "ResultCache",
+    "ZoneCache",
+    "Fingerprint",
+    "BKTree",
+    "ai_flags",
+    "image_key",
+    "image_fingerprint",
+    "phash",
+    "dhash",
+    "hamming",
+    "tiles_match",
+    "zone_key",
+    "get_result_cache",
+    "get_zone_cache",
+]
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Hedged backend cascade with latency/error-aware routing.
+
+lite_ocr used to try paddle-http, paddle-local and easyocr strictly one after
+another, so a slow or hung HTTP service added its whole timeout before the
+fallback even started. BackendCascade instead:
+- orders the available backends by recent health: healthy ones by their
+  smoothed latency; a backend without a recent estimate goes ahead of the
+  fastest measured one if it has higher priority (so a recovered primary is
+  probed again, hedged) and after it otherwise; backends with a high recent
+  error rate go last until a cool-down has passed
+- starts the first, and starts the next one after the hedge delay if no
+  acceptable result has arrived yet, or at once when an attempt fails or
+  comes back empty
+- returns the first acceptable result; attempts still running are abandoned,
+  not cancelled: they run to completion on the cascade's pool and their outcome
+  still updates that backend's health
+
+Because abandoned attempts keep running, a later call can reach a backend that
+is still busy. Backends not marked `thread_safe` (in-process models such as
+EasyOCR readers or a local PaddleOCR) therefore run one call at a time behind a
+per-backend lock; a call queued behind an abandoned one waits for it, and that
+wait shows up in the backend's latency so routing prefers other backends.
+
+A backend call returns text, "" (ran fine, found nothing) or None (unavailable
+or failed); exceptions count as failures. A backend's `supports` predicate can
+leave it out of calls it does not handle (e.g. an English-only recognizer for
+a Hindi request) without counting against its health.
+
+Environment (optional):
+- OCR_HEDGE_MS: delay before the next backend is started alongside (default 1500)
+- OCR_CASCADE_ROUTING: latency (default) | static (always priority order)
+- OCR_CASCADE_THREADS: concurrent backend calls (default 4)
+
+Usage:
+  cascade = BackendCascade([Backend("paddle-http", run_http, available=has_url),
+                            Backend("easyocr", run_easyocr)])
+  outcome = cascade.run(gray, bin_img, lang)
+  outcome.backend, outcome.text, outcome.attempts
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WINDOW = 20              # recent calls kept per backend
+_EWMA_ALPHA = 0.3         # weight of the newest latency sample
+_MIN_SAMPLES = 3          # calls before the error rate can mark a backend unhealthy
+_MAX_ERROR_RATE = 0.5     # ... at or above this share of failed recent calls
+_COOLDOWN_S = 30.0        # an unhealthy backend is tried first again after this
+_LATENCY_TTL_S = 60.0     # latency estimates older than this no longer rank a backend
+
+
+@dataclass
+class Backend:
+    """A named recognizer: fn(*args, stats) -> text | "" | None."""
+    name: str
+    fn: Callable[..., Optional[str]]
+    available: Callable[[], bool] = lambda: True
+    # Called with the run() args; False skips this backend for the call
+    supports: Callable[..., bool] = lambda *args: True
+    # fn may run on several threads at once (e.g. a pooled HTTP client)
+    thread_safe: bool = False
+
+
+class BackendHealth:
+    """Recent outcomes and smoothed latency of one backend."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent: Deque[bool] = deque(maxlen=_WINDOW)
+        self.latency: Optional[float] = None
+        # Start times of calls still running (a hung call is evidence of latency)
+        self._in_flight: Dict[int, float] = {}
+        self._next_call = 0
+        self.last_success = 0.0
+        self.last_failure = 0.0
+        self.calls = 0
+        self.failures = 0
+
+    def begin(self) -> int:
+        with self._lock:
+            self._next_call += 1
+            self._in_flight[self._next_call] = time.perf_counter()
+            return self._next_call
+
+    def record(self, ok: bool, seconds: float, call: Optional[int] = None) -> None:
+        with self._lock:
+            self._in_flight.pop(call, None)
+            self.calls += 1
+            self._recent.append(ok)
+            if ok:
+                self.latency = seconds if self.latency is None else (
+                    _EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * self.latency)
+                self.last_success = time.time()
+            else:
+                self.failures += 1
+                self.last_failure = time.time()
+
+    def current_latency(self) -> Optional[float]:
+        """Smoothed latency, raised to the age of the oldest call still running;
+        None when unmeasured (or older than _LATENCY_TTL_S) and nothing is running."""
+        with self._lock:
+            latency = self.latency
+            if latency is not None and time.time() - self.last_success > _LATENCY_TTL_S:
+                latency = None
+            if self._in_flight:
+                age = time.perf_counter() - min(self._in_flight.values())
+                latency = max(latency or 0.0, age)
+            return latency
+
+    def error_rate(self) -> float:
+        with self._lock:
+            return (self._recent.count(False) / len(self._recent)) if self._recent else 0.0
+
+    def healthy(self) -> bool:
+        with self._lock:
+            samples = len(self._recent)
+            failed = self._recent.count(False)
+            last_failure = self.last_failure
+        if samples < _MIN_SAMPLES or failed / samples < _MAX_ERROR_RATE:
+            return True
+        return time.time() - last_failure >= _COOLDOWN_S
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate(), 3),
+            "latency_s": round(self.latency, 4) if self.latency is not None else None,
+            "latency_fresh": self.current_latency() is not None,
+            "healthy": self.healthy(),
+        }
+
+
+@dataclass
+class CascadeOutcome:
+    text: Optional[str]
+    backend: str
+    # One entry per started backend: name, start offset, seconds, status
+    # (ok | empty | failed | abandoned); `stats` holds what the backend reported
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
+    stats: Dict[str, float] = field(default_factory=dict)
+    hedged: bool = False
+
+
+class BackendCascade:
+    """Runs backends in health order with hedging; first acceptable result wins."""
+
+    def __init__(self, backends: Sequence[Backend], hedge_ms: Optional[float] = None,
+                 routing: Optional[str] = None, threads: Optional[int] = None,
+                 accept: Callable[[str], bool] = lambda text: bool(text and text.strip())):
+        if hedge_ms is None:
+            hedge_ms = float(os.getenv("OCR_HEDGE_MS", "1500"))
+        if routing is None:
+            routing = os.getenv("OCR_CASCADE_ROUTING", "latency").strip().lower()
+        if threads is None:
+            threads = int(os.getenv("OCR_CASCADE_THREADS", "4"))
+        self.backends = list(backends)
+        self.hedge = max(0.0, hedge_ms) / 1000.0
+        self.routing = routing
+        self.accept = accept
+        self.health: Dict[str, BackendHealth] = {b.name: BackendHealth() for b in self.backends}
+        # One call at a time for backends that are not thread-safe (see module docstring)
+        self._locks: Dict[str, threading.Lock] = {b.name: threading.Lock() for b in self.backends if not b.thread_safe}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="ocr-cascade")
+
+    def order(self) -> List[Backend]:
+        """Available backends, most promising first."""
+        available = [b for b in self.backends if b.available()]
+        healthy = [b for b in available if self.health[b.name].healthy()]
+        unhealthy = [b for b in available if b not in healthy]
+        if self.routing == "latency":
+            priority = {b.name: i for i, b in enumerate(self.backends)}
+            latency = {b.name: self.health[b.name].current_latency() for b in healthy}
+            measured = sorted((b for b in healthy if latency[b.name] is not None),
+                              key=lambda b: (latency[b.name], priority[b.name]))
+            lead = priority[measured[0].name] if measured else len(priority)
+            unmeasured = [b for b in healthy if latency[b.name] is None]
+            healthy = ([b for b in unmeasured if priority[b.name] < lead] + measured
+                       + [b for b in unmeasured if priority[b.name] >= lead])
+        return healthy + unhealthy
+
+    def _call(self, backend: Backend, args: Tuple) -> Tuple[Backend, Optional[str], float, Dict[str, float], Optional[str]]:
+        stats: Dict[str, float] = {}
+        health = self.health[backend.name]
+        call = health.begin()
+        start = time.perf_counter()
+        error = None
+        lock = self._locks.get(backend.name)
+        try:
+            if lock is None:
+                text = backend.fn(*args, stats)
+            else:
+                with lock:
+                    text = backend.fn(*args, stats)
+        except Exception as e:
+            text, error = None, str(e)
+        seconds = time.perf_counter() - start
+        health.record(text is not None, seconds, call)
+        return backend, text, seconds, stats, error
+
+    def run(self, *args) -> CascadeOutcome:
+        """Call backends with `args` (plus a stats dict) until one is acceptable."""
+        order = [b for b in self.order() if b.supports(*args)]
+        outcome = CascadeOutcome(text=None, backend="none")
+        if not order:
+            return outcome
+        done: "queue.Queue" = queue.Queue()
+        start = time.perf_counter()
+        attempts: Dict[str, Dict[str, Any]] = {}
+        fallback: Optional[Tuple[str, str]] = None
+        next_index, pending, last_launch = 0, 0, start
+
+        def launch() -> None:
+            nonlocal next_index, pending, last_launch
+            backend = order[next_index]
+            next_index += 1
+            pending += 1
+            last_launch = time.perf_counter()
+            attempts[backend.name] = {"backend": backend.name, "started_ms": round((last_launch - start) * 1000, 1),
+                                      "seconds": None, "status": "abandoned"}
+            self._pool.submit(self._call, backend, args).add_done_callback(lambda f: done.put(f.result()))
+
+        launch()
+        while pending:
+            wait = None
+            if next_index < len(order):
+                wait = max(0.0, self.hedge - (time.perf_counter() - last_launch))
+            try:
+                backend, text, seconds, stats, error = done.get(timeout=wait)
+            except queue.Empty:
+                # No acceptable answer within the hedge delay: race the next backend
+                outcome.hedged = True
+                logger.info(f"⏱️ Hedging with {order[next_index].name} after {self.hedge * 1000:.0f} ms")
+                launch()
+                continue
+            pending -= 1
+            attempt = attempts[backend.name]
+            attempt["seconds"] = round(seconds, 4)
+            outcome.stats.update(stats)
+            if text is None:
+                attempt["status"] = "failed"
+                if error:
+                    attempt["error"] = error
+                    logger.warning(f"⚠️ OCR backend {backend.name} failed: {error}")
+            elif self.accept(text):
+                attempt["status"] = "ok"
+                outcome.text, outcome.backend = text, backend.name
+                break
+            else:
+                attempt["status"] = "empty"
+                fallback = fallback or (text, backend.name)
+            if next_index < len(order):
+                launch()
+
+        if outcome.text is None and fallback is not None:
+            outcome.text, outcome.backend = fallback
+        outcome.attempts = list(attempts.values())
+        return outcome
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedge_ms": self.hedge * 1000,
+            "routing": self.routing,
+            "order": [b.name for b in self.order()],
+            "backends": {name: h.stats() for name, h in self.health.items()},
+        }
+
+
+__all__ = [
+    "Backend",
+    "BackendHealth",
+    "BackendCascade",
+    "CascadeOutcome",
+]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Pipelined MuseumOCR over a stream of images.
+
+process_image runs decode -> preprocess -> detect -> recognize serially, so the
+CPU-bound OpenCV stages of one image and torch recognition of the previous one
+never overlap, although both release the GIL. StagedPipeline runs each stage of
+MuseumOCR.stages() on its own thread(s) with a bounded queue in front of every
+stage: a stage that falls behind blocks the ones feeding it, so at most
+(queue_size + threads) images per stage are in flight however long the input.
+Throughput settles at the slowest stage, normally recognition.
+
+The readers are not thread-safe. With more than one recognize thread and direct
+recognition on (OCR_DIRECT_RECOGNITION=1), crops go through a shared
+RecognitionBatcher as in the warm worker; otherwise the recognize threads take
+turns on the engine and the engine's recognition mode is left as configured.
+
+Environment (optional):
+- OCR_PIPELINE_THREADS: threads per stage, e.g. "decode=2,preprocess=2" (default 1 each)
+- OCR_PIPELINE_QUEUE: images waiting in front of each stage (default 2)
+
+Usage:
+  from ocr_pipeline import StagedPipeline
+  for item in StagedPipeline(MuseumOCR()).run(paths):
+      print(item.source, item.error or item.result.text)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import queue
+import logging
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from museum_ocr import MuseumOCR, OCRResult, PageJob
+from ocr_scheduler import RecognitionBatcher
+from image_io import ImageSource
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+_POLL_S = 0.1
+
+
+@dataclass
+class PipelineResult:
+    """Outcome for the `index`-th input: a result, or the error that stopped it."""
+    index: int
+    source: ImageSource
+    result: Optional[OCRResult] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _Item:
+    index: int
+    job: PageJob
+    error: Optional[str] = None
+
+
+def parse_threads(spec: Optional[str]) -> Dict[str, int]:
+    """"decode=2,recognize=1" -> {"decode": 2, "recognize": 1}."""
+    threads: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        if sep and name.strip():
+            threads[name.strip()] = max(1, int(value))
+    return threads
+
+
+class StagedPipeline:
+    """Runs MuseumOCR stages on per-stage threads connected by bounded queues."""
+
+    def __init__(self, engine: MuseumOCR, threads: Optional[Dict[str, int]] = None,
+                 queue_size: Optional[int] = None, ordered: bool = False):
+        if threads is None:
+            threads = parse_threads(os.getenv("OCR_PIPELINE_THREADS"))
+        if queue_size is None:
+            queue_size = int(os.getenv("OCR_PIPELINE_QUEUE", "2"))
+        self.engine = engine
+        self.stages = engine.stages()
+        self.threads = [max(1, int(threads.get(name, 1))) for name, _ in self.stages]
+        self.queue_size = max(1, queue_size)
+        self.ordered = ordered
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._busy = [0.0] * len(self.stages)
+        self._done = [0] * len(self.stages)
+        self._high_water = [0] * len(self.stages)
+        # Set by run() when several recognize threads share readers without a batcher
+        self._recognize_lock: Optional[threading.Lock] = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per stage: threads, images handled, busy seconds and deepest queue seen."""
+        return {
+            name: {"threads": self.threads[i], "images": self._done[i],
+                   "busy_s": round(self._busy[i], 3), "max_queued": self._high_water[i]}
+            for i, (name, _) in enumerate(self.stages)
+        }
+
+    def _put(self, q: "queue.Queue", item) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: "queue.Queue"):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL_S)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, sources: Iterable[ImageSource], inbox: "queue.Queue") -> None:
+        try:
+            for index, source in enumerate(sources):
+                if not self._put(inbox, _Item(index, PageJob(source=source, detach=True))):
+                    return
+        finally:
+            for _ in range(self.threads[0]):
+                self._put(inbox, _DONE)
+
+    def _run_stage(self, i: int, inbox: "queue.Queue", outbox: "queue.Queue", remaining: List[int]) -> None:
+        name, step = self.stages[i]
+        while True:
+            with self._lock:
+                self._high_water[i] = max(self._high_water[i], inbox.qsize())
+            item = self._get(inbox)
+            if item is _DONE:
+                with self._lock:
+                    remaining[i] -= 1
+                    last = remaining[i] == 0
+                if last:
+                    # The last thread of a stage hands the end-of-input on
+                    for _ in range(self.threads[i + 1] if i + 1 < len(self.stages) else 1):
+                        self._put(outbox, _DONE)
+                return
+            if item.error is None and item.job.result is None:
+                if i == 0:
+                    # Time from the start of decoding, not from waiting on the feeder
+                    item.job.start_time = time.time()
+                start = time.perf_counter()
+                guard = self._recognize_lock if i == len(self.stages) - 1 and self._recognize_lock else nullcontext()
+                try:
+                    with guard:
+                        step(item.job)
+                except Exception as e:
+                    logger.error(f"❌ Pipeline {name} failed for item {item.index}: {e}")
+                    item.error = f"OCR processing failed: {str(e)}"
+                    item.job = PageJob(source=item.job.source)
+                with self._lock:
+                    self._busy[i] += time.perf_counter() - start
+                    self._done[i] += 1
+            if not self._put(outbox, item):
+                return
+
+    def run(self, sources: Iterable[ImageSource]) -> Iterator[PipelineResult]:
+        """OCR `sources`, yielding one PipelineResult per input as it completes
+        (in input order when `ordered`). Closing the iterator stops the stages."""
+        self._stop.clear()
+        engine = self.engine
+        batcher = None
+        self._recognize_lock = None
+        if self.threads[-1] > 1 and engine.batcher is None:
+            if engine.direct_recognition:
+                # Concurrent recognition threads share recognizer batches through one scheduler
+                batcher = RecognitionBatcher(engine._recognize_boxes).start()
+                engine.batcher = batcher
+            else:
+                logger.info("ℹ️ Batched recognition needs direct recognition (OCR_DIRECT_RECOGNITION=1); "
+                            "recognize threads take turns on the engine")
+                self._recognize_lock = threading.Lock()
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        remaining = list(self.threads)
+        workers = [threading.Thread(target=self._feed, args=(sources, queues[0]), daemon=True)]
+        for i in range(len(self.stages)):
+            outbox = queues[i + 1] if i + 1 < len(self.stages) else results
+            for _ in range(self.threads[i]):
+                workers.append(threading.Thread(target=self._run_stage, args=(i, queues[i], outbox, remaining),
+                                                daemon=True))
+        for worker in workers:
+            worker.start()
+        logger.info("🚰 Pipeline started: " + ", ".join(
+            f"{name}x{self.threads[i]}" for i, (name, _) in enumerate(self.stages)) + f", queue {self.queue_size}")
+
+        pending: Dict[int, PipelineResult] = {}
+        next_index = 0
+        try:
+            while True:
+                item = self._get(results)
+                if item is _DONE:
+                    break
+                output = PipelineResult(item.index, item.job.source, item.job.result, item.error)
+                if not self.ordered:
+                    yield output
+                    continue
+                pending[item.index] = output
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            self._stop.set()
+            for worker in workers:
+                worker.join(timeout=5)
+            if batcher is not None:
+                batcher.stop()
+                engine.batcher = None
+
+
+__all__ = [
+    "PipelineResult",
+    "StagedPipeline",
+    "parse_threads",
+]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Cross-request micro-batching for zone recognition.
+
+When several visitors scan boards at once, each request would otherwise run the
+recognizer on its own handful of zones. RecognitionBatcher sits in front of the
+recognizer: requests submit their zone crops, a single dispatcher thread gathers
+crops for up to `window_ms` (or until `max_batch` crops are waiting), runs them
+as one batch per reader and hands each result back to the request it came from.
+Latency added per request is bounded by the window plus one batch.
+
+Environment (optional):
+- OCR_BATCH_WINDOW_MS: gather window in milliseconds (default 5)
+- OCR_MAX_BATCH: maximum crops per dispatched batch (default 32)
+- OCR_BATCH_TIMEOUT_S: how long submit() waits for its results (default 120)
+
+stop() fails every crop still queued with RuntimeError, and submit() after stop
+raises at once, so no caller is left waiting on a batcher that is gone.
+
+The readers are not thread-safe: any reader call made outside a batch (e.g. a
+request's per-zone fallback) must hold `reader_lock`, which every batch holds.
+
+Usage:
+  batcher = RecognitionBatcher(ocr._recognize_boxes)
+  ocr.batcher = batcher          # MuseumOCR.read_zones_batched submits to it
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from museum_ocr import chunk_by_width
+
+logger = logging.getLogger(__name__)
+
+# recognize_fn(reader, gray_canvas, boxes[(x, y, w, h)]) -> one result list per box
+RecognizeFn = Callable[[Any, np.ndarray, List[Tuple[int, int, int, int]]], List[list]]
+
+_STOP = object()
+
+
+class RecognitionBatcher:
+    """Gathers zone crops from concurrent requests into shared recognizer batches."""
+
+    def __init__(self, recognize_fn: RecognizeFn, max_batch: Optional[int] = None,
+                 window_ms: Optional[float] = None, timeout_s: Optional[float] = None):
+        if max_batch is None:
+            max_batch = int(os.getenv("OCR_MAX_BATCH", "32"))
+        if window_ms is None:
+            window_ms = float(os.getenv("OCR_BATCH_WINDOW_MS", "5"))
+        if timeout_s is None:
+            timeout_s = float(os.getenv("OCR_BATCH_TIMEOUT_S", "120"))
+        self.recognize_fn = recognize_fn
+        self.max_batch = max(1, max_batch)
+        self.window = max(0.0, window_ms) / 1000.0
+        self.timeout = timeout_s if timeout_s > 0 else None
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Orders submit()'s enqueue against stop()'s sentinel
+        self._state_lock = threading.Lock()
+        # Held while a batch runs; callers that must read outside a batch take it too
+        self.reader_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.max_wait = 0.0
+
+    def start(self) -> "RecognitionBatcher":
+        with self._state_lock:
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._state_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join()
+        # Anything still queued behind the sentinel will never be dispatched
+        stopped = RuntimeError("RecognitionBatcher stopped")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                _fail(item[2], stopped)
+
+    def submit(self, reader: Any, crops: List[np.ndarray], timeout: Optional[float] = None) -> List[list]:
+        """Recognize `crops` with `reader`; blocks until every crop has a result.
+
+        Raises RuntimeError if the batcher is (or gets) stopped and TimeoutError
+        if the results take longer than `timeout` (default: the batcher's).
+        """
+        if timeout is None:
+            timeout = self.timeout
+        futures: List[Future] = []
+        now = time.monotonic()
+        with self._state_lock:
+            if not self._running:
+                raise RuntimeError("RecognitionBatcher is not running")
+            for crop in crops:
+                fut: Future = Future()
+                self._queue.put((reader, crop, fut, now))
+                futures.append(fut)
+        deadline = None if timeout is None else now + timeout
+        try:
+            return [fut.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+                    for fut in futures]
+        except FutureTimeout:
+            # Leave nothing for the dispatcher to do on our behalf
+            for fut in futures:
+                fut.cancel()
+            raise TimeoutError(f"Batched recognition took longer than {timeout:.1f}s") from None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": (self.items / self.batches) if self.batches else 0.0,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "window_ms": self.window * 1000.0,
+            "max_batch": self.max_batch,
+        }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            items = [first]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                items.append(item)
+            self._dispatch(items)
+            if stopping:
+                break
+
+    def _dispatch(self, items: List[tuple]) -> None:
+        # Crops whose caller gave up (timed out) are skipped
+        items = [it for it in items if it[2].set_running_or_notify_cancel()]
+        if not items:
+            return
+        dispatched_at = time.monotonic()
+        self.batches += 1
+        self.items += len(items)
+        self.max_wait = max(self.max_wait, max(dispatched_at - it[3] for it in items))
+
+        # One recognizer pass per reader (e.g. Hindi and English crops)
+        groups: Dict[int, List[tuple]] = {}
+        for it in items:
+            groups.setdefault(id(it[0]), []).append(it)
+
+        for group in groups.values():
+            reader = group[0][0]
+            for chunk in chunk_by_width([(it[1].shape[1], it[1].shape[0]) for it in group], len(group)):
+                members = [group[i] for i in chunk]
+                try:
+                    canvas, boxes = stack_crops([it[1] for it in members])
+                    with self.reader_lock:
+                        results = self.recognize_fn(reader, canvas, boxes)
+                    for it, box, res in zip(members, boxes, results):
+                        # Report boxes relative to the submitted crop
+                        bx, by = box[0], box[1]
+                        it[2].set_result([([[px - bx, py - by] for px, py in b], text, conf) for b, text, conf in res])
+                except Exception as e:
+                    logger.error(f"❌ Batched recognition failed: {e}")
+                    for it in members:
+                        _fail(it[2], e)
+
+
+def _fail(fut: Future, error: BaseException) -> None:
+    """Fail `fut` unless it already has an outcome."""
+    try:
+        fut.set_exception(error)
+    except InvalidStateError:
+        pass
+
+
+def stack_crops(crops: List[np.ndarray], gap: int = 4) -> Tuple[np.ndarray, List[Tuple[int, int, int, int]]]:
+    """Stack grayscale crops vertically on one canvas; returns canvas and (x, y, w, h) boxes."""
+    width = max((c.shape[1] for c in crops), default=1)
+    height = sum(c.shape[0] for c in crops) + gap * max(len(crops) - 1, 0)
+    canvas = np.zeros((max(height, 1), max(width, 1)), dtype=np.uint8)
+    boxes: List[Tuple[int, int, int, int]] = []
+    y = 0
+    for crop in crops:
+        h, w = crop.shape[:2]
+        canvas[y:y + h, 0:w] = crop
+        boxes.append((0, y, w, h))
+        y += h + gap
+    return canvas, boxes
+
+
+__all__ = [
+    "RecognitionBatcher",
+    "stack_crops",
+]
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Long-lived OCR worker that keeps a MuseumOCR engine warm between requests.
+
+Starting a fresh Python process per scan re-imports torch/easyocr and rebuilds
+both EasyOCR readers, which costs several seconds before any recognition runs.
+This worker pays that cost once and then serves JSON-lines requests.
+
+Protocol (one JSON object per line, request and response):
+  {"id": "1", "image": "uploads/board.png"}   -> same schema as `museum_ocr.py <image>`
+  {"id": "1", "image_b64": "<base64 PNG/JPEG>"}       (no temp file)
+  {"id": "1", "shm": "ocr_upload_1", "size": 183422}  (encoded bytes in shared memory)
+  {"id": "2", "op": "health"}                 -> {"status": "starting|ready|error", ...}
+  {"op": "shutdown"}                          -> stops the worker
+
+With --concurrency N > 1, up to N requests run at once; responses may then
+arrive out of order, so callers should match them by "id". Recognition keeps the
+engine's configured mode: with direct recognition on (--direct-recognition or
+OCR_DIRECT_RECOGNITION=1) zone crops are micro-batched across requests by
+ocr_scheduler.RecognitionBatcher, otherwise requests take turns on the engine.
+
+On stdin/stdout a `{"event": "ready", ...}` line is emitted once the engine is
+warm, so the caller can start routing scans to it. Logs go to stderr.
+
+Usage:
+  python museum_ocr.py --serve                         # JSON-lines over stdin/stdout
+  python museum_ocr.py --serve --socket /tmp/ocr.sock  # JSON-lines over a Unix socket
+  python museum_ocr.py --serve --concurrency 4 --direct-recognition --batch-window-ms 5
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import logging
+import socket
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, TextIO
+
+import numpy as np
+
+from museum_ocr import MuseumOCR, build_json_result, build_error_result
+from engine_registry import get_registry
+from ocr_scheduler import RecognitionBatcher
+from ocr_cache import get_result_cache, get_zone_cache
+from image_io import SHM_PREFIX, STDIN, decode_base64, source_error
+
+logger = logging.getLogger(__name__)
+
+
+class OCRWorker:
+    """Owns one warm MuseumOCR instance and answers OCR/health requests."""
+
+    def __init__(self, force_language: Optional[str] = None, concurrency: int = 1,
+                 max_batch: Optional[int] = None, batch_window_ms: Optional[float] = None,
+                 direct_recognition: Optional[bool] = None):
+        self.force_language = force_language
+        # None: MuseumOCR's default (OCR_DIRECT_RECOGNITION)
+        self.direct_recognition = direct_recognition
+        self.concurrency = max(1, concurrency)
+        self.max_batch = max_batch
+        self.batch_window_ms = batch_window_ms
+        self.batcher: Optional[RecognitionBatcher] = None
+        self.engine: Optional[MuseumOCR] = None
+        self.status = "starting"
+        self.error = ""
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self.requests_served = 0
+        self.requests_failed = 0
+        self.last_latency = 0.0
+        # MuseumOCR keeps per-call state in its readers; serialize recognition
+        self._engine_lock = threading.Lock()
+
+    def warm_up(self) -> bool:
+        """Build the engine and push a tiny image through each reader."""
+        try:
+            engine = MuseumOCR(force_language=self.force_language, direct_recognition=self.direct_recognition)
+            blank = np.full((32, 128), 255, dtype=np.uint8)
+            for reader in (engine.hindi_reader, engine.english_reader):
+                reader.readtext(blank)
+            if self.concurrency > 1 and engine.direct_recognition:
+                # Concurrent requests share recognizer batches through one scheduler
+                self.batcher = RecognitionBatcher(engine._recognize_boxes, self.max_batch, self.batch_window_ms).start()
+                engine.batcher = self.batcher
+            elif self.concurrency > 1:
+                logger.info("ℹ️ Cross-request batching needs direct recognition (--direct-recognition or "
+                            "OCR_DIRECT_RECOGNITION=1); concurrent requests take turns on the engine")
+            self.engine = engine
+            self.status = "ready"
+            self.ready_at = time.time()
+            logger.info(f"✅ OCR worker ready in {self.ready_at - self.started_at:.2f}s")
+            return True
+        except Exception as e:
+            self.status = "error"
+            self.error = str(e)
+            logger.error(f"❌ OCR worker warm-up failed: {e}")
+            return False
+
+    def health(self) -> Dict:
+        return {
+            "status": self.status,
+            "ready": self.status == "ready",
+            "error": self.error,
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "warmup_time": (self.ready_at - self.started_at) if self.ready_at else None,
+            "requests_served": self.requests_served,
+            "requests_failed": self.requests_failed,
+            "last_latency": self.last_latency,
+            "engines": get_registry().stats(),
+            "concurrency": self.concurrency,
+            "batcher": self.batcher.stats() if self.batcher else None,
+            "cache": get_result_cache().stats(),
+            "zone_cache": get_zone_cache().stats(),
+        }
+
+    @staticmethod
+    def _image_source(request: Dict):
+        """Image source of a request: path, base64 bytes or shared-memory segment."""
+        if request.get("shm"):
+            size = request.get("size")
+            return f"{SHM_PREFIX}{request['shm']}" + (f"?size={int(size)}" if size else "")
+        if request.get("image_b64"):
+            return decode_base64(request["image_b64"])
+        image_path = request.get("image")
+        if image_path == STDIN:
+            # stdin carries the JSON-lines protocol itself
+            raise ValueError("'-' is not a valid image source for the worker")
+        return image_path
+
+    def run_ocr(self, request: Dict) -> Dict:
+        if not (request.get("image") or request.get("image_b64") or request.get("shm")):
+            return build_error_result("Missing 'image' (or 'image_b64' / 'shm') in request")
+        if self.status != "ready" or self.engine is None:
+            result = build_error_result(f"OCR engine not ready (status: {self.status})")
+            result["status"] = self.status
+            return result
+
+        start_time = time.time()
+        try:
+            image_path = self._image_source(request)
+        except Exception as e:
+            return build_error_result(f"Invalid image in request: {e}")
+        error = source_error(image_path)
+        if error:
+            return build_error_result(error)
+
+        try:
+            if self.batcher is not None:
+                # Recognizer access is funnelled through the batcher thread
+                result = self.engine.process_image(image_path)
+            else:
+                with self._engine_lock:
+                    result = self.engine.process_image(image_path)
+            processing_time = time.time() - start_time
+            self.requests_served += 1
+            self.last_latency = processing_time
+            return build_json_result(result, processing_time)
+        except Exception as e:
+            self.requests_failed += 1
+            logger.error(f"❌ Worker OCR failed: {e}")
+            return build_error_result(f"OCR processing failed: {str(e)}")
+
+    def handle(self, request: Dict) -> Dict:
+        op = request.get("op", "ocr")
+        if op == "health":
+            response = self.health()
+        elif op == "ocr":
+            response = self.run_ocr(request)
+        else:
+            response = build_error_result(f"Unknown op: {op}")
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Decode one request line and return the encoded response (None to stop)."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except Exception as e:
+            return json.dumps(build_error_result(f"Invalid request: {e}"))
+        if request.get("op") == "shutdown":
+            return None
+        return json.dumps(self.handle(request))
+
+
+def _is_shutdown(line: str) -> bool:
+    try:
+        request = json.loads(line)
+    except Exception:
+        return False
+    return isinstance(request, dict) and request.get("op") == "shutdown"
+
+
+def serve_stdio(worker: OCRWorker, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout) -> None:
+    """Serve JSON-lines over stdin/stdout until EOF or a shutdown request."""
+    write_lock = threading.Lock()
+
+    def emit(payload: str) -> None:
+        with write_lock:
+            stdout.write(payload + "\n")
+            stdout.flush()
+
+    def warm_and_announce() -> None:
+        worker.warm_up()
+        event = {"event": "ready" if worker.status == "ready" else "error"}
+        event.update(worker.health())
+        emit(json.dumps(event))
+
+    # Warm up in the background so health checks are answered while models load
+    threading.Thread(target=warm_and_announce, daemon=True).start()
+
+    def handle_and_emit(line: str) -> None:
+        response = worker.handle_line(line)
+        if response is not None:
+            emit(response)
+
+    # With one thread requests are answered in order; more threads answer as they finish
+    with ThreadPoolExecutor(max_workers=worker.concurrency) as pool:
+        for line in stdin:
+            if not line.strip():
+                continue
+            if _is_shutdown(line):
+                break
+            pool.submit(handle_and_emit, line)
+    if worker.batcher is not None:
+        worker.batcher.stop()
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        worker: OCRWorker = self.server.worker  # type: ignore[attr-defined]
+        for raw in self.rfile:
+            line = raw.decode("utf-8").strip()
+            if not line:
+                continue
+            response = worker.handle_line(line)
+            if response is None:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            self.wfile.write((response + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def unix_sockets_supported() -> bool:
+    """AF_UNIX stream servers exist on this platform (not on Windows builds without it)."""
+    return hasattr(socket, "AF_UNIX") and hasattr(socketserver, "UnixStreamServer")
+
+
+def serve_unix_socket(worker: OCRWorker, socket_path: str) -> None:
+    """Serve JSON-lines over a Unix domain socket (one request per line)."""
+    if not unix_sockets_supported():
+        raise RuntimeError("Unix domain sockets are not supported on this platform; "
+                           "serve over stdin/stdout instead (omit --socket)")
+
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    threading.Thread(target=worker.warm_up, daemon=True).start()
+    with _UnixServer(socket_path, _SocketHandler) as server:
+        server.worker = worker  # type: ignore[attr-defined]
+        logger.info(f"🔌 OCR worker listening on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Warm OCR worker (JSON-lines)')
+    ap.add_argument('--socket', help='Unix socket path (default: stdin/stdout)')
+    ap.add_argument('--force-language', choices=['english', 'hindi'], help='Skip per-zone language detection')
+    ap.add_argument('--concurrency', type=int, default=1, help='Requests processed at once')
+    ap.add_argument('--direct-recognition', action='store_true', default=None,
+                    help='Recognize detected boxes without re-running detection per crop; with --concurrency > 1 '
+                         'this batches crops across requests (default: OCR_DIRECT_RECOGNITION)')
+    ap.add_argument('--max-batch', type=int, default=None, help='Maximum zone crops per recognizer batch')
+    ap.add_argument('--batch-window-ms', type=float, default=None, help='How long to gather crops before dispatching a batch')
+    args = ap.parse_args(argv)
+    if args.socket and not unix_sockets_supported():
+        ap.error("--socket needs Unix domain sockets, which this platform does not support")
+
+    worker = OCRWorker(force_language=args.force_language, concurrency=args.concurrency,
+                       max_batch=args.max_batch, batch_window_ms=args.batch_window_ms,
+                       direct_recognition=args.direct_recognition)
+    if args.socket:
+        serve_unix_socket(worker, args.socket)
+    else:
+        serve_stdio(worker)
+
+
+__all__ = [
+    "OCRWorker",
+    "serve_stdio",
+    "serve_unix_socket",
+    "unix_sockets_supported",
+]
+
+
+if __name__ == '__main__':
+    main()
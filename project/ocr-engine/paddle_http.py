@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP client for a PaddleOCR service (PADDLE_OCR_URL).
+
+lite_ocr used to call requests.post per image: a new TCP (and TLS) connection
+each time, a JPEG of a binary image wrapped in base64 JSON, and a fixed 20 s
+timeout without retries. PaddleHTTPClient keeps a keep-alive requests.Session
+with a bounded connection pool and urllib3 retries, and can send:
+- json: {"images": ["data:image/png;base64,...", ...]}, several images per
+  request (the payload's `images` list), answered as {"results": [...]}
+- binary: the encoded image as the raw request body (Content-Type image/png),
+  one image per request, no base64 inflation
+
+Responses are read as {"text": "..."} or {"results": [{"text": ...} | [{"text": ...}, ...]]}.
+Per-call latency is kept for stats() (count, errors, mean / p50 / p95 / max).
+
+Environment (optional):
+- PADDLE_OCR_URL: service endpoint (no URL = client disabled)
+- PADDLE_OCR_TRANSPORT: json (default) | binary
+- PADDLE_OCR_FORMAT: png (default, lossless and small for binarized boards) | jpg
+- PADDLE_OCR_CONNECT_TIMEOUT: seconds to connect (default 3)
+- PADDLE_OCR_TIMEOUT: seconds to wait for the response (default 20)
+- PADDLE_OCR_RETRIES: retries on connection errors and 502/503/504 (default 2);
+  read timeouts are never retried, so a hung service costs one PADDLE_OCR_TIMEOUT
+- PADDLE_OCR_POOL: keep-alive connections per host (default 4)
+- PADDLE_OCR_MAX_BATCH: images per json request in ocr_many (default 8)
+
+Usage:
+  from paddle_http import get_paddle_client
+  client = get_paddle_client()          # None when PADDLE_OCR_URL is unset
+  text = client.ocr(bin_img)
+  texts = client.ocr_many([img1, img2, img3])
+  python paddle_stub_server.py --port 8866   # local stand-in for tests/benchmarks
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import base64
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+try:
+    import requests  # lightweight HTTP client
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    _HAS_REQUESTS = True
+except Exception:
+    _HAS_REQUESTS = False
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("json", "binary")
+_LATENCY_WINDOW = 512
+_MIME = {"png": "image/png", "jpg": "image/jpeg"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def result_text(result: Any) -> Optional[str]:
+    """Text of one per-image result ({"text"} or a list of line dicts)."""
+    if isinstance(result, dict) and isinstance(result.get("text"), str):
+        return result["text"].strip()
+    if isinstance(result, list):
+        return " ".join([str(x.get("text", "")).strip() for x in result if isinstance(x, dict)]).strip()
+    return None
+
+
+def response_texts(data: Any, count: int) -> List[Optional[str]]:
+    """Per-image texts of a service response for a request with `count` images."""
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        results = [result_text(r) for r in data["results"][:count]]
+        return results + [None] * (count - len(results))
+    if isinstance(data, dict) and isinstance(data.get("text"), str) and count == 1:
+        return [data["text"].strip()]
+    return [None] * count
+
+
+class PaddleHTTPClient:
+    """Keep-alive, retrying client for one PaddleOCR HTTP endpoint."""
+
+    def __init__(self, url: str, transport: Optional[str] = None, image_format: Optional[str] = None,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 retries: Optional[int] = None, pool_size: Optional[int] = None,
+                 max_batch: Optional[int] = None):
+        if not _HAS_REQUESTS:
+            raise RuntimeError("requests is not installed")
+        self.url = url
+        self.transport = (transport or os.getenv("PADDLE_OCR_TRANSPORT", "json")).strip().lower()
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Unknown PADDLE_OCR_TRANSPORT: {self.transport}")
+        self.image_format = (image_format or os.getenv("PADDLE_OCR_FORMAT", "png")).strip().lower()
+        if self.image_format == "jpeg":
+            self.image_format = "jpg"
+        if self.image_format not in _MIME:
+            raise ValueError(f"Unknown PADDLE_OCR_FORMAT: {self.image_format}")
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else _env_float("PADDLE_OCR_CONNECT_TIMEOUT", 3.0),
+            read_timeout if read_timeout is not None else _env_float("PADDLE_OCR_TIMEOUT", 20.0),
+        )
+        retries = retries if retries is not None else int(_env_float("PADDLE_OCR_RETRIES", 2))
+        pool_size = pool_size if pool_size is not None else int(_env_float("PADDLE_OCR_POOL", 4))
+        self.max_batch = max(1, max_batch if max_batch is not None else int(_env_float("PADDLE_OCR_MAX_BATCH", 8)))
+
+        # Read timeouts are not retried: the POST may still be running on the service,
+        # and re-sending it would stretch a hung call to several PADDLE_OCR_TIMEOUTs
+        retry = Retry(total=retries, connect=retries, read=0, status=retries, backoff_factor=0.2,
+                      status_forcelist=(502, 503, 504), allowed_methods=frozenset({"POST"}),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.calls = 0
+        self.images = 0
+        self.errors = 0
+
+    def encode(self, image: np.ndarray) -> bytes:
+        ok, encoded = cv2.imencode(f".{self.image_format}", image)
+        if not ok:
+            raise ValueError("Could not encode image")
+        return encoded.tobytes()
+
+    def _data_url(self, image: np.ndarray) -> str:
+        b64 = base64.b64encode(self.encode(image)).decode("utf-8")
+        return f"data:{_MIME[self.image_format]};base64,{b64}"
+
+    def _post(self, count: int, **kwargs) -> List[Optional[str]]:
+        start = time.perf_counter()
+        try:
+            r = self.session.post(self.url, timeout=self.timeout, **kwargs)
+            r.raise_for_status()
+            texts = response_texts(r.json(), count)
+            failed = False
+        except Exception as e:
+            logger.warning(f"⚠️ PaddleOCR HTTP call failed: {e}")
+            texts, failed = [None] * count, True
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.calls += 1
+            self.images += count
+            self.errors += int(failed)
+            self._latencies.append(elapsed)
+        return texts
+
+    def ocr(self, image: np.ndarray) -> Optional[str]:
+        """Text of one image, or None when the call failed."""
+        return self.ocr_many([image])[0]
+
+    def ocr_many(self, images: Sequence[np.ndarray]) -> List[Optional[str]]:
+        """Texts for several images: json sends up to max_batch per request,
+        binary one request per image over the pooled connections."""
+        texts: List[Optional[str]] = []
+        if self.transport == "binary":
+            headers = {"Content-Type": _MIME[self.image_format]}
+            for image in images:
+                texts.extend(self._post(1, data=self.encode(image), headers=headers))
+            return texts
+        for i in range(0, len(images), self.max_batch):
+            chunk = images[i:i + self.max_batch]
+            texts.extend(self._post(len(chunk), json={"images": [self._data_url(img) for img in chunk]}))
+        return texts
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            calls, images, errors = self.calls, self.images, self.errors
+
+        def pct(q: float) -> Optional[float]:
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) if latencies else None
+
+        return {
+            "url": self.url,
+            "transport": self.transport,
+            "format": self.image_format,
+            "calls": calls,
+            "images": images,
+            "errors": errors,
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                "p50": pct(0.5),
+                "p95": pct(0.95),
+                "max": round(latencies[-1] * 1000, 2) if latencies else None,
+            },
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[PaddleHTTPClient] = None
+_client_key: Optional[tuple] = None
+_client_lock = threading.Lock()
+
+
+def get_paddle_client() -> Optional[PaddleHTTPClient]:
+    """Process-wide client for PADDLE_OCR_URL (rebuilt if the settings change), or None."""
+    global _client, _client_key
+    url = os.getenv("PADDLE_OCR_URL")
+    if not url or not _HAS_REQUESTS:
+        return None
+    key = (url,) + tuple(os.getenv(name, "") for name in (
+        "PADDLE_OCR_TRANSPORT", "PADDLE_OCR_FORMAT", "PADDLE_OCR_CONNECT_TIMEOUT", "PADDLE_OCR_TIMEOUT",
+        "PADDLE_OCR_RETRIES", "PADDLE_OCR_POOL", "PADDLE_OCR_MAX_BATCH"))
+    with _client_lock:
+        if _client_key != key:
+            if _client is not None:
+                _client.close()
+            _client_key = key
+            try:
+                _client = PaddleHTTPClient(url)
+            except Exception as e:
+                logger.error(f"❌ PaddleOCR HTTP client not available: {e}")
+                _client = None
+        return _client
+
+
+__all__ = [
+    "TRANSPORTS",
+    "PaddleHTTPClient",
+    "get_paddle_client",
+    "result_text",
+    "response_texts",
+]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the PaddleOCR HTTP service, for tests and benchmarks.
+
+Accepts the same requests as the real service (see paddle_http.py):
+- JSON {"images": ["data:image/...;base64,...", ...]}
+- a raw encoded image as the body (Content-Type image/*)
+and answers {"results": [{"text": "stub <w>x<h> ink=<n>%"}, ...]}, one entry per
+image, after --delay-ms per request plus --per-image-ms per image (simulated
+inference). GET /health returns request counters. Keep-alive (HTTP/1.1) is on,
+so connection reuse by the client is visible in --verbose logs.
+
+For retry tests, --fail-status 503 --fail-count 2 answers the first two POSTs
+with that status instead; `posts` counts every POST received, failed or not.
+
+Usage:
+  python paddle_stub_server.py --port 8866 --delay-ms 5 --per-image-ms 20
+  PADDLE_OCR_URL=http://127.0.0.1:8866/ocr python lite_ocr.py --image board.png
+
+  from paddle_stub_server import start_stub_server
+  server, url = start_stub_server()   # ephemeral port, background thread
+  server, url = start_stub_server(fail_status=503, fail_count=2)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import base64
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _stub_text(data: bytes) -> str:
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError("undecodable image")
+    ink = float(np.mean(image < 128)) * 100
+    return f"stub {image.shape[1]}x{image.shape[0]} ink={ink:.1f}%"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY a reused
+    # connection stalls on delayed ACKs (~40 ms per response)
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:  # type: ignore[attr-defined]
+            logger.info("stub %s - %s", self.client_address[1], fmt % args)
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        self._reply(200, {"status": "ok", "requests": server.requests, "images": server.images,  # type: ignore[attr-defined]
+                          "posts": server.posts, "connections": server.connections})  # type: ignore[attr-defined]
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        with server.lock:  # type: ignore[attr-defined]
+            server.posts += 1  # type: ignore[attr-defined]
+            failing = server.fail_count > 0  # type: ignore[attr-defined]
+            if failing:
+                server.fail_count -= 1  # type: ignore[attr-defined]
+        if failing:
+            self._reply(server.fail_status, {"error": "injected failure"})  # type: ignore[attr-defined]
+            return
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                images = [base64.b64decode(u.split(",", 1)[1] if u.startswith("data:") else u)
+                          for u in json.loads(body)["images"]]
+            else:
+                images = [body]
+            results = [{"text": _stub_text(data)} for data in images]
+        except Exception as e:
+            self._reply(400, {"error": str(e)})
+            return
+        time.sleep((server.delay_ms + server.per_image_ms * len(images)) / 1000.0)  # type: ignore[attr-defined]
+        with server.lock:  # type: ignore[attr-defined]
+            server.requests += 1  # type: ignore[attr-defined]
+            server.images += len(images)  # type: ignore[attr-defined]
+        self._reply(200, {"results": results})
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay_ms: float, per_image_ms: float, verbose: bool,
+                 fail_status: int = 503, fail_count: int = 0):
+        super().__init__(address, _StubHandler)
+        self.delay_ms = delay_ms
+        self.per_image_ms = per_image_ms
+        self.verbose = verbose
+        # The next `fail_count` POSTs are answered with `fail_status`
+        self.fail_status = fail_status
+        self.fail_count = fail_count
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.images = 0
+        self.posts = 0
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+def start_stub_server(port: int = 0, delay_ms: float = 0.0, per_image_ms: float = 0.0,
+                      verbose: bool = False, fail_status: int = 503,
+                      fail_count: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve on 127.0.0.1 in a daemon thread; returns (server, OCR endpoint URL)."""
+    server = _StubServer(("127.0.0.1", port), delay_ms, per_image_ms, verbose, fail_status, fail_count)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/ocr"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='PaddleOCR HTTP service stub')
+    ap.add_argument('--port', type=int, default=8866)
+    ap.add_argument('--delay-ms', type=float, default=0.0, help='Added latency per request')
+    ap.add_argument('--per-image-ms', type=float, default=0.0, help='Added latency per image')
+    ap.add_argument('--fail-status', type=int, default=503, help='Status answered to failed POSTs')
+    ap.add_argument('--fail-count', type=int, default=0, help='Fail this many POSTs first')
+    ap.add_argument('--verbose', action='store_true')
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = _StubServer(("127.0.0.1", args.port), args.delay_ms, args.per_image_ms, args.verbose,
+                         args.fail_status, args.fail_count)
+    logger.info(f"🧪 PaddleOCR stub listening on http://127.0.0.1:{args.port}/ocr")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = [
+    "start_stub_server",
+]
+
+
+if __name__ == '__main__':
+    main()
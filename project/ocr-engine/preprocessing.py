@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Shared image preprocessing for museum_ocr, lite_ocr and simple_ocr.
+
+The full chain (illumination normalization, deskew, CLAHE, NL-means denoise,
+sharpening, grid-line removal) is expensive and mostly wasted on clean printed
+boards; NL-means alone is ~1.5s on a 1 MP image. Stages are grouped in named
+profiles:
+
+- max:      every stage, the historical behaviour (default)
+- balanced: same chain with a lighter NL-means (smaller search window)
+- fast:     contrast and sharpening only
+- auto:     cheap statistics on a downsampled copy decide which stages run
+
+Every run records the stages it applied and how long each took. The result is a
+PreparedImage carrying the gray and binary views (and a lazy BGR view), so each
+is computed once. Long-lived processes can pass a BufferPool: stage outputs are
+then written into reused per-thread buffers via OpenCV's dst= arguments instead
+of allocating new full frames for every image.
+
+Environment (optional):
+- OCR_PROFILE: fast | balanced | max | auto (default max)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Canonical execution order
+STAGES = ("illumination", "deskew", "clahe", "denoise", "denoise_light", "sharpen", "line_removal")
+
+PROFILES: Dict[str, tuple] = {
+    "fast": ("clahe", "sharpen"),
+    "balanced": ("illumination", "deskew", "clahe", "denoise_light", "sharpen", "line_removal"),
+    "max": ("illumination", "deskew", "clahe", "denoise", "sharpen", "line_removal"),
+}
+DEFAULT_PROFILE = "max"
+
+# Auto-mode thresholds
+_ANALYSIS_MAX_SIDE = 512
+_NOISE_HEAVY = 8.0          # estimated sigma above which full NL-means runs
+_NOISE_LIGHT = 3.0          # ... and above which the light NL-means runs
+_LOW_CONTRAST = 160.0       # 5-95 percentile spread below which CLAHE runs
+_UNEVEN_LIGHT = 40.0        # background spread (gray levels) above which illumination runs
+_SKEW_MIN_DEG = 0.5         # estimated angle below which deskew skips the warp
+_SKEW_MAX_SIDE = 1024       # skew is estimated on a copy no larger than this
+_SKEW_MAX_POINTS = 60000    # foreground points used for the projection profile
+_SKEW_RANGE_DEG = 15.0      # search range (+/-) for the skew angle
+_BLURRY = 300.0             # Laplacian variance below which sharpening runs
+_LINE_FRACTION = 0.002      # share of long-line pixels above which line removal runs
+
+# Working resolution (see working_scale)
+_TEXT_MAX_SIDE = 1024       # text height is measured on a copy no larger than this
+_TEXT_MIN_COMPONENTS = 12   # fewer glyph-sized components and the text height is unknown
+_TARGET_TEXT_PX = 32        # text taller than this is downscaled towards it
+_MIN_TEXT_PX = 16           # text shorter than this may be upscaled (when allowed)
+_MAX_UPSCALE = 2.0
+_MIN_WORKING_SIDE = 1600    # never downscale the long side below this
+_MAX_WORKING_SIDE = 3200    # always downscale the long side to at most this
+
+# Text-line orientation (see estimate_text_orientation)
+_ORIENT_MAX_SIDE = 512      # orientation is estimated on a copy no larger than this
+_ORIENT_MIN_POINTS = 200    # fewer ink pixels and the orientation is unknown
+
+# Illumination background estimate
+_ILLUMINATION_KERNEL = 31          # kernel at _ILLUMINATION_REF_SIDE
+_ILLUMINATION_REF_SIDE = 800       # short image side the 31 px kernel was tuned on
+_ILLUMINATION_SMALL_KERNEL = 8     # pyramid levels are added while the kernel stays above this
+_MIN_POOL = np.ones((2, 2), np.uint8)
+
+_SHARPEN_KERNEL = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
+
+
+@dataclass
+class ImageStats:
+    noise_sigma: float
+    contrast: float
+    illumination_spread: float
+    skew_angle: float
+    sharpness: float
+    line_fraction: float
+
+
+class BufferPool:
+    """Per-thread work buffers reused across images in a long-lived process.
+
+    get() hands out the same array for a given name while the shape and dtype
+    match, so same-sized frames are processed without fresh full-frame
+    allocations. Arrays from the pool are only valid until the next image is
+    prepared on the same thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _buffers(self) -> Dict[str, np.ndarray]:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        return buffers
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        buffers = self._buffers()
+        buf = buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = buffers[name] = np.empty(shape, dtype=dtype)
+        return buf
+
+    def nbytes(self) -> int:
+        """Bytes held by this thread's buffers."""
+        return sum(b.nbytes for b in self._buffers().values())
+
+    def clear(self) -> None:
+        self._buffers().clear()
+
+
+def _buffer(pool: Optional[BufferPool], name: str, shape: Tuple[int, ...]) -> Optional[np.ndarray]:
+    """Pooled dst buffer, or None so OpenCV allocates one."""
+    return pool.get(name, shape) if pool is not None else None
+
+
+@dataclass
+class PreparedImage:
+    gray: np.ndarray
+    binary: Optional[np.ndarray]
+    profile: str
+    stages: List[str]
+    timings: Dict[str, float] = field(default_factory=dict)
+    stats: Optional[ImageStats] = None
+    pool: Optional[BufferPool] = field(default=None, repr=False)
+    # Rotation (degrees, about the image center) applied by the deskew stage; 0 if none.
+    # deskew(other, skew_angle) aligns another view of the same frame (any size) with `gray`.
+    skew_angle: float = 0.0
+    _bgr: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """3-channel view of `gray`, converted on first use only."""
+        if self._bgr is None:
+            dst = _buffer(self.pool, "bgr", self.gray.shape[:2] + (3,))
+            self._bgr = cv2.cvtColor(self.gray, cv2.COLOR_GRAY2BGR, dst=dst)
+        return self._bgr
+
+    def describe(self) -> str:
+        return f"Profile {self.profile}: " + (", ".join(self.stages) if self.stages else "no stages")
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """Explicit profile, else OCR_PROFILE, else max; unknown names fall back to max."""
+    name = (profile or os.getenv("OCR_PROFILE", DEFAULT_PROFILE) or DEFAULT_PROFILE).strip().lower()
+    if name != "auto" and name not in PROFILES:
+        logger.warning(f"⚠️ Unknown preprocessing profile '{name}', using {DEFAULT_PROFILE}")
+        return DEFAULT_PROFILE
+    return name
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def _downsample(gray: np.ndarray, max_side: int) -> np.ndarray:
+    h, w = gray.shape[:2]
+    scale = max_side / float(max(h, w))
+    if scale >= 1.0:
+        return gray
+    return cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def illumination_kernel_size(shape) -> int:
+    """Background kernel scaled with resolution: 31 px at an 800 px short side, always odd."""
+    short_side = min(shape[:2])
+    return max(3, int(round(_ILLUMINATION_KERNEL * short_side / _ILLUMINATION_REF_SIDE)) | 1)
+
+
+def normalize_illumination(gray: np.ndarray, levels: Optional[int] = None,
+                           dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Subtract a morphological-opening background estimate and stretch contrast.
+
+    The background is estimated `levels` pyramid levels down (by default until
+    the kernel is about _ILLUMINATION_SMALL_KERNEL px) and upsampled back; the
+    subtraction stays at full resolution. Levels are built with 2x2 min-pooling
+    rather than averaging, which keeps the estimate close to a full-resolution
+    opening. levels=0 opens the full-resolution image.
+    """
+    h, w = gray.shape[:2]
+    k = illumination_kernel_size(gray.shape)
+    if levels is None:
+        levels = max(0, int(np.floor(np.log2(k / _ILLUMINATION_SMALL_KERNEL))))
+    small = gray
+    for _ in range(levels):
+        small = np.ascontiguousarray(cv2.erode(small, _MIN_POOL, anchor=(0, 0))[::2, ::2])
+    ks = max(3, int(round(k / 2 ** levels)) | 1)
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (ks, ks))
+    if levels:
+        background = cv2.resize(cv2.morphologyEx(small, cv2.MORPH_OPEN, kernel), (w, h),
+                                dst=dst, interpolation=cv2.INTER_LINEAR)
+    else:
+        background = cv2.morphologyEx(small, cv2.MORPH_OPEN, kernel, dst=dst)
+    # Subtract and stretch in place: the background frame becomes the output
+    corrected = cv2.subtract(gray, background, dst=background)
+    return cv2.normalize(corrected, corrected, 0, 255, cv2.NORM_MINMAX)
+
+
+def estimate_skew(gray: np.ndarray, method: str = "projection") -> float:
+    """Rotation (degrees, cv2.getRotationMatrix2D convention) that levels the text.
+
+    Works on a copy downsampled to _SKEW_MAX_SIDE instead of every full-resolution
+    foreground pixel.
+    - projection: foreground points are projected onto the vertical axis for
+      candidate angles; the sharpest row profile (largest sum of squared bin
+      counts) wins, searched coarse-to-fine. Measures the text lines themselves.
+    - hull: the historical estimator, minAreaRect over all dark pixels. It follows
+      the outline of all ink (noise included), which on photos is usually the
+      frame, so it rarely rotates; profiles other than auto keep it so their
+      output does not change.
+    """
+    small = _downsample(gray, _SKEW_MAX_SIDE)
+    binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+    if method == "hull":
+        points = cv2.findNonZero(binary)
+        if points is None:
+            return 0.0
+        angle = cv2.minAreaRect(np.ascontiguousarray(points.reshape(-1, 2)[:, ::-1]))[-1]
+        return -(90 + angle) if angle < -45 else -angle
+
+    if cv2.countNonZero(binary) > binary.size // 2:
+        # Light text on a dark board: the minority class is the ink
+        binary = cv2.bitwise_not(binary)
+    points = cv2.findNonZero(binary)
+    if points is None or len(points) < 50:
+        return 0.0
+    points = points.reshape(-1, 2)[::max(1, len(points) // _SKEW_MAX_POINTS)].astype(np.float32)
+    x = points[:, 0] - small.shape[1] / 2.0
+    y = points[:, 1] - small.shape[0] / 2.0
+
+    def sharpest(angles: np.ndarray) -> float:
+        best_angle, best_score = 0.0, -1.0
+        for angle in angles:
+            theta = np.deg2rad(angle)
+            rows = y * np.cos(theta) - x * np.sin(theta)
+            hist = np.bincount((rows - rows.min()).astype(np.int32)).astype(np.float64)
+            score = float(np.dot(hist, hist))
+            if score > best_score:
+                best_angle, best_score = float(angle), score
+        return best_angle
+
+    coarse = sharpest(np.arange(-_SKEW_RANGE_DEG, _SKEW_RANGE_DEG + 0.5, 1.0))
+    return sharpest(np.arange(coarse - 1.0, coarse + 1.05, 0.1))
+
+
+def deskew(gray: np.ndarray, angle: Optional[float] = None, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rotate to correct skew (hull estimate unless `angle` is given).
+
+    Returns the input untouched when the angle is below _SKEW_MIN_DEG.
+    """
+    if angle is None:
+        angle = estimate_skew(gray, method="hull")
+    if abs(angle) < _SKEW_MIN_DEG:
+        return gray
+    (h, w) = gray.shape[:2]
+    M = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+    return cv2.warpAffine(gray, M, (w, h), dst=dst, flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+
+def remove_grid_lines(bin_img: np.ndarray, dst: Optional[np.ndarray] = None, binarize: bool = True,
+                      pool: Optional[BufferPool] = None) -> np.ndarray:
+    """Remove horizontal and vertical lines typical of tables/boxes.
+
+    binarize=False skips the Otsu pass when the input already is a 0/255 binary.
+    """
+    gray = cv2.cvtColor(bin_img, cv2.COLOR_BGR2GRAY) if bin_img.ndim == 3 else bin_img
+    if gray.dtype != np.uint8:
+        gray = gray.astype(np.uint8)
+    th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1] if binarize else gray
+    horiz_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
+    vert_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
+    detect_h = cv2.morphologyEx(th, cv2.MORPH_OPEN, horiz_kernel, dst=_buffer(pool, "lines_h", th.shape), iterations=1)
+    detect_v = cv2.morphologyEx(th, cv2.MORPH_OPEN, vert_kernel, dst=_buffer(pool, "lines_v", th.shape), iterations=1)
+    lines = cv2.bitwise_or(detect_h, detect_v, dst=detect_h)
+    return cv2.bitwise_and(th, cv2.bitwise_not(lines, dst=lines), dst=dst)
+
+
+def _clahe(gray: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    return cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8)).apply(gray, dst)
+
+
+def _denoise(gray: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    return cv2.fastNlMeansDenoising(gray, dst, 10, 7, 21)
+
+
+def _denoise_light(gray: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    # ~3x cheaper than the 7/21 windows with most of the benefit on mild noise
+    return cv2.fastNlMeansDenoising(gray, dst, 10, 5, 11)
+
+
+def _sharpen(gray: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    return cv2.filter2D(gray, -1, _SHARPEN_KERNEL, dst=dst)
+
+
+_STAGE_FUNCS = {
+    "illumination": normalize_illumination,
+    "deskew": deskew,
+    "clahe": _clahe,
+    "denoise": _denoise,
+    "denoise_light": _denoise_light,
+    "sharpen": _sharpen,
+}
+
+
+# ---------------------------------------------------------------------------
+# Auto mode
+# ---------------------------------------------------------------------------
+
+def _noise_sigma(gray: np.ndarray) -> float:
+    """Immerkaer's fast noise estimate on a full-resolution centre crop."""
+    h, w = gray.shape[:2]
+    ch, cw = min(h, _ANALYSIS_MAX_SIDE), min(w, _ANALYSIS_MAX_SIDE)
+    y0, x0 = (h - ch) // 2, (w - cw) // 2
+    crop = gray[y0:y0 + ch, x0:x0 + cw].astype(np.float32)
+    if ch < 3 or cw < 3:
+        return 0.0
+    kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+    response = np.abs(cv2.filter2D(crop, -1, kernel)[1:-1, 1:-1])
+    return float(np.sqrt(np.pi / 2.0) * response.sum() / (6.0 * (cw - 2) * (ch - 2)))
+
+
+def analyze_image(gray: np.ndarray) -> ImageStats:
+    """Cheap statistics used by the auto profile to pick stages."""
+    small = _downsample(gray, _ANALYSIS_MAX_SIDE)
+    p5, p95 = np.percentile(small, (5, 95))
+    background = cv2.GaussianBlur(_downsample(small, 64), (0, 0), 8)
+    b5, b95 = np.percentile(background, (5, 95))
+
+    binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+    span = max(8, small.shape[1] // 8)
+    horiz = cv2.morphologyEx(binary, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (span, 1)))
+    vert = cv2.morphologyEx(binary, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, span)))
+    line_fraction = float(np.count_nonzero(cv2.bitwise_or(horiz, vert))) / binary.size
+
+    return ImageStats(
+        noise_sigma=_noise_sigma(gray),
+        contrast=float(p95 - p5),
+        illumination_spread=float(b95 - b5),
+        skew_angle=estimate_skew(small),
+        sharpness=float(cv2.Laplacian(small, cv2.CV_64F).var()),
+        line_fraction=line_fraction,
+    )
+
+
+def estimate_text_height(gray: np.ndarray) -> Optional[float]:
+    """Median glyph height in pixels of `gray`, or None when too little text is found.
+
+    Connected components of the minority (ink) class on a copy of at most
+    _TEXT_MAX_SIDE; blobs that are too small, too large or too elongated to be
+    glyphs are ignored.
+    """
+    small = _downsample(gray, _TEXT_MAX_SIDE)
+    factor = gray.shape[0] / float(small.shape[0])
+    binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return None
+    w = stats[1:, cv2.CC_STAT_WIDTH]
+    h = stats[1:, cv2.CC_STAT_HEIGHT]
+    area = stats[1:, cv2.CC_STAT_AREA]
+    glyph = ((h >= 3) & (area >= 6) & (h < small.shape[0] // 4) & (w < small.shape[1] // 4)
+             & (w <= 4 * h) & (h <= 6 * w))
+    if int(glyph.sum()) < _TEXT_MIN_COMPONENTS:
+        return None
+    return float(np.median(h[glyph])) * factor
+
+
+def estimate_text_orientation(gray: np.ndarray) -> Tuple[str, float]:
+    """("horizontal" | "vertical", confidence ratio >= 1) of the text lines in `gray`.
+
+    Ink of a thumbnail is projected onto both axes; lines separated by gaps give
+    a peaky profile across them and a flat one along them. The ratio is the
+    peakier profile's normalized sum of squares over the other's (1.0 = no
+    evidence either way). It cannot tell 90 from 270 degrees.
+    """
+    small = _downsample(gray, _ORIENT_MAX_SIDE)
+    binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    if cv2.countNonZero(binary) < _ORIENT_MIN_POINTS:
+        return "horizontal", 1.0
+
+    def peakiness(profile: np.ndarray) -> float:
+        total = float(profile.sum())
+        return len(profile) * float(np.dot(profile, profile)) / (total * total)
+
+    ink = binary.astype(np.float64) / 255.0
+    rows = peakiness(ink.sum(axis=1))
+    cols = peakiness(ink.sum(axis=0))
+    if rows >= cols:
+        return "horizontal", rows / cols
+    return "vertical", cols / rows
+
+
+def working_scale(shape: Tuple[int, ...], text_height: Optional[float], allow_upscale: bool = False,
+                  max_side: Optional[int] = None) -> float:
+    """Scale from the original image to the canonical working resolution.
+
+    Large text is shrunk towards _TARGET_TEXT_PX (never below _MIN_WORKING_SIDE
+    on the long side), tiny text is enlarged up to _MAX_UPSCALE when allowed, and
+    the long side is capped at `max_side` (default _MAX_WORKING_SIDE).
+    """
+    long_side = float(max(shape[:2]))
+    cap = (max_side or _MAX_WORKING_SIDE) / long_side
+    scale = 1.0
+    if text_height:
+        if text_height > _TARGET_TEXT_PX:
+            scale = max(_TARGET_TEXT_PX / text_height, min(1.0, _MIN_WORKING_SIDE / long_side))
+        elif text_height < _MIN_TEXT_PX and allow_upscale:
+            scale = min(_MAX_UPSCALE, _MIN_TEXT_PX / text_height)
+    return min(scale, cap)
+
+
+def plan_stages(stats: ImageStats) -> List[str]:
+    """Stages the auto profile runs for an image with these statistics."""
+    stages = []
+    if stats.illumination_spread > _UNEVEN_LIGHT:
+        stages.append("illumination")
+    if abs(stats.skew_angle) > _SKEW_MIN_DEG:
+        stages.append("deskew")
+    if stats.contrast < _LOW_CONTRAST:
+        stages.append("clahe")
+    if stats.noise_sigma > _NOISE_HEAVY:
+        stages.append("denoise")
+    elif stats.noise_sigma > _NOISE_LIGHT:
+        stages.append("denoise_light")
+    if stats.sharpness < _BLURRY:
+        stages.append("sharpen")
+    if stats.line_fraction > _LINE_FRACTION:
+        stages.append("line_removal")
+    return stages
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def preprocess_gray(gray: np.ndarray, profile: Optional[str] = None, available: Sequence[str] = STAGES,
+                    pool: Optional[BufferPool] = None) -> PreparedImage:
+    """Run the stages of `profile` that the caller supports, timing each one.
+
+    `available` lets a caller keep its own historical chain (e.g. simple_ocr has
+    no deskew or line removal). `binary` is the Otsu binary with grid lines
+    removed when the line_removal stage ran, otherwise None. With a `pool`, the
+    stages ping-pong between two pooled frames and `gray` is never written.
+    """
+    name = resolve_profile(profile)
+    timings: Dict[str, float] = {}
+    stats = None
+    if name == "auto":
+        start = time.perf_counter()
+        stats = analyze_image(gray)
+        wanted = plan_stages(stats)
+        timings["analyze"] = time.perf_counter() - start
+    else:
+        wanted = PROFILES[name]
+
+    stages = [s for s in STAGES if s in wanted and s in available]
+    applied: List[str] = []
+    binary = None
+    skew_angle = 0.0
+    shape = gray.shape[:2]
+    turn = 0
+    for stage in stages:
+        start = time.perf_counter()
+        try:
+            if stage == "line_removal":
+                binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+                                       dst=_buffer(pool, "binary", shape))[1]
+                # Already binary: no second Otsu pass, cleaned in place
+                binary = remove_grid_lines(binary, dst=binary, binarize=False, pool=pool)
+            else:
+                dst = _buffer(pool, ("stage_a", "stage_b")[turn], shape)
+                if stage == "deskew":
+                    # Auto mode already measured the text-line angle
+                    angle = stats.skew_angle if stats is not None else estimate_skew(gray, method="hull")
+                    out = deskew(gray, angle, dst=dst)
+                    if out is not gray:
+                        skew_angle = angle
+                else:
+                    out = _STAGE_FUNCS[stage](gray, dst=dst)
+                if out is not gray:
+                    gray = out
+                    turn ^= 1
+            applied.append(stage)
+        except Exception as e:
+            logger.warning(f"⚠️ Preprocessing stage {stage} failed: {e}")
+        timings[stage] = time.perf_counter() - start
+
+    return PreparedImage(gray=gray, binary=binary, profile=name, stages=applied, timings=timings,
+                         stats=stats, pool=pool, skew_angle=skew_angle)
+
+
+def prepare_image(image: np.ndarray, profile: Optional[str] = None, available: Sequence[str] = STAGES,
+                  pool: Optional[BufferPool] = None, merge_binary: bool = False) -> PreparedImage:
+    """Grayscale conversion plus preprocess_gray() for a BGR or gray image.
+
+    merge_binary ORs the line-cleaned binary into `gray` (museum_ocr's detection view).
+    """
+    if image.ndim == 3:
+        source = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=_buffer(pool, "gray", image.shape[:2]))
+    else:
+        source = image
+    prepared = preprocess_gray(source, profile, available, pool)
+    if merge_binary and prepared.binary is not None:
+        # Write into the last stage frame when we own it; never into the caller's image
+        dst = prepared.gray if prepared.gray is not image else None
+        prepared.gray = cv2.bitwise_or(prepared.gray, prepared.binary, dst=dst)
+    return prepared
+
+
+__all__ = [
+    "STAGES",
+    "PROFILES",
+    "ImageStats",
+    "BufferPool",
+    "PreparedImage",
+    "resolve_profile",
+    "illumination_kernel_size",
+    "normalize_illumination",
+    "estimate_skew",
+    "deskew",
+    "remove_grid_lines",
+    "analyze_image",
+    "estimate_text_height",
+    "estimate_text_orientation",
+    "working_scale",
+    "plan_stages",
+    "preprocess_gray",
+    "prepare_image",
+]
@@ -20,6 +20,13 @@ try:
 except ImportError:
     EASYOCR_AVAILABLE = False
 
+from engine_registry import get_engine
+from preprocessing import preprocess_gray
+from image_io import describe_source, is_path, load_image
+
+# This script never deskewed, normalized illumination or removed lines
+SIMPLE_STAGES = ("clahe", "denoise", "denoise_light", "sharpen")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -31,38 +38,30 @@ def initialize_ocr_readers():
     
     try:
         logger.info("🚀 Initializing EasyOCR readers...")
-        hindi_reader = easyocr.Reader(['hi'], gpu=False)
-        english_reader = easyocr.Reader(['en'], gpu=False)
+        hindi_reader = get_engine('easyocr', ['hi'], gpu=False)
+        english_reader = get_engine('easyocr', ['en'], gpu=False)
         logger.info("✅ EasyOCR readers initialized successfully")
         return hindi_reader, english_reader
     except Exception as e:
         logger.error(f"❌ Failed to initialize EasyOCR: {e}")
         return None, None
 
-def preprocess_image(image_path):
-    """Enhanced image preprocessing for better OCR results"""
+def preprocess_image(image_path, timings=None):
+    """Enhanced image preprocessing for better OCR results (stages per OCR_PROFILE)"""
     try:
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
+        # Load image (path, encoded bytes, "-" for stdin, "shm://name" or an array)
+        image = load_image(image_path)
         
         # Convert to grayscale
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
-        # Apply CLAHE for better contrast
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
-        
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(enhanced, None, 10, 7, 21)
-        
-        # Sharpen
-        kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-        sharpened = cv2.filter2D(denoised, -1, kernel)
+        # Contrast (CLAHE), denoise and sharpen as the profile allows
+        prepared = preprocess_gray(gray, available=SIMPLE_STAGES)
+        if timings is not None:
+            timings.update(prepared.timings)
         
-        logger.info("✅ Image preprocessing completed")
-        return sharpened
+        logger.info(f"✅ Image preprocessing completed ({prepared.describe()})")
+        return prepared.gray
         
     except Exception as e:
         logger.error(f"❌ Image preprocessing failed: {e}")
@@ -71,10 +70,11 @@ def preprocess_image(image_path):
 def perform_real_ocr(image_path, hindi_reader, english_reader):
     """Perform real OCR using EasyOCR"""
     try:
-        logger.info(f"🔍 Performing real OCR on: {image_path}")
+        logger.info(f"🔍 Performing real OCR on: {describe_source(image_path)}")
         
         # Preprocess image
-        processed_image = preprocess_image(image_path)
+        timings = {}
+        processed_image = preprocess_image(image_path, timings)
         if processed_image is None:
             return None
         
@@ -135,7 +135,8 @@ def perform_real_ocr(image_path, hindi_reader, english_reader):
             "english_text": english_text,
             "combined_text": combined_text,
             "confidence": confidence,
-            "text_blocks_found": len(all_results)
+            "text_blocks_found": len(all_results),
+            "preprocessing_timings": timings
         }
         
     except Exception as e:
@@ -146,11 +147,14 @@ def process_image_with_real_ocr(image_path):
     """Main OCR processing with REAL OCR engine"""
     try:
         start_time = time.time()
-        logger.info(f"🔍 Processing image with REAL OCR: {image_path}")
+        logger.info(f"🔍 Processing image with REAL OCR: {describe_source(image_path)}")
         
-        # Check file size
-        file_size = os.path.getsize(image_path)
-        logger.info(f"📊 File size: {file_size} bytes")
+        # Check file size; stdin/shared-memory input is decoded once, up front
+        if is_path(image_path):
+            file_size = os.path.getsize(image_path)
+            logger.info(f"📊 File size: {file_size} bytes")
+        else:
+            image_path = load_image(image_path)
         
         # Initialize OCR readers
         hindi_reader, english_reader = initialize_ocr_readers()
@@ -194,7 +198,8 @@ def process_image_with_real_ocr(image_path):
             "confidence": ocr_result["confidence"],
             "processing_time": processing_time,
             "zones_count": ocr_result["text_blocks_found"],
-            "ocr_engine": "EasyOCR (Real)"
+            "ocr_engine": "EasyOCR (Real)",
+            "preprocessing_timings": {k: round(v, 4) for k, v in ocr_result["preprocessing_timings"].items()}
         }
         
         logger.info(f"REAL OCR processing completed in {processing_time:.2f}s")
@@ -221,7 +226,7 @@ def main():
     if len(sys.argv) != 2:
         print(json.dumps({
             "success": False,
-            "error": "Usage: python simple_ocr.py <image_path>"
+            "error": "Usage: python simple_ocr.py <image_path | - | shm://name>"
         }))
         sys.exit(1)
     
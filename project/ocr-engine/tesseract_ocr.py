@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Tesseract (LSTM) fast path for clean printed English boards.
+
+EasyOCR runs CRAFT detection plus a CRNN per crop on CPU; for a high-contrast
+printed English board Tesseract's LSTM engine reads the same text for a
+fraction of the cost. TesseractReader keeps initialized tesserocr handles
+(libtesseract in-process, models loaded once) instead of shelling out to the
+tesseract binary per call as pytesseract does. Each concurrent caller checks a
+handle out of a small pool, since one TessBaseAPI must not be shared between
+threads.
+
+Tesseract only answers when it is sure: accept_fast_path() rejects reads with
+a mean word confidence below OCR_TESSERACT_MIN_CONF, reads with Devanagari in
+them, and reads without any letters or digits, so the caller escalates those to
+EasyOCR (lite_ocr's cascade, MuseumOCR's per-zone readers). The eng model reads
+Hindi as Latin text, so callers first skip images whose ink looks Devanagari
+(looks_devanagari: words hanging from a shirorekha headline) instead of relying
+on the read alone.
+
+Environment (optional):
+- OCR_TESSERACT: 1 enables the fast path when tesserocr and the traineddata are
+  installed (default 0; tesserocr is in requirements-tesseract.txt)
+- OCR_TESSERACT_LANGS: traineddata to load, e.g. "eng" (default) or "eng+hin"
+- OCR_TESSERACT_MIN_CONF: mean word confidence (0-1) needed to skip EasyOCR (default 0.8)
+- OCR_TESSERACT_HANDLES: initialized handles kept per language set (default: CPUs)
+- TESSDATA_PREFIX: traineddata directory (tesserocr's default otherwise)
+
+Usage:
+  from tesseract_ocr import get_tesseract_reader, accept_fast_path, PSM_SINGLE_BLOCK
+  reader = get_tesseract_reader()          # None when disabled or unavailable
+  text, conf = reader.read(gray)
+  lines, conf = reader.read_lines(crop, psm=PSM_SINGLE_BLOCK)   # [(box, text, conf)]
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import logging
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    # Optional libtesseract binding (persistent API handles)
+    import tesserocr  # type: ignore
+    from tesserocr import OEM, RIL, PyTessBaseAPI, iterate_level  # type: ignore
+    _HAS_TESSEROCR = True
+except Exception:
+    _HAS_TESSEROCR = False
+
+from engine_registry import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Page segmentation modes (tesserocr.PSM values)
+PSM_AUTO = 3
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+
+_DEVANAGARI = re.compile(r"[\u0900-\u097F]")
+_WORD_CHAR = re.compile(r"[A-Za-z0-9]")
+# Shirorekha test: the headline row covers nearly the whole word, is clearly
+# denser than the stems hanging from it, and those words hold this share of the ink
+_HEADLINE_FILL = 0.85
+_HEADLINE_DROP = 0.3
+_HEADLINE_STEMS = 0.1
+_HEADLINE_SHARE = 0.3
+# Lines shorter than this are enlarged first (Tesseract wants ~20 px x-height)
+_MIN_LINE_HEIGHT = 32
+_MAX_UPSCALE = 4.0
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip() not in {"", "0", "false", "False"}
+
+
+def tesseract_languages() -> Tuple[str, ...]:
+    """Traineddata names from OCR_TESSERACT_LANGS ("eng+hin" -> ("eng", "hin"))."""
+    langs = tuple(l.strip() for l in os.getenv("OCR_TESSERACT_LANGS", "eng").split("+") if l.strip())
+    return langs or ("eng",)
+
+
+def min_confidence() -> float:
+    """Mean word confidence (0-1) a read needs to skip EasyOCR."""
+    try:
+        return float(os.getenv("OCR_TESSERACT_MIN_CONF", "0.8"))
+    except ValueError:
+        return 0.8
+
+
+def has_devanagari(text: str) -> bool:
+    return bool(_DEVANAGARI.search(text or ""))
+
+
+def _dark_on_light(gray: np.ndarray) -> np.ndarray:
+    """Tesseract reads dark text on a light background; invert dark boards."""
+    return cv2.bitwise_not(gray) if float(np.median(gray)) < 128 else gray
+
+
+def devanagari_ink_share(gray: np.ndarray) -> float:
+    """Share of the ink in connected words that hang from a headline row.
+
+    Devanagari letters of a word are joined by the shirorekha, so a word is one
+    wide component whose densest row near the top spans almost its full width,
+    with much sparser stems below. Latin letters are mostly separate components;
+    frames and rules fail the stems test.
+    """
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+    if gray.size == 0:
+        return 0.0
+    ink = cv2.threshold(_dark_on_light(gray), 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+    _, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    stats = stats[1:]
+    total = float(stats[:, cv2.CC_STAT_AREA].sum()) if len(stats) else 0.0
+    if not total:
+        return 0.0
+    headline = 0.0
+    for x, y, w, h, area in stats:
+        if h < 6 or w < 1.5 * h:
+            continue
+        fill = (ink[y:y+h, x:x+w] > 0).mean(axis=1)
+        row = int(np.argmax(fill[:max(1, int(round(0.4 * h)))]))
+        stems = fill[row + 2:row + 2 + max(2, h // 4)]
+        if (fill[row] >= _HEADLINE_FILL and stems.size
+                and _HEADLINE_STEMS <= stems.mean() <= fill[row] - _HEADLINE_DROP
+                and fill[row + 2:].mean() < 0.7):
+            headline += area
+    return headline / total
+
+
+def looks_devanagari(gray: np.ndarray) -> bool:
+    """True when enough of the ink is headline-joined words to skip the fast path."""
+    return devanagari_ink_share(gray) >= _HEADLINE_SHARE
+
+
+def accept_fast_path(text: str, conf: float, min_conf: Optional[float] = None) -> bool:
+    """True when a Tesseract read can stand in for EasyOCR: confident, Latin, not empty."""
+    if min_conf is None:
+        min_conf = min_confidence()
+    return bool(_WORD_CHAR.search(text or "")) and conf >= min_conf and not has_devanagari(text)
+
+
+_installed: Optional[Tuple[Optional[str], Tuple[str, ...]]] = None
+
+
+def tesseract_available(languages: Optional[Sequence[str]] = None) -> bool:
+    """tesserocr is importable and traineddata for every language is installed."""
+    global _installed
+    if not _HAS_TESSEROCR:
+        return False
+    prefix = os.getenv("TESSDATA_PREFIX") or None
+    if _installed is None or _installed[0] != prefix:
+        try:
+            found = tesserocr.get_languages(prefix) if prefix else tesserocr.get_languages()
+            _installed = (prefix, tuple(found[1]))
+        except Exception:
+            _installed = (prefix, ())
+    return all(lang in _installed[1] for lang in (languages or tesseract_languages()))
+
+
+def tesseract_enabled() -> bool:
+    """OCR_TESSERACT is on and the configured languages can be loaded."""
+    return _env_flag("OCR_TESSERACT", "0") and tesseract_available()
+
+
+class TesseractReader:
+    """Pool of initialized tesserocr handles for one language set (thread-safe)."""
+
+    def __init__(self, languages: Sequence[str] = ("eng",), max_handles: Optional[int] = None,
+                 tessdata: Optional[str] = None):
+        if not _HAS_TESSEROCR:
+            raise RuntimeError("tesserocr is not installed")
+        self.lang = "+".join(languages)
+        self.path = tessdata or os.getenv("TESSDATA_PREFIX") or None
+        if max_handles is None:
+            try:
+                max_handles = int(os.getenv("OCR_TESSERACT_HANDLES", "0"))
+            except ValueError:
+                max_handles = 0
+        self.max_handles = max(1, max_handles or (os.cpu_count() or 1))
+        self._idle: List = []
+        self._created = 0
+        self._cond = threading.Condition()
+        # Fail here (missing traineddata) rather than on the first zone
+        self._idle.append(self._create())
+        self._created = 1
+
+    def _create(self):
+        kwargs = {"lang": self.lang, "oem": OEM.LSTM_ONLY, "psm": PSM_AUTO}
+        if self.path:
+            kwargs["path"] = self.path
+        return PyTessBaseAPI(**kwargs)
+
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and self._created >= self.max_handles:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            return self._create()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, api) -> None:
+        with self._cond:
+            self._idle.append(api)
+            self._cond.notify()
+
+    def read_lines(self, gray: np.ndarray, psm: int = PSM_SINGLE_BLOCK) -> Tuple[List[tuple], float]:
+        """([(box, text, conf)] per text line, mean word confidence); EasyOCR-shaped
+        results in `gray` pixels, confidences in 0-1."""
+        if gray.ndim == 3:
+            gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+        if gray.size == 0:
+            return [], 0.0
+        scale = 1.0
+        if gray.shape[0] < _MIN_LINE_HEIGHT:
+            scale = min(_MAX_UPSCALE, _MIN_LINE_HEIGHT / float(gray.shape[0]))
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        gray = np.ascontiguousarray(_dark_on_light(gray))
+        height, width = gray.shape
+
+        api = self._acquire()
+        try:
+            api.SetPageSegMode(psm)
+            api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+            api.SetSourceResolution(300)
+            api.Recognize()
+            lines = []
+            iterator = api.GetIterator()
+            if iterator is not None:
+                for line in iterate_level(iterator, RIL.TEXTLINE):
+                    try:
+                        text = (line.GetUTF8Text(RIL.TEXTLINE) or "").strip()
+                    except RuntimeError:
+                        # Lines without any recognized text
+                        continue
+                    box = line.BoundingBox(RIL.TEXTLINE)
+                    if not text or box is None:
+                        continue
+                    x0, y0, x1, y1 = (int(round(v / scale)) for v in box)
+                    lines.append(([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], text,
+                                  line.Confidence(RIL.TEXTLINE) / 100.0))
+            conf = api.MeanTextConf() / 100.0
+        finally:
+            api.Clear()
+            self._release(api)
+        return lines, conf
+
+    def read(self, gray: np.ndarray, psm: int = PSM_AUTO) -> Tuple[str, float]:
+        """(text with one line per text line, mean word confidence 0-1)."""
+        lines, conf = self.read_lines(gray, psm)
+        return "\n".join(text for _, text, _ in lines), conf
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for api in idle:
+            api.End()
+
+
+_failed: Optional[Tuple[str, ...]] = None
+
+
+def get_tesseract_reader() -> Optional[TesseractReader]:
+    """Shared reader for OCR_TESSERACT_LANGS from the engine registry, or None
+    when the fast path is off or Tesseract cannot be loaded."""
+    global _failed
+    if not tesseract_enabled():
+        return None
+    languages = tesseract_languages()
+    if _failed == languages:
+        return None
+    try:
+        return get_engine('tesseract', list(languages))
+    except Exception as e:
+        logger.error(f"❌ Tesseract not available: {e}")
+        _failed = languages
+        return None
+
+
+__all__ = [
+    "PSM_AUTO",
+    "PSM_SINGLE_BLOCK",
+    "PSM_SINGLE_LINE",
+    "TesseractReader",
+    "accept_fast_path",
+    "devanagari_ink_share",
+    "get_tesseract_reader",
+    "has_devanagari",
+    "looks_devanagari",
+    "min_confidence",
+    "tesseract_available",
+    "tesseract_enabled",
+    "tesseract_languages",
+]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+🧪 Checks for the OCR result and zone caches (ocr_cache.py)
+
+Run with: python -m pytest -q test_ocr_cache.py
+"""
+
+import os
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from ocr_cache import ResultCache, ZoneCache, _zone_entry_size, image_fingerprint, zone_key
+
+
+def _payload(i: int) -> dict:
+    return {"text": f"{i:03d}" + "a" * 97}
+
+
+_ENTRY = len(json.dumps(_payload(0)))
+
+
+def _memory_cache(entries: int, **kwargs) -> ResultCache:
+    """Memory tier sized for exactly `entries` payloads."""
+    return ResultCache(max_mb=entries * _ENTRY / (1024 * 1024), db_path="", **kwargs)
+
+
+def test_result_cache_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("OCR_CACHE_MB", raising=False)
+    monkeypatch.delenv("OCR_CACHE_DB", raising=False)
+    assert not ResultCache().enabled
+
+
+def test_lru_evicts_least_recently_used():
+    cache = _memory_cache(3)
+    for i in range(3):
+        cache.put(f"k{i}", _payload(i))
+    # Reading k0 makes k1 the least recently used entry
+    assert cache.get("k0") == _payload(0)
+    cache.put("k3", _payload(3))
+
+    assert cache.get("k1") is None
+    assert [cache.get(k) for k in ("k0", "k2", "k3")] == [_payload(0), _payload(2), _payload(3)]
+    assert cache.evictions == 1
+
+
+def test_lru_stays_within_its_byte_budget():
+    cache = _memory_cache(3)
+    for i in range(10):
+        cache.put(f"k{i}", _payload(i))
+    stats = cache.stats()
+    assert stats["memory_entries"] == 3
+    assert cache._memory_bytes <= cache.max_bytes
+    assert list(cache._memory) == ["k7", "k8", "k9"]
+
+
+def test_oversized_payload_is_not_kept_in_memory():
+    cache = _memory_cache(1)
+    cache.put("big", {"text": "x" * (2 * _ENTRY)})
+    assert cache.get("big") is None
+
+
+def test_returned_payload_is_a_copy():
+    cache = _memory_cache(2)
+    cache.put("k", _payload(1))
+    cache.get("k")["text"] = "changed"
+    assert cache.get("k") == _payload(1)
+
+
+def test_sqlite_tier_evicts_least_recently_accessed(tmp_path):
+    db = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(max_mb=0, db_path=db, max_db_entries=2)
+    cache.put("k0", _payload(0))
+    cache.put("k1", _payload(1))
+    assert cache.get("k0") == _payload(0)  # k1 becomes the oldest access
+    cache.put("k2", _payload(2))
+
+    assert cache.get("k1") is None
+    assert cache.stats()["disk_entries"] == 2
+    # A new process sees what is left on disk
+    reopened = ResultCache(max_mb=0, db_path=db, max_db_entries=2)
+    assert reopened.get("k0") == _payload(0)
+    assert reopened.get("k2") == _payload(2)
+
+
+def test_disk_hit_refills_the_memory_tier(tmp_path):
+    cache = ResultCache(max_mb=1, db_path=str(tmp_path / "cache.sqlite"))
+    cache.put("k", _payload(1))
+    cache._memory.clear()
+    cache._memory_bytes = 0
+
+    assert cache.get("k") == _payload(1)
+    assert cache.get("k") == _payload(1)
+    assert (cache.disk_hits, cache.memory_hits) == (1, 1)
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate lookup
+# ---------------------------------------------------------------------------
+
+_CONFIG = {"pipeline": "museum"}
+
+
+@pytest.fixture(scope="module")
+def board():
+    image = cv2.imread(os.path.join(os.path.dirname(__file__), "test_images", "clean_museum_board.png"))
+    assert image is not None
+    return image
+
+
+def _reencoded(image):
+    return cv2.imdecode(cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 80])[1], cv2.IMREAD_COLOR)
+
+
+def _stored(board, near_distance: int) -> ResultCache:
+    cache = ResultCache(max_mb=1, db_path="", near_distance=near_distance)
+    cache.put("board", _payload(1), fingerprint=image_fingerprint(board, _CONFIG))
+    return cache
+
+
+def test_near_duplicate_lookup_is_off_at_distance_zero(board):
+    cache = _stored(board, near_distance=0)
+    assert cache.get_similar(image_fingerprint(board, _CONFIG)) is None
+    assert cache.stats()["fingerprints"] == 0
+
+
+def test_reencoded_copy_is_served_as_near_duplicate(board):
+    cache = _stored(board, near_distance=8)
+    match = cache.get_similar(image_fingerprint(_reencoded(board), _CONFIG))
+    assert match is not None
+    payload, distance = match
+    assert payload == _payload(1)
+    assert 0 < distance <= 8
+
+
+def test_edited_board_fails_the_tile_check(board):
+    cache = _stored(board, near_distance=8)
+    edited = board.copy()
+    cv2.putText(edited, "Closed on Mondays for cleaning", (100, 700), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+    assert cache.get_similar(image_fingerprint(edited, _CONFIG)) is None
+    assert cache.near_rejected == 1
+
+
+def test_near_duplicates_stay_within_their_settings_scope(board):
+    cache = _stored(board, near_distance=8)
+    assert cache.get_similar(image_fingerprint(board, {"pipeline": "lite"})) is None
+
+
+# ---------------------------------------------------------------------------
+# Zone cache
+# ---------------------------------------------------------------------------
+
+def _zone_results(text: str) -> list:
+    return [([[0, 0], [10, 0], [10, 5], [0, 5]], text, 0.9)]
+
+
+def test_zone_cache_evicts_least_recently_used():
+    cache = ZoneCache(max_mb=3 * _zone_entry_size(_zone_results("z0")) / (1024 * 1024))
+    for i in range(3):
+        cache.put(f"z{i}", _zone_results(f"z{i}"))
+    assert cache.get("z0") is not None
+    cache.put("z3", _zone_results("z3"))
+
+    assert cache.get("z1") is None
+    assert [cache.get(k)[0][1] for k in ("z0", "z2", "z3")] == ["z0", "z2", "z3"]
+    assert cache.evictions == 1
+
+
+def test_zone_cache_entries_cannot_be_changed_through_results():
+    cache = ZoneCache(max_mb=1)
+    cache.put("z", _zone_results("text"))
+    cache.get("z").clear()
+    with pytest.raises(TypeError):
+        cache.get("z")[0][0][0][0] = 99
+    assert cache.get("z")[0][1] == "text"
+
+
+def test_zone_key_depends_on_pixels_language_and_mode():
+    crop = np.full((8, 16), 200, dtype=np.uint8)
+    other = crop.copy()
+    other[0, 0] = 0
+    key = zone_key(crop, "english", "readtext")
+    assert key == zone_key(crop.copy(), "english", "readtext")
+    assert len({key, zone_key(other, "english", "readtext"), zone_key(crop, "hindi", "readtext"),
+                zone_key(crop, "english", "direct")}) == 4
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+🧪 Checks for the PaddleOCR HTTP client (paddle_http.py) against the local stub
+
+Run with: python -m pytest -q test_paddle_http.py
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from paddle_http import PaddleHTTPClient
+from paddle_stub_server import start_stub_server
+
+
+@pytest.fixture
+def stub():
+    """Stub service on an ephemeral port; tests adjust its delay/failure settings."""
+    server, url = start_stub_server()
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+def _board(width: int = 64, height: int = 32) -> np.ndarray:
+    image = np.full((height, width), 255, dtype=np.uint8)
+    image[8:24, 8:56] = 0
+    return image
+
+
+def _client(url: str, **kwargs) -> PaddleHTTPClient:
+    kwargs.setdefault("connect_timeout", 2.0)
+    kwargs.setdefault("read_timeout", 5.0)
+    kwargs.setdefault("retries", 2)
+    return PaddleHTTPClient(url, **kwargs)
+
+
+@pytest.mark.parametrize("transport", ["json", "binary"])
+def test_reads_text_from_the_service(stub, transport):
+    server, url = stub
+    client = _client(url, transport=transport)
+    assert client.ocr(_board()) == "stub 64x32 ink=37.5%"
+    assert client.errors == 0
+
+
+def test_json_transport_batches_images(stub):
+    server, url = stub
+    client = _client(url, transport="json", max_batch=2)
+    texts = client.ocr_many([_board(64 + i) for i in range(5)])
+    assert [t.split()[1] for t in texts] == [f"{64 + i}x32" for i in range(5)]
+    assert server.posts == 3
+
+
+@pytest.mark.parametrize("status", [502, 503, 504])
+def test_gateway_errors_are_retried(stub, status):
+    server, url = stub
+    server.fail_status, server.fail_count = status, 2
+    client = _client(url, retries=2)
+    assert client.ocr(_board()) is not None
+    assert server.posts == 3
+    assert client.errors == 0
+
+
+def test_gives_up_after_the_retry_budget(stub):
+    server, url = stub
+    server.fail_status, server.fail_count = 503, 5
+    client = _client(url, retries=2)
+    assert client.ocr(_board()) is None
+    assert server.posts == 3
+    assert client.errors == 1
+
+
+def test_other_server_errors_are_not_retried(stub):
+    server, url = stub
+    server.fail_status, server.fail_count = 500, 1
+    client = _client(url, retries=2)
+    assert client.ocr(_board()) is None
+    assert server.posts == 1
+
+
+def test_read_timeout_is_not_retried(stub):
+    server, url = stub
+    server.delay_ms = 1500
+    client = _client(url, read_timeout=0.3, retries=2)
+    start = time.perf_counter()
+    assert client.ocr(_board()) is None
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0
+    assert server.posts == 1
+    assert client.errors == 1
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+🧪 Checks for zone merging and consolidation (zone_merge.py)
+
+Run with: python -m pytest -q test_zone_merge.py
+"""
+
+import numpy as np
+
+from zone_merge import consolidate_zones, iou_matrix, merge_east_boxes
+
+
+def test_overlapping_boxes_merge_into_their_union():
+    assert consolidate_zones([(0, 0, 100, 20), (50, 2, 100, 20)]) == [(0, 0, 150, 22)]
+
+
+def test_contained_box_merges_into_its_container():
+    # IoU is only 0.02, but the small box lies entirely inside the large one
+    big, small = (0, 0, 400, 200), (150, 80, 40, 30)
+    assert iou_matrix([big], [small])[0, 0] < 0.3
+    assert consolidate_zones([small, big]) == [big]
+    assert consolidate_zones([big, small]) == [big]
+
+
+def test_containment_threshold():
+    # 80% of the small box inside the large one merges, 50% does not
+    assert consolidate_zones([(0, 0, 200, 100), (120, 40, 100, 20)]) == [(0, 0, 220, 100)]
+    assert consolidate_zones([(0, 0, 200, 100), (150, 40, 100, 20)]) == [(0, 0, 200, 100), (150, 40, 100, 20)]
+
+
+def test_words_on_one_line_merge_and_lines_stay_apart():
+    line1 = [(10, 10, 60, 20), (80, 12, 50, 20), (140, 10, 70, 20)]
+    line2 = [(10, 60, 60, 20), (80, 61, 80, 20)]
+    assert consolidate_zones(line1 + line2) == [(10, 10, 200, 22), (10, 60, 150, 21)]
+
+
+def test_distant_or_mismatched_boxes_stay_separate():
+    far_apart = [(0, 0, 50, 20), (200, 0, 50, 20)]
+    assert consolidate_zones(far_apart) == far_apart
+    # Same line and close, but one is more than twice as tall (e.g. a heading letter)
+    tall = [(0, 0, 50, 20), (55, 0, 30, 50)]
+    assert consolidate_zones(tall) == tall
+
+
+def test_merged_groups_keep_the_position_of_their_first_member():
+    zones = [(300, 300, 40, 20), (0, 0, 50, 20), (310, 305, 40, 20), (55, 0, 50, 20)]
+    assert consolidate_zones(zones) == [(300, 300, 50, 25), (0, 0, 105, 20)]
+
+
+def _consolidate_pairwise(zones, iou_thresh=0.3, containment=0.8, line_overlap=0.6,
+                          max_height_ratio=2.0, gap_factor=1.0):
+    """All-pairs reference for consolidate_zones (no grid index)."""
+    n = len(zones)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            (xi, yi, wi, hi), (xj, yj, wj, hj) = zones[i], zones[j]
+            ix = min(xi + wi, xj + wj) - max(xi, xj)
+            iy = min(yi + hi, yj + hj) - max(yi, yj)
+            inter = max(ix, 0) * max(iy, 0)
+            union = wi * hi + wj * hj - inter
+            min_h = min(hi, hj)
+            if (inter / union >= iou_thresh or inter >= containment * min(wi * hi, wj * hj)
+                    or (iy >= line_overlap * min_h and max(hi, hj) <= max_height_ratio * min_h
+                        and -ix <= gap_factor * min_h)):
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(zones[i])
+    merged = []
+    for root in sorted(groups):
+        members = groups[root]
+        x1, y1 = min(b[0] for b in members), min(b[1] for b in members)
+        x2, y2 = max(b[0] + b[2] for b in members), max(b[1] + b[3] for b in members)
+        merged.append((x1, y1, x2 - x1, y2 - y1))
+    return merged
+
+
+def test_grid_index_finds_the_same_merges_as_all_pairs():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        count = int(rng.integers(2, 80))
+        zones = [(int(x), int(y), int(w), int(h)) for x, y, w, h in zip(
+            rng.integers(0, 1200, count), rng.integers(0, 800, count),
+            rng.integers(5, 200, count), rng.integers(5, 60, count))]
+        assert consolidate_zones(zones) == _consolidate_pairwise(zones)
+
+
+def test_east_boxes_overlapping_zones_or_each_other_are_dropped():
+    zones = [(0, 0, 100, 20)]
+    east = [(2, 1, 98, 19), (300, 0, 80, 20), (305, 1, 78, 20), (0, 100, 50, 20)]
+    assert merge_east_boxes(zones, east, 0.5) == [(0, 0, 100, 20), (300, 0, 80, 20), (0, 100, 50, 20)]
+    assert merge_east_boxes(zones, [], 0.5) == zones
+    assert merge_east_boxes([], east[:2], 0.5) == east[:2]
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Vectorized zone merging and consolidation for the museum OCR pipeline.
+
+Contour detection returns many overlapping or adjacent fragments (letters, word
+pieces), and EAST adds more boxes on top. Every zone costs recognizer calls, so
+before recognition:
+- EAST boxes are merged into the contour zones with NumPy IoU matrices
+- fragments that overlap, or sit side by side on the same text line, are joined
+  into word/line boxes; neighbours are found through a uniform grid index
+
+Boxes are (x, y, w, h) tuples of ints throughout.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+
+def _as_array(boxes: Sequence[Box]) -> np.ndarray:
+    if len(boxes) == 0:
+        return np.zeros((0, 4), dtype=np.float64)
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def iou_matrix(a: Sequence[Box], b: Sequence[Box]) -> np.ndarray:
+    """Pairwise IoU between two sets of (x, y, w, h) boxes, shape (len(a), len(b))."""
+    A = _as_array(a)[:, None, :]
+    B = _as_array(b)[None, :, :]
+    x1 = np.maximum(A[..., 0], B[..., 0])
+    y1 = np.maximum(A[..., 1], B[..., 1])
+    x2 = np.minimum(A[..., 0] + A[..., 2], B[..., 0] + B[..., 2])
+    y2 = np.minimum(A[..., 1] + A[..., 3], B[..., 1] + B[..., 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = A[..., 2] * A[..., 3] + B[..., 2] * B[..., 3] - inter
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(union > 0, inter / union, 0.0)
+
+
+def merge_east_boxes(zones: List[Box], east_boxes: List[Box], iou_thresh: float = 0.5) -> List[Box]:
+    """Append EAST boxes that overlap no contour zone or earlier kept EAST box.
+
+    Same result as checking each EAST box against the growing merged list, but
+    the overlaps are computed as two IoU matrices instead of a Python double loop.
+    """
+    if not east_boxes:
+        return list(zones)
+    east = [tuple(int(v) for v in b) for b in east_boxes]
+    if zones:
+        novel = (iou_matrix(east, zones) < iou_thresh).all(axis=1)
+    else:
+        novel = np.ones(len(east), dtype=bool)
+    candidates = [i for i in range(len(east)) if novel[i]]
+    if not candidates:
+        return list(zones)
+
+    among = iou_matrix([east[i] for i in candidates], [east[i] for i in candidates])
+    kept: List[int] = []
+    for k in range(len(candidates)):
+        if not kept or (among[k, kept] < iou_thresh).all():
+            kept.append(k)
+    return list(zones) + [east[candidates[k]] for k in kept]
+
+
+class GridIndex:
+    """Uniform grid over box extents for fast neighbour candidate lookup."""
+
+    def __init__(self, boxes: Sequence[Box], cell: int):
+        self.cell = max(1, int(cell))
+        self.buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, (x, y, w, h) in enumerate(boxes):
+            for key in self._cells(x, y, w, h):
+                self.buckets[key].append(i)
+
+    def _cells(self, x: float, y: float, w: float, h: float):
+        c = self.cell
+        for cx in range(int(x // c), int((x + w) // c) + 1):
+            for cy in range(int(y // c), int((y + h) // c) + 1):
+                yield (cx, cy)
+
+    def query(self, x: float, y: float, w: float, h: float) -> Set[int]:
+        found: Set[int] = set()
+        for key in self._cells(x, y, w, h):
+            found.update(self.buckets.get(key, ()))
+        return found
+
+
+def consolidate_zones(zones: List[Box], iou_thresh: float = 0.3, containment: float = 0.8,
+                      line_overlap: float = 0.6, max_height_ratio: float = 2.0,
+                      gap_factor: float = 1.0) -> List[Box]:
+    """Join overlapping and same-line adjacent fragments into word/line boxes.
+
+    Two boxes are merged when their IoU is at least `iou_thresh`, when one is at
+    least `containment` inside the other, or when they lie on the same text line:
+    vertical overlap >= `line_overlap` of the shorter box, heights within
+    `max_height_ratio`, and horizontal gap <= `gap_factor` x the shorter height.
+    Merged groups keep the position of their earliest member in the output.
+    """
+    n = len(zones)
+    if n < 2:
+        return list(zones)
+
+    boxes = _as_array(zones)
+    x, y, w, h = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    cell = max(16, int(2 * np.median(h)))
+    index = GridIndex(zones, cell)
+
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(n):
+        reach = gap_factor * h[i]
+        cand = [j for j in index.query(x[i] - reach, y[i], w[i] + 2 * reach, h[i]) if j > i]
+        if not cand:
+            continue
+        j = np.asarray(cand)
+        ix = np.minimum(x[i] + w[i], x[j] + w[j]) - np.maximum(x[i], x[j])
+        iy = np.minimum(y[i] + h[i], y[j] + h[j]) - np.maximum(y[i], y[j])
+        inter = np.clip(ix, 0, None) * np.clip(iy, 0, None)
+        area_i, area_j = w[i] * h[i], w[j] * h[j]
+        union = area_i + area_j - inter
+        iou = np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+        contained = inter >= containment * np.maximum(np.minimum(area_i, area_j), 1e-9)
+
+        min_h = np.minimum(h[i], h[j])
+        same_line = (
+            (iy >= line_overlap * min_h)
+            & (np.maximum(h[i], h[j]) <= max_height_ratio * np.maximum(min_h, 1e-9))
+            & (-ix <= gap_factor * min_h)
+        )
+        for k in j[(iou >= iou_thresh) | contained | same_line]:
+            ri, rk = find(i), find(int(k))
+            if ri != rk:
+                parent[max(ri, rk)] = min(ri, rk)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(n):
+        groups[find(i)].append(i)
+
+    merged: List[Box] = []
+    for root in sorted(groups):
+        members = groups[root]
+        x1 = int(x[members].min())
+        y1 = int(y[members].min())
+        x2 = int((x[members] + w[members]).max())
+        y2 = int((y[members] + h[members]).max())
+        merged.append((x1, y1, x2 - x1, y2 - y1))
+    return merged
+
+
+__all__ = [
+    "iou_matrix",
+    "merge_east_boxes",
+    "GridIndex",
+    "consolidate_zones",
+]